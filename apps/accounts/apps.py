@@ -3,4 +3,7 @@ from django.apps import AppConfig # 앱 설정용 기본 클래스
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField' # 모델에서 id 자동 생성할 때 기본 타입 지정
     name = 'apps.accounts' # 앱 경로 apps/accounts
-    verbose_name = '계좌 관리' # Django Admin 화면에서 보이는 앱 이름
\ No newline at end of file
+    verbose_name = '계좌 관리' # Django Admin 화면에서 보이는 앱 이름
+
+    def ready(self):
+        from . import signals  # noqa: F401 (거래 저장/삭제 시 계좌 잔액, 계좌 변경 시 데이터 버전 갱신)
@@ -0,0 +1,183 @@
+"""
+계좌 잔액.
+
+- Account.balance: 현재 잔액 (입금 합계 - 출금 합계)
+- BalanceCheckpoint: 거래가 있는 달마다 그 달 말일 기준 잔액
+거래가 저장/삭제되면 계좌 잔액과 그 달 이후의 체크포인트에 증감분을 F()로 더합니다.
+(거래를 쓰는 쪽의 트랜잭션 안에서 - 화면은 core.mixins.AtomicWriteMixin, 중간에 실패하면 거래와 함께 롤백)
+지난 날짜의 잔액은 그 달 직전 체크포인트 하나 + 그 달 1일부터 해당 시각까지의 거래 합계(한 달치, 인덱스 범위)로 계산하므로
+거래 내역 전체를 합산하지 않습니다.
+잔액 추이(balance_series)도 같은 방식으로 첫 구간의 시작 잔액만 체크포인트에서 구하고,
+최근 몇 개 구간의 거래만 window 함수 쿼리 한 번으로 누적합니다.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import DateField, DecimalField, F, Sum, Value, Window
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+from django.utils import timezone
+from apps.transactions.models import Transaction
+from core.aggregates import EXPENSE, INCOME, RunningSum
+from core.utils import month_start
+from .models import Account, BalanceCheckpoint
+
+BATCH_SIZE = 1000
+# 잔액 추이 구간 단위와 기본 구간 수 (최근 90일 / 24개월)
+SERIES_PERIODS = {'day': 90, 'month': 24}
+
+
+def signed_amount(transaction_type, amount):
+    """잔액 증감분 (입금 +, 출금 -)"""
+    amount = Decimal(amount)
+    return amount if transaction_type == 'income' else -amount
+
+
+def apply_delta(account_id, occurred_at, amount, create=True):
+    """
+    계좌 잔액과 occurred_at이 속한 달 이후의 체크포인트에 amount를 더함.
+    create=False면 그 달 체크포인트가 없어도 만들지 않음 (거래 삭제: 그 달 체크포인트는 이미 있고,
+    없다면 계좌/사용자 삭제로 함께 지워지는 중이므로 다시 만들면 안 됨)
+    """
+    month = month_start(occurred_at)
+    checkpoints = BalanceCheckpoint.objects.filter(account_id=account_id)
+    with transaction.atomic():
+        Account.objects.filter(pk=account_id).update(balance=F('balance') + amount)
+        if create and not checkpoints.filter(month=month).exists():
+            # 처음 거래가 생긴 달: 직전 체크포인트의 잔액에서 시작 (아래에서 amount를 더함)
+            previous = checkpoints.filter(month__lt=month).order_by('-month').values_list('balance', flat=True).first()
+            try:
+                with transaction.atomic():
+                    BalanceCheckpoint.objects.create(account_id=account_id, month=month, balance=previous or 0)
+            except IntegrityError:
+                pass  # 동시에 같은 달이 생성된 경우
+        checkpoints.filter(month__gte=month).update(balance=F('balance') + amount)
+
+
+def apply_many(transactions):
+    """bulk_create 등 시그널을 거치지 않은 거래들을 (계좌, 월)별로 묶어 반영"""
+    deltas = {}
+    for tx in transactions:
+        key = (tx.account_id, month_start(tx.occurred_at))
+        deltas[key] = deltas.get(key, Decimal('0')) + signed_amount(tx.transaction_type, tx.amount)
+    with transaction.atomic():
+        # 오래된 달부터 반영해야 새 체크포인트가 직전 달 잔액에서 시작함
+        for (account_id, month), amount in sorted(deltas.items()):
+            apply_delta(account_id, timezone.make_aware(datetime.combine(month, time.min)), amount)
+
+
+def balance_at(account, moment):
+    """moment 직전까지의 거래로 계산한 잔액"""
+    month = month_start(moment)
+    previous = (
+        BalanceCheckpoint.objects.filter(account=account, month__lt=month)
+        .order_by('-month').values_list('balance', flat=True).first()
+    )
+    in_month = Transaction.objects.filter(
+        account=account,
+        occurred_at__gte=timezone.make_aware(datetime.combine(month, time.min)),
+        occurred_at__lt=moment,
+    ).aggregate(
+        income=Coalesce(Sum('amount', filter=INCOME), Value(Decimal('0'))),
+        expense=Coalesce(Sum('amount', filter=EXPENSE), Value(Decimal('0'))),
+    )
+    return (previous or 0) + in_month['income'] - in_month['expense']
+
+
+def balance_on(account, day):
+    """day 하루가 끝난 시점의 잔액"""
+    return balance_at(account, timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min)))
+
+
+def _series_buckets(period, points, end):
+    """end가 속한 구간까지 최근 points개 구간의 시작일"""
+    if period == 'day':
+        return [end - timedelta(days=offset) for offset in range(points - 1, -1, -1)]
+    months = end.year * 12 + end.month - 1
+    return [date(month // 12, month % 12 + 1, 1) for month in range(months - points + 1, months + 1)]
+
+
+def balance_series(account, period='day', points=None, end=None):
+    """
+    일별/월별 마감 잔액과 입금/출금 추이. end(기본 오늘)까지 최근 points개 구간만 계산하므로
+    계좌에 거래가 몇 년치 쌓여 있어도 비용이 그 구간의 거래 수로 제한됩니다.
+    반환: [{'date': 구간 시작일, 'inflow': 입금, 'outflow': 출금, 'balance': 구간 마감 잔액}, ...]
+    (항상 points개, 거래가 없는 구간은 직전 잔액 그대로)
+    """
+    points = points or SERIES_PERIODS[period]
+    buckets = _series_buckets(period, points, end or timezone.localdate())
+    if period == 'day':
+        stop = buckets[-1] + timedelta(days=1)
+        trunc = TruncDate('occurred_at')
+    else:
+        stop = (buckets[-1] + timedelta(days=31)).replace(day=1)
+        trunc = TruncMonth('occurred_at', output_field=DateField())
+    start = timezone.make_aware(datetime.combine(buckets[0], time.min))
+
+    zero = Value(Decimal('0'))
+    rows = Transaction.objects.filter(
+        account=account,
+        occurred_at__gte=start,
+        occurred_at__lt=timezone.make_aware(datetime.combine(stop, time.min)),
+    ).order_by().annotate(bucket=trunc).values('bucket').annotate(
+        inflow=Coalesce(Sum('amount', filter=INCOME), zero),
+        outflow=Coalesce(Sum('amount', filter=EXPENSE), zero),
+    ).annotate(
+        # 구간별 순액의 누적합 (SUM(SUM(...)) OVER (ORDER BY bucket))
+        running=Window(RunningSum(F('inflow') - F('outflow'), output_field=DecimalField()), order_by=F('bucket').asc()),
+    ).order_by('bucket')
+    by_bucket = {row['bucket']: row for row in rows}
+
+    opening = balance_at(account, start)
+    series = []
+    balance = opening
+    for bucket in buckets:
+        row = by_bucket.get(bucket)
+        if row is not None:
+            balance = opening + row['running']
+        series.append({
+            'date': bucket,
+            'inflow': row['inflow'] if row else Decimal('0'),
+            'outflow': row['outflow'] if row else Decimal('0'),
+            'balance': balance,
+        })
+    return series
+
+
+def rebuild(user=None):
+    """원장(Transaction)에서 잔액과 체크포인트를 다시 계산합니다. 생성된 체크포인트 수를 반환"""
+    transactions = Transaction.objects.all()
+    accounts = Account.objects.all()
+    if user is not None:
+        transactions = transactions.filter(user=user)
+        accounts = accounts.filter(user=user)
+
+    rows = transactions.order_by().annotate(month=TruncMonth('occurred_at')).values(
+        'account_id', 'month'
+    ).annotate(
+        income=Sum('amount', filter=INCOME),
+        expense=Sum('amount', filter=EXPENSE),
+    ).order_by('account_id', 'month')
+
+    created = 0
+    with transaction.atomic():
+        BalanceCheckpoint.objects.filter(account__in=accounts).delete()
+        balances = {}
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            account_id = row['account_id']
+            balances[account_id] = balances.get(account_id, 0) + (row['income'] or 0) - (row['expense'] or 0)
+            batch.append(BalanceCheckpoint(account_id=account_id, month=row['month'].date(), balance=balances[account_id]))
+            if len(batch) >= BATCH_SIZE:
+                BalanceCheckpoint.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            BalanceCheckpoint.objects.bulk_create(batch)
+            created += len(batch)
+
+        accounts.exclude(pk__in=list(balances)).update(balance=0)
+        stale = list(accounts.filter(pk__in=list(balances)).only('id'))
+        for account in stale:
+            account.balance = balances[account.pk]
+        Account.objects.bulk_update(stale, ['balance'], batch_size=BATCH_SIZE)
+    return created
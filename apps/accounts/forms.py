@@ -59,3 +59,17 @@ class AccountForm(forms.ModelForm): # ModelForm = 모델을 기반으로 자동
             'bank_name': '은행명',
             'account_number': '계좌번호',
         }
+
+class BalanceDateForm(forms.Form):
+    """계좌 상세의 특정 날짜 잔액 조회/잔액 추이 폼"""
+    date = forms.DateField(
+        required=False,
+        label='잔액 조회일',
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
+    )
+    period = forms.ChoiceField(
+        required=False,
+        label='추이 단위',
+        choices=[('day', '일별 (90일)'), ('month', '월별 (24개월)')],
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
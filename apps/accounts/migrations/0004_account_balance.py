@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-18 18:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_account_initial_balance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='balance',
+            field=models.DecimalField(decimal_places=0, default=0, editable=False, max_digits=18, verbose_name='잔액'),
+        ),
+        migrations.CreateModel(
+            name='BalanceCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='월')),
+                ('balance', models.DecimalField(decimal_places=0, default=0, max_digits=18, verbose_name='월말 잔액')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_checkpoints', to='accounts.account')),
+            ],
+            options={
+                'verbose_name': '월말 잔액',
+                'verbose_name_plural': '월말 잔액 목록',
+                'ordering': ['month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='balancecheckpoint',
+            constraint=models.UniqueConstraint(fields=('account', 'month'), name='unique_balance_checkpoint'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill(apps, schema_editor):
+    """기존 거래 데이터로 계좌 잔액과 월말 잔액 채우기"""
+    Account = apps.get_model('accounts', 'Account')
+    BalanceCheckpoint = apps.get_model('accounts', 'BalanceCheckpoint')
+    Transaction = apps.get_model('transactions', 'Transaction')
+
+    rows = Transaction.objects.order_by().annotate(
+        month=TruncMonth('occurred_at')
+    ).values(
+        'account_id', 'month'
+    ).annotate(
+        income=Sum('amount', filter=Q(transaction_type='income')),
+        expense=Sum('amount', filter=Q(transaction_type='expense')),
+    ).order_by('account_id', 'month')
+
+    balances = {}
+    checkpoints = []
+    for row in rows:
+        account_id = row['account_id']
+        balances[account_id] = balances.get(account_id, 0) + (row['income'] or 0) - (row['expense'] or 0)
+        checkpoints.append(BalanceCheckpoint(account_id=account_id, month=row['month'].date(), balance=balances[account_id]))
+    BalanceCheckpoint.objects.bulk_create(checkpoints, batch_size=1000)
+
+    accounts = list(Account.objects.filter(pk__in=list(balances)).only('id'))
+    for account in accounts:
+        account.balance = balances[account.pk]
+    Account.objects.bulk_update(accounts, ['balance'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_account_balance'),
+        ('transactions', '0008_category_rule'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
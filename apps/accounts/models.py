@@ -8,6 +8,8 @@ class Account(models.Model):
     bank_name = models.CharField(max_length=100, verbose_name='은행명')
     account_number = models.CharField(max_length=50, verbose_name='계좌번호')
     is_active = models.BooleanField(default=True, verbose_name='활성화 상태')
+    # 입금 합계 - 출금 합계 (거래 저장/삭제 시 apps.accounts.balances가 갱신)
+    balance = models.DecimalField(max_digits=18, decimal_places=0, default=0, editable=False, verbose_name='잔액')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
     
@@ -18,6 +20,32 @@ class Account(models.Model):
     
     def __str__(self):
         return f"{self.name} ({self.bank_name})"
+    
+    def save(self, *args, **kwargs):
+        # 잔액은 거래 시그널이 F()로만 바꾸므로, 계좌 정보를 수정할 때 읽어 둔 (그 사이 바뀌었을 수 있는) 값으로 덮어쓰지 않음
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'balance'
+            ]
+        super().save(*args, **kwargs)
+
+class BalanceCheckpoint(models.Model):
+    """계좌의 월말 잔액 (그 달까지의 모든 거래 합계, 거래가 있는 달만)"""
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='balance_checkpoints')
+    month = models.DateField(verbose_name='월')  # 해당 월의 1일 (TIME_ZONE 기준)
+    balance = models.DecimalField(max_digits=18, decimal_places=0, default=0, verbose_name='월말 잔액')
+    
+    class Meta:
+        ordering = ['month']
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'month'], name='unique_balance_checkpoint'),
+        ]
+        verbose_name = '월말 잔액'
+        verbose_name_plural = '월말 잔액 목록'
+    
+    def __str__(self):
+        return f"{self.account} {self.month:%Y-%m} {self.balance}"
 
 class Profile(models.Model):
     """사용자 프로필 - 연령대/성별 정보"""
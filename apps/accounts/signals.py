@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.transactions.models import Transaction
+from apps.transactions.signals import transactions_bulk_created, transactions_bulk_updated
+from core.fixtures import fixture_loaded
+from core.versioning import bump_data_version
+from . import balances
+from .models import Account
+
+
+@receiver(post_save, sender=Transaction)
+def update_balance_on_save(sender, instance, created, **kwargs):
+    # 수정 전 값은 apps.transactions.signals.remember_previous_values가 pre_save에서 기억해 둠
+    previous = getattr(instance, '_previous', None)
+    amount = balances.signed_amount(instance.transaction_type, instance.amount)
+    with transaction.atomic():
+        if previous is not None:
+            previous_amount = balances.signed_amount(previous['transaction_type'], previous['amount'])
+            if (previous['account_id'], previous['occurred_at']) == (instance.account_id, instance.occurred_at):
+                # 같은 계좌/시각에서 금액이나 유형만 바뀐 경우
+                if amount != previous_amount:
+                    balances.apply_delta(instance.account_id, instance.occurred_at, amount - previous_amount)
+                return
+            balances.apply_delta(previous['account_id'], previous['occurred_at'], -previous_amount)
+        balances.apply_delta(instance.account_id, instance.occurred_at, amount)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_balance_on_delete(sender, instance, **kwargs):
+    balances.apply_delta(
+        instance.account_id, instance.occurred_at, -balances.signed_amount(instance.transaction_type, instance.amount),
+        create=False,
+    )
+
+
+@receiver(transactions_bulk_created)
+def update_balance_on_bulk_create(sender, transactions, **kwargs):
+    balances.apply_many(transactions)
+
+
+@receiver(transactions_bulk_updated)
+def rebuild_balances_on_bulk_update(sender, user_ids, **kwargs):
+    # 이전 값을 모르므로 해당 사용자의 잔액을 다시 계산
+    for user_id in user_ids:
+        balances.rebuild(user=user_id)
+
+
+@receiver(fixture_loaded, sender=Transaction)
+def rebuild_balances_on_fixture_load(sender, **kwargs):
+    balances.rebuild()
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def bump_version_on_account_change(sender, instance, **kwargs):
+    bump_data_version(instance.user_id)
+
+
+@receiver(fixture_loaded, sender=Account)
+def bump_version_on_account_fixture_load(sender, instances, **kwargs):
+    for user_id in {account.user_id for account in instances}:
+        bump_data_version(user_id)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.db.models import Q, Sum
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone as dj_timezone
+
+from apps.accounts import balances
+from apps.accounts.models import Account, BalanceCheckpoint
+from apps.transactions.models import Transaction
+from apps.transactions.tests.utils import make_user, make_account, make_category, make_tx, make_transactions
+
+
+def at(year, month, day):
+    return datetime(year, month, day, 12, 0, tzinfo=timezone.utc)
+
+
+class AccountBalanceTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1")
+        self.account = make_account(self.user)
+        self.other = make_account(self.user, name="비상금")
+        self.category = make_category()
+
+    def add(self, amount, when, tx_type="expense", account=None):
+        return make_tx(
+            user=self.user, account=account or self.account, category=self.category,
+            tx_type=tx_type, amount=Decimal(amount), occurred_at=when,
+        )
+
+    def ledger_balance(self, account, until=None):
+        rows = Transaction.objects.filter(account=account)
+        if until is not None:
+            rows = rows.filter(occurred_at__lt=until)
+        totals = rows.aggregate(
+            income=Sum("amount", filter=Q(transaction_type="income")),
+            expense=Sum("amount", filter=Q(transaction_type="expense")),
+        )
+        return (totals["income"] or 0) - (totals["expense"] or 0)
+
+    def balance(self, account=None):
+        return Account.objects.get(pk=(account or self.account).pk).balance
+
+    def checkpoints(self, account=None):
+        return dict(
+            BalanceCheckpoint.objects.filter(account=account or self.account).values_list("month", "balance")
+        )
+
+    def test_create_update_delete(self):
+        self.add(10000, at(2026, 1, 5), tx_type="income")
+        tx = self.add(3000, at(2026, 2, 1))
+        self.assertEqual(self.balance(), Decimal("7000"))
+
+        tx.amount = Decimal("4000")
+        tx.save()
+        self.assertEqual(self.balance(), Decimal("6000"))
+
+        tx.account = self.other
+        tx.occurred_at = at(2026, 3, 1)
+        tx.save()
+        self.assertEqual(self.balance(), Decimal("10000"))
+        self.assertEqual(self.balance(self.other), Decimal("-4000"))
+        self.assertEqual(self.checkpoints(), {date(2026, 1, 1): 10000, date(2026, 2, 1): 10000})
+
+        tx.delete()
+        self.assertEqual(self.balance(self.other), Decimal("0"))
+
+    def test_failed_view_write_keeps_balances_consistent(self):
+        self.add(10000, at(2026, 1, 5), tx_type="income")
+        tx = self.add(3000, at(2026, 2, 1))
+        checkpoints = self.checkpoints(), self.checkpoints(self.other)
+        original = balances.apply_delta
+        calls = []
+
+        def fail_second_delta(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError
+            return original(*args, **kwargs)
+
+        # 다른 계좌로 옮기는 수정: 이전 계좌에서 빼는 데는 성공하고 새 계좌에 더하다 실패
+        self.client.force_login(self.user)
+        data = {
+            "account": self.other.pk, "category": self.category.pk, "transaction_type": "expense",
+            "amount": "3000", "occurred_at": "2026-03-01T12:00", "merchant": "가게", "memo": "",
+        }
+        with mock.patch.object(balances, "apply_delta", side_effect=fail_second_delta):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse("transaction_update", args=[tx.pk]), data)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(Transaction.objects.get(pk=tx.pk).account, self.account)
+        for account in (self.account, self.other):
+            self.assertEqual(self.balance(account), self.ledger_balance(account))
+        self.assertEqual((self.checkpoints(), self.checkpoints(self.other)), checkpoints)
+
+    def test_back_dated_transaction_updates_later_checkpoints(self):
+        self.add(10000, at(2026, 1, 5), tx_type="income")
+        self.add(2000, at(2026, 3, 5))
+        self.add(1000, at(2026, 2, 10))
+        self.assertEqual(self.checkpoints(), {
+            date(2026, 1, 1): 10000, date(2026, 2, 1): 9000, date(2026, 3, 1): 7000,
+        })
+        self.assertEqual(balances.balance_on(self.account, date(2026, 2, 9)), Decimal("10000"))
+        self.assertEqual(balances.balance_on(self.account, date(2026, 2, 10)), Decimal("9000"))
+        self.assertEqual(balances.balance_on(self.account, date(2025, 12, 31)), Decimal("0"))
+        self.assertEqual(balances.balance_on(self.account, date(2026, 4, 1)), Decimal("7000"))
+
+    def test_bulk_created_transactions_match_ledger(self):
+        make_transactions(user=self.user, account=self.account, categories=[self.category], count=3000)
+        self.assertEqual(self.balance(), self.ledger_balance(self.account))
+        for day in (date(2025, 11, 15), date(2025, 12, 31), date(2026, 1, 20)):
+            until = dj_timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+            self.assertEqual(balances.balance_on(self.account, day), self.ledger_balance(self.account, until))
+
+    def test_rebuild_restores_balances(self):
+        self.add(10000, at(2026, 1, 5), tx_type="income")
+        self.add(2500, at(2026, 2, 5))
+        expected = self.checkpoints()
+        Account.objects.update(balance=0)
+        BalanceCheckpoint.objects.all().delete()
+        self.assertEqual(balances.rebuild(user=self.user), 2)
+        self.assertEqual(self.balance(), Decimal("7500"))
+        self.assertEqual(self.checkpoints(), expected)
+
+    def test_account_edit_keeps_balance(self):
+        stale = Account.objects.get(pk=self.account.pk)
+        self.add(3000, at(2026, 2, 1))
+        stale.name = "생활비"
+        stale.save()
+        self.assertEqual(self.balance(), Decimal("-3000"))
+
+    def test_daily_series(self):
+        self.add(10000, at(2025, 12, 20), tx_type="income")
+        self.add(3000, at(2026, 1, 2))
+        self.add(500, at(2026, 1, 2))
+        self.add(200, at(2026, 1, 4))
+        self.add(999, at(2026, 1, 4), account=self.other)
+        series = balances.balance_series(self.account, period="day", points=4, end=date(2026, 1, 4))
+        self.assertEqual([point["date"] for point in series], [date(2026, 1, d) for d in range(1, 5)])
+        self.assertEqual([point["balance"] for point in series], [10000, 6500, 6500, 6300])
+        self.assertEqual(series[1]["outflow"], Decimal("3500"))
+        self.assertEqual(series[2]["outflow"], Decimal("0"))
+
+    def test_monthly_series_matches_ledger(self):
+        make_transactions(user=self.user, account=self.account, categories=[self.category], count=5000)
+        series = balances.balance_series(self.account, period="month", points=6, end=date(2026, 2, 1))
+        self.assertEqual(len(series), 6)
+        self.assertEqual(series[0]["date"], date(2025, 9, 1))
+        for point in series:
+            until = dj_timezone.make_aware(datetime.combine((point["date"] + timedelta(days=31)).replace(day=1), time.min))
+            self.assertEqual(point["balance"], self.ledger_balance(self.account, until))
+
+    def test_detail_view_shows_balance_on_date(self):
+        self.add(10000, at(2026, 1, 5), tx_type="income")
+        self.add(2500, at(2026, 2, 5))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("account_detail", args=[self.account.pk]), {"date": "2026-01-31"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["balance_on_date"], Decimal("10000"))
+        self.assertEqual(response.context["account"].balance, Decimal("7500"))
+        self.assertEqual(response.context["balance_series"][-1]["date"], date(2026, 1, 31))
+        self.assertEqual(len(response.context["balance_series"]), 90)
+
+        response = self.client.get(reverse("account_detail", args=[self.account.pk]), {"period": "month"})
+        self.assertEqual(len(response.context["balance_series"]), 24)
+        self.assertContains(response, "<polyline")
@@ -4,9 +4,12 @@ from django.contrib.auth.views import LoginView as DjangoLoginView
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from core.mixins import UserOwnershipMixin
+from django.utils import timezone
+from core.mixins import AtomicWriteMixin, ConditionalGetMixin, UserOwnershipMixin
+from core.versioning import cached_for_user
 from .models import Account, Profile
-from .forms import SignUpForm, AccountForm
+from . import balances
+from .forms import SignUpForm, AccountForm, BalanceDateForm
 
 class SignUpView(CreateView):
     """회원가입 뷰"""
@@ -41,7 +44,7 @@ def logout_view(request):
     messages.info(request, '로그아웃되었습니다.')
     return redirect('login')
 
-class AccountListView(UserOwnershipMixin, ListView):
+class AccountListView(UserOwnershipMixin, ConditionalGetMixin, ListView):
     """계좌 목록 뷰"""
     model = Account
     template_name = 'accounts/account_list.html'
@@ -61,9 +64,59 @@ class AccountDetailView(UserOwnershipMixin, DetailView):
         context['transactions'] = self.object.transaction_set.select_related(
             'category', 'trip'
         ).order_by('-occurred_at')[:20]
+        # ?date=YYYY-MM-DD: 그날이 끝난 시점의 잔액 (현재 잔액은 account.balance)
+        balance_form = BalanceDateForm(self.request.GET or None)
+        context['balance_form'] = balance_form
+        day, period = None, 'day'
+        if balance_form.is_valid():
+            day = balance_form.cleaned_data['date']
+            period = balance_form.cleaned_data['period'] or 'day'
+        if day:
+            context['balance_date'] = day
+            context['balance_on_date'] = balances.balance_on(self.object, day)
+        # 잔액 추이: 조회일(기본 오늘)까지 최근 구간 (데이터 버전이 바뀔 때까지 캐시)
+        end = day or timezone.localdate()
+        series = cached_for_user(
+            self.object.user_id, 'accounts:balance_series', f'{self.object.pk}:{period}:{end}',
+            lambda: balances.balance_series(self.object, period=period, end=end),
+        )
+        context['balance_series'] = series
+        context['balance_chart'] = balance_chart(series)
         return context
 
-class AccountCreateView(UserOwnershipMixin, CreateView):
+
+def balance_chart(series, width=600, height=160, flow_height=40):
+    """
+    잔액 추이를 SVG 좌표로 변환 (위: 마감 잔액 꺾은선, 아래: 구간별 입금/출금 막대).
+    구간 수가 고정이라 템플릿에서 그대로 그립니다.
+    """
+    values = [point['balance'] for point in series]
+    low, high = min(values), max(values)
+    line_height = height - flow_height - 10
+    max_flow = max(max(point['inflow'], point['outflow']) for point in series) or 1
+    step = width / len(series)
+    bar_width = max(step / 2 - 1, 1)
+
+    points, bars = [], []
+    for index, point in enumerate(series):
+        x = step * index + step / 2
+        y = line_height - (point['balance'] - low) / ((high - low) or 1) * line_height + 5
+        points.append(f'{x:.1f},{y:.1f}')
+        inflow = float(point['inflow'] / max_flow) * flow_height
+        outflow = float(point['outflow'] / max_flow) * flow_height
+        bars.append({
+            'point': point,
+            'x': f'{step * index:.1f}',
+            'outflow_x': f'{step * index + bar_width:.1f}',
+            'width': f'{bar_width:.1f}',
+            'inflow_y': f'{height - inflow:.1f}',
+            'inflow_height': f'{inflow:.1f}',
+            'outflow_y': f'{height - outflow:.1f}',
+            'outflow_height': f'{outflow:.1f}',
+        })
+    return {'width': width, 'height': height, 'points': ' '.join(points), 'bars': bars, 'low': low, 'high': high}
+
+class AccountCreateView(UserOwnershipMixin, AtomicWriteMixin, CreateView):
     """계좌 생성 뷰"""
     model = Account
     form_class = AccountForm
@@ -75,7 +128,7 @@ class AccountCreateView(UserOwnershipMixin, CreateView):
         messages.success(self.request, '계좌가 등록되었습니다.')
         return super().form_valid(form)
 
-class AccountUpdateView(UserOwnershipMixin, UpdateView):
+class AccountUpdateView(UserOwnershipMixin, AtomicWriteMixin, UpdateView):
     """계좌 수정 뷰"""
     model = Account
     form_class = AccountForm
@@ -86,7 +139,7 @@ class AccountUpdateView(UserOwnershipMixin, UpdateView):
         messages.success(self.request, '계좌 정보가 수정되었습니다.')
         return super().form_valid(form)
 
-class AccountDeleteView(UserOwnershipMixin, DeleteView):
+class AccountDeleteView(UserOwnershipMixin, AtomicWriteMixin, DeleteView):
     """계좌 삭제 뷰"""
     model = Account
     template_name = 'accounts/account_confirm_delete.html'
@@ -1 +1,8 @@
 from django.contrib import admin
+from .models import MonthlyRollup
+
+@admin.register(MonthlyRollup)
+class MonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ['user', 'month', 'category', 'transaction_type', 'total_amount', 'transaction_count']
+    list_filter = ['transaction_type', 'month']
+    search_fields = ['user__username', 'category__name']
@@ -4,3 +4,6 @@ class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.dashboard'
     verbose_name = '대시보드'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (Transaction 변경 시 월간 집계 갱신)
@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from apps.dashboard import rollups
+
+
+class Command(BaseCommand):
+    help = '거래 원장에서 월간 집계(MonthlyRollup) 테이블을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='특정 사용자(username)만 다시 계산')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"사용자를 찾을 수 없습니다: {options['user']}")
+
+        created = rollups.rebuild(user)
+        self.stdout.write(self.style.SUCCESS(f'월간 집계 {created}행을 다시 생성했습니다.'))
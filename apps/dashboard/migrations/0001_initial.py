@@ -0,0 +1,39 @@
+# Generated by Django 5.0 on 2026-10-18 17:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('transactions', '0002_alter_transaction_amount'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='월')),
+                ('transaction_type', models.CharField(choices=[('income', '입금'), ('expense', '출금')], max_length=10, verbose_name='거래유형')),
+                ('total_amount', models.DecimalField(decimal_places=0, default=0, max_digits=18, verbose_name='합계')),
+                ('transaction_count', models.IntegerField(default=0, verbose_name='건수')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='transactions.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '월간 집계',
+                'verbose_name_plural': '월간 집계 목록',
+                'ordering': ['month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'category', 'transaction_type'), name='unique_monthly_rollup'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill(apps, schema_editor):
+    """기존 거래 데이터로 월간 집계 채우기"""
+    Transaction = apps.get_model('transactions', 'Transaction')
+    MonthlyRollup = apps.get_model('dashboard', 'MonthlyRollup')
+
+    rows = Transaction.objects.order_by().annotate(
+        month=TruncMonth('occurred_at')
+    ).values(
+        'user_id', 'month', 'category_id', 'transaction_type'
+    ).annotate(
+        total=Sum('amount'),
+        count=Count('id')
+    )
+    MonthlyRollup.objects.bulk_create([
+        MonthlyRollup(
+            user_id=row['user_id'],
+            month=row['month'].date(),
+            category_id=row['category_id'],
+            transaction_type=row['transaction_type'],
+            total_amount=row['total'],
+            transaction_count=row['count'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
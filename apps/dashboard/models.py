@@ -1 +1,30 @@
 from django.db import models
+from django.contrib.auth.models import User
+from apps.transactions.models import Category, Transaction
+
+class MonthlyRollup(models.Model):
+    """사용자별 월간 거래 집계 (사용자, 월, 카테고리, 거래유형 단위)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_rollups')
+    month = models.DateField(verbose_name='월')  # 해당 월의 1일 (TIME_ZONE 기준)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='monthly_rollups')
+    transaction_type = models.CharField(
+        max_length=10,
+        choices=Transaction.TRANSACTION_TYPE_CHOICES,
+        verbose_name='거래유형'
+    )
+    total_amount = models.DecimalField(max_digits=18, decimal_places=0, default=0, verbose_name='합계')
+    transaction_count = models.IntegerField(default=0, verbose_name='건수')
+    
+    class Meta:
+        ordering = ['month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'month', 'category', 'transaction_type'],
+                name='unique_monthly_rollup',
+            ),
+        ]
+        verbose_name = '월간 집계'
+        verbose_name_plural = '월간 집계 목록'
+    
+    def __str__(self):
+        return f"{self.user} {self.month:%Y-%m} {self.category} {self.transaction_type}"
@@ -0,0 +1,103 @@
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from apps.transactions.models import Transaction
+from core.utils import month_start
+from .models import MonthlyRollup
+
+BATCH_SIZE = 1000
+
+
+def rollup_key(user_id, occurred_at, category_id, transaction_type):
+    return {
+        'user_id': user_id,
+        'month': month_start(occurred_at),
+        'category_id': category_id,
+        'transaction_type': transaction_type,
+    }
+
+
+def key_for(tx):
+    """Transaction 인스턴스(또는 values() dict)의 집계 키"""
+    if isinstance(tx, dict):
+        return rollup_key(tx['user_id'], tx['occurred_at'], tx['category_id'], tx['transaction_type'])
+    return rollup_key(tx.user_id, tx.occurred_at, tx.category_id, tx.transaction_type)
+
+
+def apply_delta(key, amount, count):
+    """
+    집계 행에 증감분을 반영합니다.
+    감소(count <= 0)는 기존 행만 갱신하고, 건수가 0이 된 행은 삭제합니다.
+    """
+    amount = Decimal(amount)
+    rows = MonthlyRollup.objects.filter(**key)
+    updated = rows.update(
+        total_amount=F('total_amount') + amount,
+        transaction_count=F('transaction_count') + count,
+    )
+    if count < 0 and updated:
+        rows.filter(transaction_count__lte=0).delete()
+    if count <= 0 or updated:
+        return
+    try:
+        with transaction.atomic():
+            MonthlyRollup.objects.create(**key, total_amount=amount, transaction_count=count)
+    except IntegrityError:
+        # 동시에 같은 키가 생성된 경우
+        rows.update(
+            total_amount=F('total_amount') + amount,
+            transaction_count=F('transaction_count') + count,
+        )
+
+
+def apply_many(transactions):
+    """bulk_create 등 시그널을 거치지 않은 거래들을 키별로 묶어 반영"""
+    deltas = {}
+    for tx in transactions:
+        key = tuple(sorted(key_for(tx).items()))
+        amount, count = deltas.get(key, (Decimal('0'), 0))
+        deltas[key] = (amount + Decimal(tx.amount), count + 1)
+    with transaction.atomic():
+        for key, (amount, count) in deltas.items():
+            apply_delta(dict(key), amount, count)
+
+
+def rebuild(user=None):
+    """원장(Transaction)에서 집계 테이블을 다시 계산합니다. 생성된 행 수를 반환"""
+    transactions = Transaction.objects.all()
+    rollups = MonthlyRollup.objects.all()
+    if user is not None:
+        transactions = transactions.filter(user=user)
+        rollups = rollups.filter(user=user)
+
+    rows = transactions.order_by().annotate(
+        month=TruncMonth('occurred_at')
+    ).values(
+        'user_id', 'month', 'category_id', 'transaction_type'
+    ).annotate(
+        total=Sum('amount'),
+        count=Count('id')
+    )
+
+    created = 0
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(MonthlyRollup(
+                user_id=row['user_id'],
+                month=row['month'].date(),
+                category_id=row['category_id'],
+                transaction_type=row['transaction_type'],
+                total_amount=row['total'],
+                transaction_count=row['count'],
+            ))
+            if len(batch) >= BATCH_SIZE:
+                MonthlyRollup.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            MonthlyRollup.objects.bulk_create(batch)
+            created += len(batch)
+    return created
@@ -0,0 +1,55 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.transactions.models import Transaction
+from apps.transactions.signals import transactions_bulk_created, transactions_bulk_updated
+from core.fixtures import fixture_loaded
+from . import rollups
+
+@receiver(post_save, sender=Transaction)
+def update_rollup_on_save(sender, instance, created, **kwargs):
+    # 수정 전 값은 apps.transactions.signals.remember_previous_values가 pre_save에서 기억해 둠
+    previous = getattr(instance, '_previous', None)
+    key = rollups.key_for(instance)
+    amount = Decimal(instance.amount)
+
+    # 이전 행 차감과 새 행 가산을 함께 처리. 거래 저장과 한 트랜잭션이 되는 것은
+    # 쓰는 쪽이 감싼 트랜잭션 덕분 (화면: core.mixins.AtomicWriteMixin)
+    with transaction.atomic():
+        if previous is None:
+            rollups.apply_delta(key, amount, 1)
+            return
+        previous_key = rollups.key_for(previous)
+        if previous_key == key:
+            # 같은 월/카테고리/유형 안에서 금액만 바뀐 경우
+            if amount != previous['amount']:
+                rollups.apply_delta(key, amount - previous['amount'], 0)
+        else:
+            # 월, 카테고리 또는 유형이 바뀐 경우: 이전 행에서 빼고 새 행에 더함
+            rollups.apply_delta(previous_key, -previous['amount'], -1)
+            rollups.apply_delta(key, amount, 1)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    rollups.apply_delta(rollups.key_for(instance), -instance.amount, -1)
+
+
+@receiver(transactions_bulk_created)
+def update_rollup_on_bulk_create(sender, transactions, **kwargs):
+    rollups.apply_many(transactions)
+
+
+@receiver(transactions_bulk_updated)
+def rebuild_rollups_on_bulk_update(sender, user_ids, **kwargs):
+    # 이전 값을 모르므로 해당 사용자의 집계를 다시 계산
+    for user_id in user_ids:
+        rollups.rebuild(user=user_id)
+
+
+@receiver(fixture_loaded, sender=Transaction)
+def rebuild_rollups_on_fixture_load(sender, **kwargs):
+    # 픽스처는 기존 거래를 덮어쓸 수도 있어 증분 대신 전체를 다시 계산
+    rollups.rebuild()
+
@@ -5,7 +5,12 @@ from apps.trips.models import Country, City, Trip
 from apps.accounts.models import Account
 from apps.transactions.models import Category, Transaction
 from django.utils import timezone
+from django.core.management import call_command
+from datetime import date, datetime
 from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from apps.dashboard.models import MonthlyRollup
 
 class DashboardAccessTest(TestCase):
     """테스트 1: 대시보드 접근 권한 테스트"""
@@ -169,4 +174,159 @@ class DashboardUserIsolationTest(TestCase):
         # user1의 지출(10만원)만 집계되어야 함
         food_stat = next((s for s in category_stats if s.get('category__name') == '식비'), None)
         self.assertIsNotNone(food_stat)
-        self.assertEqual(Decimal(str(food_stat.get('total'))), Decimal('100000'))
\ No newline at end of file
+        self.assertEqual(Decimal(str(food_stat.get('total'))), Decimal('100000'))
+
+class MonthlyRollupTest(TestCase):
+    """테스트 4: 월간 집계 테이블 증분 갱신 테스트"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.dashboard_url = '/dashboard/'
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.account = Account.objects.create(user=self.user, name='계좌', bank_name='은행', account_number='111')
+        self.food = Category.objects.create(name="식비")
+        self.transport = Category.objects.create(name="교통비")
+        self.jan = timezone.make_aware(datetime(2026, 1, 15, 12, 0))
+        self.feb = timezone.make_aware(datetime(2026, 2, 15, 12, 0))
+        self.tx = Transaction.objects.create(
+            user=self.user, account=self.account, category=self.food,
+            transaction_type='expense', amount=Decimal('10000'), occurred_at=self.jan
+        )
+    
+    def rollup(self, category, month):
+        return MonthlyRollup.objects.filter(
+            user=self.user, category=category, month=month, transaction_type='expense'
+        ).first()
+    
+    def test_create_adds_to_rollup(self):
+        """거래 생성 시 해당 월/카테고리 집계에 더해짐"""
+        Transaction.objects.create(
+            user=self.user, account=self.account, category=self.food,
+            transaction_type='expense', amount=Decimal('5000'), occurred_at=self.jan
+        )
+        rollup = self.rollup(self.food, date(2026, 1, 1))
+        self.assertEqual(rollup.total_amount, Decimal('15000'))
+        self.assertEqual(rollup.transaction_count, 2)
+    
+    def test_update_moves_between_month_and_category(self):
+        """월/카테고리 변경 시 이전 집계에서 빠지고 새 집계로 이동"""
+        self.tx.occurred_at = self.feb
+        self.tx.category = self.transport
+        self.tx.amount = Decimal('7000')
+        self.tx.save()
+        
+        self.assertIsNone(self.rollup(self.food, date(2026, 1, 1)))
+        rollup = self.rollup(self.transport, date(2026, 2, 1))
+        self.assertEqual(rollup.total_amount, Decimal('7000'))
+        self.assertEqual(rollup.transaction_count, 1)
+    
+    def test_delete_removes_from_rollup(self):
+        """거래 삭제 시 집계에서 차감되고 빈 행은 삭제"""
+        self.tx.delete()
+        self.assertFalse(MonthlyRollup.objects.filter(user=self.user).exists())
+    
+    def test_failed_view_write_keeps_rollup_in_sync(self):
+        """수정 화면에서 저장 뒤에 실패하면 거래와 집계가 함께 롤백됨"""
+        self.client.login(username='testuser', password='testpass123')
+        data = {
+            'account': self.account.pk, 'category': self.transport.pk, 'transaction_type': 'expense',
+            'amount': '7000', 'occurred_at': '2026-02-15T12:00', 'merchant': '', 'memo': '',
+        }
+        with mock.patch('apps.transactions.views.messages.success', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse('transaction_update', args=[self.tx.pk]), data)
+        
+        self.tx.refresh_from_db()
+        self.assertEqual(self.tx.category, self.food)
+        rollup = self.rollup(self.food, date(2026, 1, 1))
+        self.assertEqual(rollup.total_amount, Decimal('10000'))
+        self.assertEqual(rollup.transaction_count, 1)
+        self.assertIsNone(self.rollup(self.transport, date(2026, 2, 1)))
+    
+    def test_rebuild_matches_incremental_rollup(self):
+        """rebuild_rollups 명령 결과가 증분 갱신 결과와 같음"""
+        Transaction.objects.create(
+            user=self.user, account=self.account, category=self.transport,
+            transaction_type='income', amount=Decimal('3000'), occurred_at=self.feb
+        )
+        before = list(MonthlyRollup.objects.values_list(
+            'month', 'category_id', 'transaction_type', 'total_amount', 'transaction_count'
+        ).order_by('month', 'category_id'))
+        
+        call_command('rebuild_rollups', stdout=StringIO())
+        after = list(MonthlyRollup.objects.values_list(
+            'month', 'category_id', 'transaction_type', 'total_amount', 'transaction_count'
+        ).order_by('month', 'category_id'))
+        self.assertEqual(before, after)
+    
+    def test_category_stats_read_from_rollup(self):
+        """대시보드 카테고리 통계가 집계 테이블 기준으로 계산됨"""
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(self.dashboard_url)
+        stats = response.context['category_stats']
+        self.assertEqual(stats[0]['category__name'], '식비')
+        self.assertEqual(stats[0]['total'], Decimal('10000'))
+        self.assertEqual(stats[0]['count'], 1)
+
+
+class DashboardQueryCountTest(TestCase):
+    """테스트 5: 대시보드 쿼리 수 테스트"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        account = Account.objects.create(user=self.user, name='계좌', bank_name='은행', account_number='111')
+        country = Country.objects.create(name="일본")
+        city = City.objects.create(name="도쿄", country=country)
+        category = Category.objects.create(name="식비")
+        for i in range(3):
+            trip = Trip.objects.create(user=self.user, name=f"여행{i}", country=country, city=city, start_date="2026-03-01")
+            Transaction.objects.create(
+                user=self.user, account=account, trip=trip, category=category,
+                transaction_type='income' if i == 0 else 'expense',
+                amount=Decimal('1000'), occurred_at=timezone.now()
+            )
+        self.client.force_login(self.user)
+    
+    def test_current_month_summary(self):
+        response = self.client.get('/dashboard/')
+        summary = response.context['current_month_summary']
+        self.assertEqual(summary['total_income'], Decimal('1000'))
+        self.assertEqual(summary['total_expense'], Decimal('2000'))
+        self.assertEqual(summary['net_amount'], Decimal('-1000'))
+        self.assertEqual(summary['transaction_count'], 3)
+    
+    def test_query_count(self):
+        """세션, 사용자, 데이터/참조 데이터 버전, 월별/카테고리 집계, 이번 달 요약(1회), 여행 목록 = 8회"""
+        with self.assertNumQueries(8):
+            self.client.get('/dashboard/')
+        # 데이터가 바뀌기 전까지는 캐시된 통계 (세션, 사용자, 데이터/참조 데이터 버전)
+        with self.assertNumQueries(4):
+            response = self.client.get('/dashboard/')
+        self.assertEqual(response.context['current_month_summary']['transaction_count'], 3)
+    
+    def test_stats_window_moves_within_month(self):
+        """시작 월은 180일 전이 속한 달 - 같은 달 안에서도 바뀌면 캐시를 다시 계산"""
+        Transaction.objects.create(
+            user=self.user, account=Account.objects.get(user=self.user), category=Category.objects.get(name="식비"),
+            transaction_type='expense', amount=Decimal('500'),
+            occurred_at=timezone.make_aware(datetime(2026, 4, 20, 12, 0)),
+        )
+        months = lambda response: [row['month'] for row in response.context['monthly_stats']]
+        with mock.patch('django.utils.timezone.now', return_value=timezone.make_aware(datetime(2026, 10, 27, 12, 0))):
+            self.assertIn(date(2026, 4, 1), months(self.client.get('/dashboard/')))
+        with mock.patch('django.utils.timezone.now', return_value=timezone.make_aware(datetime(2026, 10, 28, 12, 0))):
+            self.assertNotIn(date(2026, 4, 1), months(self.client.get('/dashboard/')))
+    
+    def test_stats_follow_category_rename(self):
+        self.client.get('/dashboard/')
+        category = Category.objects.get(name="식비")
+        category.name = "외식"
+        category.save()
+        response = self.client.get('/dashboard/')
+        self.assertEqual([row['category__name'] for row in response.context['category_stats']], ["외식"])
+    
+    def test_stats_follow_data_version(self):
+        self.client.get('/dashboard/')
+        Transaction.objects.filter(user=self.user).first().delete()
+        response = self.client.get('/dashboard/')
+        self.assertEqual(response.context['current_month_summary']['transaction_count'], 2)
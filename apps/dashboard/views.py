@@ -1,39 +1,52 @@
 from django.views.generic import TemplateView # 데이터 담아서 템플릿에 전달
 from django.contrib.auth.mixins import LoginRequiredMixin # 로그인 해야 접속 가능
-from django.db.models import Sum, Count
-from django.db.models.functions import TruncMonth # 날짜를 월 단위로 자르는 함수
-from datetime import datetime, timedelta # 파이썬 날짜 계산
+from django.db.models import Sum
+from django.utils import timezone
+from datetime import timedelta # 파이썬 날짜 계산
 from apps.transactions.models import Transaction
 from apps.trips.models import Trip
+from .models import MonthlyRollup
+from .rollups import month_start
+from core.aggregates import summarize
+from core.mixins import ConditionalGetMixin
+from core.versioning import cached_for_user
 
-class DashboardView(LoginRequiredMixin, TemplateView):
+class DashboardView(LoginRequiredMixin, ConditionalGetMixin, TemplateView):
     """대시보드 뷰"""
     template_name = 'dashboard/dashboard.html'
     
     def get_context_data(self, **kwargs): # 템플릿에 전달할 데이터 묶음
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-        
-        context['monthly_stats'] = self.get_monthly_stats(user)
-        context['category_stats'] = self.get_category_stats(user)
-        context['trip_stats'] = self.get_trip_stats(user)
-        context['current_month_summary'] = self.get_current_month_summary(user)
-        
+        context.update(self.get_stats(self.request.user))
         return context
     
-    def get_monthly_stats(self, user):
-        """월별 지출 통계"""
-        six_months_ago = datetime.now() - timedelta(days=180)
+    def get_stats(self, user):
+        """대시보드 통계 전체 (사용자 데이터 버전, 카테고리/국가/도시 버전, 집계 구간(시작 월, 이번 달) 단위로 캐시)"""
+        now = timezone.localtime()
+        six_months_ago = month_start(now - timedelta(days=180))
+        this_month = month_start(now)
         
-        monthly_data = Transaction.objects.filter(
+        def compute():
+            return {
+                'monthly_stats': self.get_monthly_stats(user, six_months_ago),
+                'category_stats': self.get_category_stats(user),
+                'trip_stats': list(self.get_trip_stats(user)),
+                'current_month_summary': self.get_current_month_summary(user, now),
+            }
+        return cached_for_user(
+            user.pk, 'dashboard:stats', f'{six_months_ago.isoformat()}:{this_month.isoformat()}', compute,
+            version=self.data_version, references=('transactions.category', 'trips.country', 'trips.city'),
+        )
+    
+    def get_monthly_stats(self, user, six_months_ago):
+        """월별 지출 통계 (월간 집계 테이블 사용, six_months_ago: 시작 월 1일)"""
+        monthly_data = MonthlyRollup.objects.filter(
             user=user,
             transaction_type='expense',
-            occurred_at__gte=six_months_ago
-        ).annotate(
-            month=TruncMonth('occurred_at')
+            month__gte=six_months_ago
         ).values('month').annotate(
-            total=Sum('amount'),
-            count=Count('id')
+            total=Sum('total_amount'),
+            count=Sum('transaction_count')
         ).order_by('month')
         
         return list(monthly_data)
@@ -41,15 +54,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 # values: 카테고리 기준 그룹 annotate: 그룹별 계산
 
     def get_category_stats(self, user):
-        """카테고리별 지출 통계"""
-        category_data = Transaction.objects.filter(
+        """카테고리별 지출 통계 (월간 집계 테이블 사용)"""
+        category_data = MonthlyRollup.objects.filter(
             user=user,
             transaction_type='expense'
         ).values(
             'category__name'
         ).annotate(
-            total=Sum('amount'),
-            count=Count('id')
+            total=Sum('total_amount'),
+            count=Sum('transaction_count')
         ).order_by('-total')[:10]
         
         total_expense = sum(item['total'] for item in category_data)
@@ -64,7 +77,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     
     def get_trip_stats(self, user): # 화면 확인
         """여행별 지출 통계"""
-        trips = Trip.objects.filter(user=user).annotate(
+        trips = Trip.objects.filter(user=user).select_related('country', 'city').annotate(
             total_expense=Sum(
                 'transaction_set__amount',
                 filter=models.Q(transaction_set__transaction_type='expense')
@@ -73,9 +86,8 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         
         return trips
     
-    def get_current_month_summary(self, user):
-        """이번 달 요약"""
-        now = datetime.now()
+    def get_current_month_summary(self, user, now):
+        """이번 달 요약 (now: 현재 타임존 기준 현재 시각)"""
         start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
         transactions = Transaction.objects.filter(
@@ -83,19 +95,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             occurred_at__gte=start_of_month
         )
         
-        total_income = transactions.filter(
-            transaction_type='income'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        total_expense = transactions.filter(
-            transaction_type='expense'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        return {
-            'total_income': total_income,
-            'total_expense': total_expense,
-            'net_amount': total_income - total_expense,
-            'transaction_count': transactions.count()
-        }
+        # 입금/출금/순액/건수를 쿼리 한 번으로 집계
+        return summarize(transactions)
 
 from django.db import models
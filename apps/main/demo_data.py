@@ -0,0 +1,278 @@
+"""
+대량 데모 데이터 생성기 (generate_demo_data 명령).
+
+같은 seed와 인자(기준일 포함)로 실행하면 항상 같은 데이터가 만들어집니다.
+- 사용자(+프로필), 사용자별 계좌 1~3개, 여행 0~6개(인기 국가/도시 가중치)
+- 거래: 사용자별 건수는 롱테일(파레토) 분포, 지출의 약 40%는 여행 기간 중,
+  시각은 낮/저녁 위주, 금액은 카테고리별 로그정규 분포(100원 단위), 약 4%는 입금
+- 거래는 batch_size 단위 bulk_create(PostgreSQL은 COPY)로 저장하고,
+  시그널을 거치지 않으므로 끝난 뒤 월간 집계/캐시를 한 번에 다시 계산합니다.
+"""
+import io
+import math
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.accounts.models import Account, Profile
+from apps.accounts import balances
+from apps.dashboard import rollups
+from apps.transactions.models import Category, Transaction
+from apps.transactions.refdata import categories as category_table
+from apps.trips.gazetteer import GazetteerLoader
+from apps.trips.models import City, Trip
+from core.versioning import bump_data_version
+from .stats import refresh_site_stats
+
+BATCH_SIZE = 10000
+
+# 국가: (가중치, [(도시, 인구)])
+DESTINATIONS = {
+    '일본': (30, [('도쿄', 14000000), ('오사카', 2700000), ('후쿠오카', 1600000), ('교토', 1460000), ('삿포로', 1970000)]),
+    '베트남': (14, [('호치민', 9000000), ('하노이', 8000000), ('다낭', 1200000), ('나트랑', 420000)]),
+    '태국': (10, [('방콕', 10500000), ('치앙마이', 130000), ('푸켓', 420000)]),
+    '미국': (9, [('뉴욕', 8300000), ('로스앤젤레스', 3900000), ('샌프란시스코', 870000), ('호놀룰루', 350000)]),
+    '대만': (8, [('타이베이', 2600000), ('가오슝', 2700000)]),
+    '대한민국': (8, [('서울', 9400000), ('부산', 3300000), ('제주', 490000)]),
+    '프랑스': (5, [('파리', 2100000), ('니스', 340000), ('리옹', 520000)]),
+    '이탈리아': (4, [('로마', 2800000), ('밀라노', 1400000), ('피렌체', 370000), ('베네치아', 250000)]),
+    '스페인': (4, [('바르셀로나', 1600000), ('마드리드', 3300000)]),
+    '영국': (3, [('런던', 8900000), ('에든버러', 520000)]),
+    '싱가포르': (3, [('싱가포르', 5600000)]),
+    '호주': (2, [('시드니', 5300000), ('멜버른', 5000000)]),
+}
+
+# 지출 카테고리: (이름, 가중치, 금액 중앙값(원), 로그 표준편차, 가맹점)
+EXPENSE_CATEGORIES = [
+    ('식비', 34, 14000, 0.6, ['김밥천국', '맥도날드', '이자카야 하나', '현지 식당', '푸드코트', '라멘집']),
+    ('카페', 15, 6000, 0.35, ['스타벅스', '블루보틀', '투썸플레이스', '동네 카페']),
+    ('교통', 18, 7000, 0.9, ['지하철', '택시', '버스', '공항철도', '렌터카']),
+    ('쇼핑', 12, 35000, 0.9, ['편의점', '면세점', '드럭스토어', '백화점', '기념품점']),
+    ('관광', 8, 25000, 0.7, ['박물관', '테마파크', '투어 예약', '전망대']),
+    ('숙박', 7, 110000, 0.5, ['호텔', '게스트하우스', '에어비앤비', '료칸']),
+    ('항공', 2, 420000, 0.45, ['대한항공', '아시아나항공', '제주항공', '티웨이항공']),
+    ('기타', 4, 15000, 1.0, ['수수료', '기타']),
+]
+INCOME_CATEGORY = ('급여', 2500000, 0.4, ['급여 입금', '환급', '이체 입금'])
+INCOME_RATIO = 0.04
+TRIP_SHARE = 0.4
+
+BANKS = ['국민은행', '신한은행', '우리은행', '하나은행', '카카오뱅크', '토스뱅크']
+ACCOUNT_NAMES = ['생활비 통장', '트래블 카드', '여행 적금', '비상금 통장']
+# 0~23시 거래 비중
+HOUR_WEIGHTS = [1, 1, 0, 0, 0, 0, 1, 2, 4, 5, 5, 6, 9, 8, 6, 5, 5, 6, 8, 9, 8, 6, 4, 2]
+
+
+class DemoDataGenerator:
+    def __init__(self, users=100, transactions=100_000, seed=42, months=24, prefix='demo',
+                 password='demo1234!', end_date=None, batch_size=BATCH_SIZE, log=None):
+        self.rng = random.Random(seed)
+        self.user_count = users
+        self.transaction_count = transactions
+        self.prefix = prefix
+        self.password = password
+        self.end_date = end_date or date.today()
+        self.start_date = self.end_date - timedelta(days=months * 30)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.tz = timezone.get_current_timezone()
+
+    def run(self):
+        """데이터를 만들고 {종류: 건수}를 반환"""
+        self.prepare_reference_data()
+        users = self.create_users()
+        accounts = self.create_accounts(users)
+        trips = self.create_trips(users)
+        created = self.create_transactions(users, accounts, trips)
+        self.refresh_derived_data(users)
+        return {'users': len(users), 'accounts': sum(map(len, accounts.values())),
+                'trips': sum(map(len, trips.values())), 'transactions': created}
+
+    def prepare_reference_data(self):
+        GazetteerLoader().run(
+            (country, city, population)
+            for country, (_, cities) in DESTINATIONS.items()
+            for city, population in cities
+        )
+        self.cities = {
+            (city.country.name, city.name): city
+            for city in City.objects.filter(country__name__in=DESTINATIONS).select_related('country')
+        }
+        names = [name for name, *_ in EXPENSE_CATEGORIES] + [INCOME_CATEGORY[0]]
+        Category.objects.bulk_create([Category(name=name) for name in names], ignore_conflicts=True)
+        category_ids = dict(Category.objects.filter(name__in=names).values_list('name', 'id'))
+        self.expense_categories = [
+            (category_ids[name], weight, math.log(median), sigma, merchants)
+            for name, weight, median, sigma, merchants in EXPENSE_CATEGORIES
+        ]
+        self.expense_weights = [weight for _, weight, *_ in self.expense_categories]
+        name, median, sigma, merchants = INCOME_CATEGORY
+        self.income_category = (category_ids[name], math.log(median), sigma, merchants)
+        category_table.invalidate()
+
+    def create_users(self):
+        usernames = [f'{self.prefix}{i:06d}' for i in range(1, self.user_count + 1)]
+        if User.objects.filter(username__in=usernames[:1] + usernames[-1:]).exists():
+            raise ValueError(f"'{self.prefix}' 접두어의 사용자가 이미 있습니다. 다른 --prefix를 사용하세요.")
+        password = make_password(self.password)  # 해시 계산은 한 번만
+        joined = timezone.make_aware(datetime.combine(self.start_date, time()), self.tz)
+        User.objects.bulk_create(
+            [User(username=name, email=f'{name}@example.com', password=password, date_joined=joined)
+             for name in usernames],
+            batch_size=self.batch_size,
+        )
+        users = list(User.objects.filter(username__in=usernames).order_by('username'))
+        ages = [code for code, _ in Profile.AGE_CHOICES]
+        Profile.objects.bulk_create(
+            [Profile(user=user, age_group=self.rng.choices(ages, weights=[5, 35, 30, 20, 10])[0],
+                     gender=self.rng.choice('MF'))
+             for user in users],
+            batch_size=self.batch_size,
+        )
+        self.log(f'사용자 {len(users)}명 생성')
+        return users
+
+    def create_accounts(self, users):
+        rows = []
+        for user in users:
+            for index in range(self.rng.choice((1, 1, 2, 2, 3))):
+                rows.append(Account(
+                    user=user,
+                    name=ACCOUNT_NAMES[index],
+                    bank_name=self.rng.choice(BANKS),
+                    account_number=f'{self.rng.randrange(100, 1000)}-{self.rng.randrange(10**6, 10**7)}',
+                ))
+        Account.objects.bulk_create(rows, batch_size=self.batch_size)
+        accounts = {}
+        for account_id, user_id in Account.objects.filter(user__in=users).order_by('id').values_list('id', 'user_id'):
+            accounts.setdefault(user_id, []).append(account_id)
+        return accounts
+
+    def create_trips(self, users):
+        countries = list(DESTINATIONS)
+        weights = [DESTINATIONS[name][0] for name in countries]
+        span = (self.end_date - self.start_date).days
+        rows = []
+        for user in users:
+            for _ in range(self.rng.choice((0, 1, 2, 2, 3, 4, 6))):
+                country = self.rng.choices(countries, weights=weights)[0]
+                city_name = self.rng.choice(DESTINATIONS[country][1])[0]
+                start = self.start_date + timedelta(days=self.rng.randrange(span))
+                rows.append(Trip(
+                    user=user,
+                    name=f'{city_name} 여행',
+                    country=self.cities[country, city_name].country,
+                    city=self.cities[country, city_name],
+                    start_date=start,
+                    end_date=min(start + timedelta(days=self.rng.choice((2, 3, 3, 4, 5, 7, 10, 14))), self.end_date),
+                ))
+        Trip.objects.bulk_create(rows, batch_size=self.batch_size)
+        trips = {}
+        for trip in Trip.objects.filter(user__in=users).order_by('id').values('id', 'user_id', 'start_date', 'end_date'):
+            trips.setdefault(trip['user_id'], []).append(trip)
+        return trips
+
+    def share_counts(self, users):
+        """전체 거래 수를 사용자별로 롱테일 분배"""
+        weights = [self.rng.paretovariate(1.3) for _ in users]
+        total = sum(weights)
+        counts = [int(self.transaction_count * weight / total) for weight in weights]
+        for index in range(self.transaction_count - sum(counts)):
+            counts[index % len(counts)] += 1
+        return counts
+
+    def random_time(self, day):
+        hour = self.rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+        moment = datetime.combine(day, time(hour, self.rng.randrange(60), self.rng.randrange(60)))
+        return timezone.make_aware(moment, self.tz)
+
+    def amount(self, log_median, sigma):
+        value = self.rng.lognormvariate(log_median, sigma)
+        return Decimal(max(100, int(round(value, -2))))
+
+    def generate_rows(self, users, accounts, trips):
+        """(user_id, account_id, trip_id, category_id, 구분, 금액, 시각, 가맹점)을 하나씩 반환"""
+        span = (self.end_date - self.start_date).days + 1
+        for user, count in zip(users, self.share_counts(users)):
+            user_accounts = accounts[user.pk]
+            user_trips = trips.get(user.pk, [])
+            trip_weights = [(trip['end_date'] - trip['start_date']).days + 1 for trip in user_trips]
+            for _ in range(count):
+                account_id = self.rng.choice(user_accounts)
+                if self.rng.random() < INCOME_RATIO:
+                    category_id, log_median, sigma, merchants = self.income_category
+                    day = self.start_date + timedelta(days=self.rng.randrange(span))
+                    yield (user.pk, account_id, None, category_id, 'income', self.amount(log_median, sigma),
+                           self.random_time(day), self.rng.choice(merchants))
+                    continue
+                category_id, _, log_median, sigma, merchants = self.rng.choices(
+                    self.expense_categories, weights=self.expense_weights
+                )[0]
+                trip_id = None
+                if user_trips and self.rng.random() < TRIP_SHARE:
+                    index = self.rng.choices(range(len(user_trips)), weights=trip_weights)[0]
+                    trip_id = user_trips[index]['id']
+                    day = user_trips[index]['start_date'] + timedelta(days=self.rng.randrange(trip_weights[index]))
+                else:
+                    day = self.start_date + timedelta(days=self.rng.randrange(span))
+                yield (user.pk, account_id, trip_id, category_id, 'expense', self.amount(log_median, sigma),
+                       self.random_time(day), self.rng.choice(merchants))
+
+    def create_transactions(self, users, accounts, trips):
+        write = self.copy_batch if connection.vendor == 'postgresql' else self.bulk_create_batch
+        created = 0
+        batch = []
+        for row in self.generate_rows(users, accounts, trips):
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                created += write(batch)
+                batch = []
+                if created % (self.batch_size * 10) == 0:
+                    self.log(f'거래 {created:,}건 저장')
+        if batch:
+            created += write(batch)
+        return created
+
+    def bulk_create_batch(self, batch):
+        with transaction.atomic():
+            Transaction.objects.bulk_create([
+                Transaction(
+                    user_id=user_id, account_id=account_id, trip_id=trip_id, category_id=category_id,
+                    transaction_type=tx_type, amount=amount, occurred_at=occurred_at, merchant=merchant,
+                )
+                for user_id, account_id, trip_id, category_id, tx_type, amount, occurred_at, merchant in batch
+            ])
+        return len(batch)
+
+    def copy_batch(self, batch):
+        """PostgreSQL COPY로 저장 (bulk_create보다 수 배 빠름)"""
+        now = timezone.now()
+        columns = ('user_id', 'account_id', 'trip_id', 'category_id', 'transaction_type', 'amount',
+                   'occurred_at', 'merchant', 'memo', 'created_at', 'updated_at')
+        sql = f'COPY {Transaction._meta.db_table} ({", ".join(columns)}) FROM STDIN'
+        with transaction.atomic(), connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy'):  # psycopg 3
+                with raw.copy(sql) as copy:
+                    for row in batch:
+                        copy.write_row((*row, '', now, now))
+            else:  # psycopg2
+                buffer = io.StringIO()
+                for row in batch:
+                    values = [r'\N' if value is None else str(value) for value in (*row, '', now, now)]
+                    buffer.write('\t'.join(values) + '\n')
+                buffer.seek(0)
+                raw.copy_expert(sql, buffer)
+        return len(batch)
+
+    def refresh_derived_data(self, users):
+        """bulk 저장은 시그널을 보내지 않으므로 집계/캐시를 한 번에 갱신"""
+        self.log('월간 집계/계좌 잔액 다시 계산')
+        rollups.rebuild()
+        balances.rebuild()
+        for user in users:
+            bump_data_version(user.pk)
+        refresh_site_stats()
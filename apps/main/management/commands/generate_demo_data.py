@@ -0,0 +1,42 @@
+import time
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from apps.main.demo_data import BATCH_SIZE, DemoDataGenerator
+
+
+class Command(BaseCommand):
+    help = '부하 테스트용 데모 데이터(사용자/프로필/계좌/여행/거래)를 대량으로 생성합니다. 같은 --seed면 같은 데이터가 만들어집니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='생성할 사용자 수')
+        parser.add_argument('--transactions', type=int, default=100_000, help='생성할 전체 거래 수')
+        parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+        parser.add_argument('--months', type=int, default=24, help='거래를 분포시킬 기간(개월)')
+        parser.add_argument('--end-date', type=date.fromisoformat, help='기간의 마지막 날 (YYYY-MM-DD, 기본: 오늘)')
+        parser.add_argument('--prefix', default='demo', help='사용자 이름 접두어 (demo000001 ...)')
+        parser.add_argument('--password', default='demo1234!', help='모든 데모 사용자의 비밀번호')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('--users는 1 이상이어야 합니다.')
+        generator = DemoDataGenerator(
+            users=options['users'],
+            transactions=options['transactions'],
+            seed=options['seed'],
+            months=options['months'],
+            prefix=options['prefix'],
+            password=options['password'],
+            end_date=options['end_date'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        started = time.monotonic()
+        try:
+            counts = generator.run()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"사용자 {counts['users']:,}명, 계좌 {counts['accounts']:,}개, 여행 {counts['trips']:,}개, "
+            f"거래 {counts['transactions']:,}건 생성 ({time.monotonic() - started:.1f}초)"
+        ))
@@ -0,0 +1,24 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.main.stats import refresh_site_stats
+
+
+class Command(BaseCommand):
+    help = '메인 페이지 통계 스냅샷을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='종료하지 않고 SITE_STATS_REFRESH_INTERVAL 간격으로 계속 갱신'
+        )
+        parser.add_argument('--interval', type=int, help='갱신 간격(초), 기본값은 설정값')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.SITE_STATS_REFRESH_INTERVAL
+        while True:
+            stats = refresh_site_stats()
+            self.stdout.write(f"사이트 통계 갱신 완료: {stats['computed_at']:%Y-%m-%d %H:%M:%S}")
+            if not options['loop']:
+                break
+            time.sleep(interval)
@@ -0,0 +1,110 @@
+import threading
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from apps.trips.models import Trip
+from apps.transactions.models import Transaction
+from apps.accounts.models import Profile
+from core import metrics
+from core.aggregates import summarize
+
+SITE_STATS_CACHE_KEY = 'main:site_stats'
+SITE_STATS_LOCK_KEY = 'main:site_stats:refreshing'
+SITE_STATS_LOCK_TIMEOUT = 60
+
+
+def compute_site_stats():
+    """메인 페이지 통계 스냅샷을 한 번에 계산합니다."""
+    # 1. 최근 여행지 3곳 (각 여행별 지출 총액 포함) - 여행별 반복 쿼리 없이 한 번에 집계
+    recent_trips = Trip.objects.select_related('city__country').annotate(
+        total_spent=Sum(
+            'transaction_set__amount',
+            filter=Q(transaction_set__transaction_type='expense')
+        )
+    ).order_by('-created_at')[:3]
+
+    # 2. 서비스 통계 요약 데이터
+    service_summary = summarize(Transaction.objects.all())
+
+    # 3. 국가별 여행 지출 TOP 3 (그래프용 데이터)
+    top_expenses = (
+        Transaction.objects.filter(transaction_type='expense', trip__isnull=False)
+        .values('trip__country__name')
+        .annotate(total=Sum('amount'))
+        .order_by('-total')[:3]
+    )
+
+    # 4. 연령대별 인기 여행지 TOP 3 - 연령대마다 쿼리하지 않고 한 번에 그룹핑
+    destinations_by_age = {age_code: [] for age_code, _ in Profile.AGE_CHOICES}
+    rows = (
+        Trip.objects
+        .filter(user__profile__age_group__in=destinations_by_age.keys())
+        .values('user__profile__age_group', 'country__name', 'city__name')
+        .annotate(visit_count=Count('id'))
+        .order_by('user__profile__age_group', '-visit_count')
+    )
+    for row in rows:
+        destinations = destinations_by_age[row.pop('user__profile__age_group')]
+        if len(destinations) < 3:
+            destinations.append(row)
+
+    return {
+        'computed_at': timezone.now(),
+        'recent_trips': [
+            {
+                'id': trip.id,
+                'name': trip.name,
+                'city': str(trip.city) if trip.city else None,
+                'start_date': trip.start_date,
+                'end_date': trip.end_date,
+                'memo': trip.memo,
+                'total_spent': trip.total_spent or 0,
+            }
+            for trip in recent_trips
+        ],
+        'total_users': User.objects.count(),
+        'total_trips': Trip.objects.count(),
+        'total_spent_all': service_summary['total_expense'],
+        'labels': [item['trip__country__name'] for item in top_expenses],
+        'data': [float(item['total']) for item in top_expenses],
+        'age_group_data': [
+            {'age_label': age_label, 'destinations': destinations_by_age[age_code]}
+            for age_code, age_label in Profile.AGE_CHOICES
+        ],
+    }
+
+
+def refresh_site_stats():
+    """스냅샷을 다시 계산해서 캐시에 저장"""
+    stats = compute_site_stats()
+    cache.set(SITE_STATS_CACHE_KEY, stats, timeout=None)
+    return stats
+
+
+def _refresh_in_background():
+    try:
+        refresh_site_stats()
+    finally:
+        cache.delete(SITE_STATS_LOCK_KEY)
+        connection.close()  # 스레드 전용 DB 연결 정리
+
+
+def get_site_stats():
+    """
+    캐시된 스냅샷을 반환합니다 (stale-while-revalidate).
+    갱신 주기가 지난 스냅샷은 그대로 반환하고, 갱신은 백그라운드 스레드 하나가 담당합니다.
+    """
+    stats = cache.get(SITE_STATS_CACHE_KEY)
+    metrics.record_cache('main:site_stats', stats is not None)
+    if stats is None:
+        return refresh_site_stats()
+
+    age = (timezone.now() - stats['computed_at']).total_seconds()
+    if age > settings.SITE_STATS_REFRESH_INTERVAL:
+        # 여러 요청이 동시에 갱신하지 않도록 잠금 키를 먼저 선점
+        if cache.add(SITE_STATS_LOCK_KEY, True, timeout=SITE_STATS_LOCK_TIMEOUT):
+            threading.Thread(target=_refresh_in_background, daemon=True).start()
+    return stats
@@ -1,10 +1,17 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 from django.contrib.auth.models import User
 from django.db.models import Sum
 from django.utils import timezone
 from apps.trips.models import Trip, Country
 from apps.transactions.models import Transaction, Category # Category 추가
 from apps.accounts.models import Profile, Account
+from apps.main.stats import get_site_stats, refresh_site_stats
 
 class MainViewSimpleTest(TestCase):
     def setUp(self):
@@ -44,4 +51,87 @@ class MainViewSimpleTest(TestCase):
         ).aggregate(Sum('amount'))['amount__sum'] or 0
         
         # 예상 결과: 1000 + 2000 = 3000
-        self.assertEqual(total_spent_all, 3000)
\ No newline at end of file
+        self.assertEqual(total_spent_all, 3000)
+
+class SiteStatsSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser')
+        Profile.objects.create(user=self.user, age_group='20s')
+        country = Country.objects.create(name="Japan")
+        account = Account.objects.create(user=self.user, name="Main")
+        category = Category.objects.create(name="식비")
+        self.trips = [
+            Trip.objects.create(user=self.user, name=f"여행{i}", country=country, start_date=timezone.now().date())
+            for i in range(3)
+        ]
+        for trip in self.trips:
+            Transaction.objects.create(
+                user=self.user, trip=trip, account=account, category=category,
+                amount=1000, transaction_type='expense', occurred_at=timezone.now()
+            )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_snapshot_contents(self):
+        """스냅샷에 여행별 지출, 전체 통계, 연령대별 인기 여행지가 담김"""
+        stats = refresh_site_stats()
+        self.assertEqual(stats['total_users'], 1)
+        self.assertEqual(stats['total_trips'], 3)
+        self.assertEqual(stats['total_spent_all'], 3000)
+        self.assertEqual([t['total_spent'] for t in stats['recent_trips']], [1000, 1000, 1000])
+        age_20s = next(a for a in stats['age_group_data'] if a['age_label'] == '20대')
+        self.assertEqual(age_20s['destinations'][0]['visit_count'], 3)
+
+    def test_main_view_served_from_snapshot_without_queries(self):
+        """스냅샷이 있으면 메인 페이지는 통계 쿼리를 실행하지 않음"""
+        refresh_site_stats()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_trips'], 3)
+
+    @override_settings(SITE_STATS_REFRESH_INTERVAL=0)
+    def test_stale_snapshot_is_served_while_refreshing(self):
+        """갱신 주기가 지난 스냅샷은 그대로 반환하고 백그라운드 갱신을 한 번만 시작"""
+        stale = refresh_site_stats()
+        with patch('apps.main.stats.threading.Thread') as thread:
+            self.assertEqual(get_site_stats(), stale)
+            self.assertEqual(get_site_stats(), stale)
+        thread.assert_called_once()
+
+
+class GenerateDemoDataTest(TestCase):
+    def generate(self, prefix, **options):
+        call_command(
+            'generate_demo_data', users=5, transactions=500, seed=7, prefix=prefix,
+            end_date=date(2026, 1, 31), batch_size=200, stdout=StringIO(), **options
+        )
+        return Transaction.objects.filter(user__username__startswith=prefix)
+
+    def test_generates_related_data(self):
+        transactions = self.generate('a')
+        self.assertEqual(transactions.count(), 500)
+        self.assertEqual(Profile.objects.filter(user__username__startswith='a').count(), 5)
+        self.assertTrue(Trip.objects.filter(user__username__startswith='a').exists())
+        self.assertTrue(transactions.filter(trip__isnull=False).exists())
+        self.assertTrue(transactions.filter(transaction_type='income').exists())
+        # bulk 저장 뒤 월간 집계도 다시 계산됨
+        from apps.dashboard.models import MonthlyRollup
+        self.assertEqual(
+            MonthlyRollup.objects.filter(user__username__startswith='a').aggregate(n=Sum('transaction_count'))['n'],
+            500,
+        )
+
+    def test_same_seed_is_deterministic(self):
+        fields = ('transaction_type', 'amount', 'occurred_at', 'merchant', 'category__name')
+        first = list(self.generate('a').order_by('id').values_list(*fields))
+        second = list(self.generate('b').order_by('id').values_list(*fields))
+        self.assertEqual(first, second)
+
+    def test_existing_prefix_is_rejected(self):
+        self.generate('a')
+        with self.assertRaises(CommandError):
+            self.generate('a')
+
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Category, Transaction, Receipt
+from .categorize import recategorize
+from .models import Category, CategoryRule, Transaction, Receipt, ReceiptBlob
+from .search import search_transactions
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -11,11 +13,43 @@ class TransactionAdmin(admin.ModelAdmin):
     list_display = ['occurred_at', 'transaction_type', 'amount', 'category', 
                     'merchant', 'user', 'account']
     list_filter = ['transaction_type', 'category', 'occurred_at']
-    search_fields = ['category__name', 'merchant', 'user__username']
+    # 가맹점/메모는 get_search_results에서 검색 인덱스로 찾음 (icontains 전체 스캔 대신)
+    search_fields = ['=category__name', '=user__username']
+    search_help_text = '가맹점/메모 검색어, 또는 카테고리명/사용자명'
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'occurred_at'
+    
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term.strip():
+            results = results | search_transactions(queryset, search_term)
+        return results, may_have_duplicates
+    
+    @admin.action(description='자동 분류 규칙으로 카테고리 다시 지정')
+    def apply_category_rules(self, request, queryset):
+        changed = recategorize(queryset)
+        self.message_user(request, f'거래 {changed}건의 카테고리를 바꿨습니다.')
+    
+    actions = ['apply_category_rules']
+
+@admin.register(CategoryRule)
+class CategoryRuleAdmin(admin.ModelAdmin):
+    list_display = ['keyword', 'category', 'user', 'created_at']
+    list_filter = ['category']
+    list_select_related = ['category', 'user']
+    search_fields = ['keyword']
+    raw_id_fields = ['user']
 
 @admin.register(Receipt)
 class ReceiptAdmin(admin.ModelAdmin):
-    list_display = ['transaction', 'file', 'uploaded_at']
+    list_display = ['transaction', 'original_name', 'blob', 'uploaded_at']
+    list_select_related = ['transaction__category', 'blob']
+    raw_id_fields = ['transaction', 'blob']
     readonly_fields = ['uploaded_at']
+
+@admin.register(ReceiptBlob)
+class ReceiptBlobAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'file', 'size', 'status', 'ref_count', 'created_at']
+    list_filter = ['status']
+    search_fields = ['sha256']
+    readonly_fields = ['sha256', 'file', 'thumbnail', 'preview', 'size', 'ref_count', 'created_at']
@@ -4,3 +4,6 @@ class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.transactions'
     verbose_name = '거래 관리'
+
+    def ready(self):
+        from . import merchants, refdata, search, signals  # noqa: F401 (데이터 버전, 가맹점 자동완성 캐시, 카테고리 참조 데이터, 검색 인덱스)
@@ -0,0 +1,112 @@
+"""
+가맹점명으로 카테고리 자동 분류.
+
+우선순위
+1. 사용자 규칙 (CategoryRule, 가맹점명에 키워드가 들어 있으면, 여러 개면 가장 긴 키워드)
+2. 사용자의 이전 거래 (같은 가맹점에 가장 많이 쓴 카테고리, 가맹점 자동완성 목록을 그대로 씀)
+3. 공통 규칙 (user가 없는 CategoryRule)
+규칙은 Aho-Corasick 오토마톤으로 묶어 두므로 규칙 수와 상관없이 가맹점명을 한 번만 훑고,
+같은 가맹점은 결과를 기억해 두어 가져오기처럼 같은 가맹점이 반복되는 경우 다시 계산하지 않습니다.
+"""
+import unicodedata
+from django.db import transaction
+from django.db.models import Q
+from core.ahocorasick import Automaton
+from core.utils import normalize_search_text
+from .merchants import get_merchant_index
+from .models import CategoryRule, Transaction
+from .refdata import categories
+from .signals import transactions_bulk_updated
+
+# 분류되지 않은 거래가 들어가는 카테고리
+FALLBACK_CATEGORY = '기타'
+BATCH_SIZE = 2000
+
+
+class Categorizer:
+    """
+    한 사용자의 분류기 (가져오기/일괄 수정 한 번에 하나를 만들어 씀).
+    ignore_category_id: 이전 거래에서 세지 않을 카테고리 (미분류로 들어간 '기타' 등)
+    """
+
+    def __init__(self, user_id, ignore_category_id=None):
+        rules = CategoryRule.objects.filter(Q(user_id=user_id) | Q(user__isnull=True)).values_list(
+            'user_id', 'keyword', 'category_id'
+        )
+        user_rules, global_rules = [], []
+        for rule_user_id, keyword, category_id in rules:
+            target = user_rules if rule_user_id is not None else global_rules
+            target.append((normalize_search_text(keyword), category_id))
+        self.user_rules = Automaton(user_rules)
+        self.global_rules = Automaton(global_rules)
+
+        # 자동완성 목록의 키는 자모로 분해된 형태이므로 정규화된 가맹점명(NFC)으로 되돌려 씀
+        self.history = {}
+        for key, _, _, categories in get_merchant_index(user_id):
+            counts = {pk: count for pk, count in categories.items() if pk != ignore_category_id}
+            if counts:
+                self.history[unicodedata.normalize('NFC', key)] = max(counts, key=counts.get)
+        self._results = {}
+
+    def categorize(self, merchant):
+        """가맹점명에 맞는 카테고리 id (없으면 None)"""
+        if merchant not in self._results:
+            self._results[merchant] = self._categorize(merchant)
+        return self._results[merchant]
+
+    def _categorize(self, merchant):
+        text = normalize_search_text(merchant)
+        if not text:
+            return None
+        category_id = self.user_rules.longest_match(text)
+        if category_id is None:
+            category_id = self.history.get(text)
+        if category_id is None:
+            category_id = self.global_rules.longest_match(text)
+        return category_id
+
+    def apply(self, transactions):
+        """거래 목록의 카테고리를 다시 지정하고, 바뀐 거래 목록을 반환"""
+        changed = []
+        for tx in transactions:
+            category_id = self.categorize(tx.merchant)
+            if category_id is not None and category_id != tx.category_id:
+                tx.category_id = category_id
+                changed.append(tx)
+        return changed
+
+
+def fallback_category_id():
+    return next((category.pk for category in categories.all() if category.name == FALLBACK_CATEGORY), None)
+
+
+def recategorize(queryset, batch_size=BATCH_SIZE):
+    """
+    거래들에 자동 분류를 다시 적용 (관리자 일괄 수정용). 사용자별로 분류기를 만들어
+    batch_size건씩 bulk_update하고, 바뀐 건수를 반환합니다.
+    규칙이 없는 가맹점의 거래는 그대로 둡니다.
+    """
+    ignore_category_id = fallback_category_id()
+    changed_count = 0
+    changed_users = set()
+    user_ids = queryset.order_by().values_list('user_id', flat=True).distinct()
+    # 수정과 파생 데이터 갱신(시그널)을 한 트랜잭션으로
+    with transaction.atomic():
+        for user_id in list(user_ids):
+            categorizer = Categorizer(user_id, ignore_category_id=ignore_category_id)
+            rows = queryset.filter(user_id=user_id).only('id', 'user_id', 'merchant', 'category_id')
+            changed = []
+            for tx in rows.iterator(chunk_size=batch_size):
+                changed.extend(categorizer.apply([tx]))
+                if len(changed) >= batch_size:
+                    Transaction.objects.bulk_update(changed, ['category'])
+                    changed_count += len(changed)
+                    changed_users.add(user_id)
+                    changed = []
+            if changed:
+                Transaction.objects.bulk_update(changed, ['category'])
+                changed_count += len(changed)
+                changed_users.add(user_id)
+        if changed_users:
+            transactions_bulk_updated.send(sender=Transaction, user_ids=changed_users)
+    return changed_count
@@ -0,0 +1,167 @@
+"""
+거래 내역 내보내기 (CSV/XLSX).
+
+values_list().iterator(chunk_size=...)로 행을 조금씩 읽으면서 바로 응답으로 흘려보내므로
+행 수와 관계없이 메모리 사용량이 일정하고, 첫 바이트가 즉시 전송됩니다.
+"""
+import csv
+import re
+import zipfile
+from xml.sax.saxutils import escape
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = [
+    ('occurred_at', '거래일시'),
+    ('transaction_type', '구분'),
+    ('trip__name', '여행'),
+    ('category__name', '카테고리'),
+    ('amount', '금액'),
+    ('merchant', '가맹점'),
+    ('memo', '메모'),
+    ('account__name', '계좌'),
+]
+
+TYPE_LABELS = {'income': '입금', 'expense': '출금'}
+
+
+def export_rows(queryset):
+    """내보낼 행을 (거래일시, 구분, ...) 튜플로 하나씩 반환"""
+    rows = queryset.order_by('-occurred_at', '-id').values_list(
+        *[field for field, _ in EXPORT_COLUMNS]
+    )
+    for occurred_at, tx_type, trip, category, amount, merchant, memo, account in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield (
+            timezone.localtime(occurred_at).strftime('%Y-%m-%d %H:%M'),
+            TYPE_LABELS.get(tx_type, tx_type),
+            trip or '',
+            category,
+            amount,
+            merchant,
+            memo,
+            account,
+        )
+
+
+class _Echo:
+    """csv.writer가 쓴 한 줄을 그대로 돌려주는 버퍼"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(queryset):
+    writer = csv.writer(_Echo())
+    yield '\ufeff'  # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM
+    yield writer.writerow([label for _, label in EXPORT_COLUMNS])
+    for row in export_rows(queryset):
+        yield writer.writerow(row)
+
+
+class _ZipSink:
+    """
+    zipfile이 쓰는 바이트를 모아 두었다가 꺼내 가는 비탐색(non-seekable) 출력.
+    tell()/seek()가 없으면 zipfile은 data descriptor를 사용해 순차적으로 씁니다.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="거래내역" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+# XML 1.0에서 허용되지 않는 제어 문자
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)) or hasattr(value, 'as_integer_ratio'):
+            cells.append(f'<c><v>{value}</v></c>')
+        else:
+            text = escape(_INVALID_XML_CHARS.sub('', str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row>{"".join(cells)}</row>'
+
+
+def stream_xlsx(queryset):
+    """
+    openpyxl 없이 최소한의 SpreadsheetML을 zip 스트림으로 바로 씁니다.
+    시트 XML은 CHUNK_SIZE 행마다 압축된 바이트를 내보냅니다.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield sink.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + _xlsx_row([label for _, label in EXPORT_COLUMNS])
+            ).encode())
+            buffer = []
+            for row in export_rows(queryset):
+                buffer.append(_xlsx_row(row))
+                if len(buffer) >= CHUNK_SIZE:
+                    sheet.write(''.join(buffer).encode())
+                    buffer = []
+                    yield sink.drain()
+            sheet.write((''.join(buffer) + '</sheetData></worksheet>').encode())
+    yield sink.drain()
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', stream_csv),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', stream_xlsx),
+}
@@ -1,11 +1,19 @@
+import os
 from django import forms
-from django.db.models import Case, When, Value, IntegerField
 from .models import Transaction, Receipt, Category
 from apps.trips.models import Trip #추가함
+from core.refdata import ReferenceChoiceField
+from core.validators import validate_file_extension, validate_file_size
+from . import refdata
+from .categorize import Categorizer, fallback_category_id
 
 class TransactionForm(forms.ModelForm):
     """거래 생성/수정 폼"""
-    receipt = forms.FileField(required=False, label='영수증')
+    receipt = forms.FileField(
+        required=False,
+        label='영수증',
+        validators=[validate_file_extension, validate_file_size]
+    )
     
     class Meta:
         model = Transaction
@@ -24,6 +32,9 @@ class TransactionForm(forms.ModelForm):
             'merchant': forms.TextInput(attrs={'class': 'form-control', 'placeholder': '가맹점명'}),
             'memo': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
+        field_classes = {
+            'category': ReferenceChoiceField,
+        }
         labels = {
             'account': '계좌',
             'trip': '여행',
@@ -37,30 +48,53 @@ class TransactionForm(forms.ModelForm):
     
     def __init__(self, *args, user=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.user = user
         if user:
             self.fields['account'].queryset = user.accounts.filter(is_active=True)
             self.fields['trip'].queryset = user.trips.all()
         self.fields['trip'].required = False
+        # 카테고리를 비워 두면 가맹점명으로 자동 분류
+        self.fields['category'].required = False
+        self.fields['category'].empty_label = '자동 분류 (가맹점 기준)'
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('category') and 'category' not in self.errors:
+            category = self.auto_category(cleaned_data.get('merchant', ''))
+            if category is None:
+                self.add_error('category', '카테고리를 선택하세요.')
+            else:
+                cleaned_data['category'] = category
+        return cleaned_data
+    
+    def auto_category(self, merchant):
+        """가맹점명으로 분류한 카테고리, 분류되지 않으면 '기타'"""
+        fallback_id = fallback_category_id()
+        category_id = None
+        if self.user is not None:
+            category_id = Categorizer(self.user.pk, ignore_category_id=fallback_id).categorize(merchant)
+        if category_id is None:
+            category_id = fallback_id
+        return refdata.categories.get(category_id) if category_id is not None else None
         
-        # 카테고리 순서: 이름순 정렬, 단 '기타'는 맨 마지막
-        self.fields['category'].queryset = Category.objects.annotate(
-            custom_order=Case(
-                When(name='기타', then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField()
-            )
-        ).order_by('custom_order', 'name')
 
 class TransactionFilterForm(forms.Form):
     """거래 필터 폼"""
+    q = forms.CharField(
+        required=False,
+        max_length=100,
+        label='검색',
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': '가맹점/메모'})
+    )
     trip = forms.ModelChoiceField(    # 추가함
         queryset=Trip.objects.none(), # 추가함
         required=False,                # 추가함
         empty_label='전체 여행',          # 추가함
         widget=forms.Select(attrs={'class': 'form-control'}) # 추가함
     ) # 추가함
-    category = forms.ModelChoiceField(
-        queryset=None,
+    # 카테고리 선택지는 참조 데이터 레지스트리에서 ('기타'는 맨 마지막)
+    category = ReferenceChoiceField(
+        queryset=Category.objects.all(),
         required=False,
         empty_label='전체 카테고리',
         widget=forms.Select(attrs={'class': 'form-control'})
@@ -78,6 +112,12 @@ class TransactionFilterForm(forms.Form):
         required=False,
         widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
     )
+    sort = forms.ChoiceField(
+        choices=[('', '최신순'), ('relevance', '관련도순')],
+        required=False,
+        label='정렬',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
     def __init__(self, *args, user=None, **kwargs):
         super().__init__(*args, **kwargs)
         # 중요: 현재 로그인한 유저의 여행만 선택지에 노출
@@ -85,11 +125,6 @@ class TransactionFilterForm(forms.Form):
             self.fields['trip'].queryset = Trip.objects.filter(user=user)
         else:
             self.fields['trip'].queryset = Trip.objects.all()
-        
-        # 카테고리 정렬 로직 (기존 유지)
-        self.fields['category'].queryset = Category.objects.annotate(
-            custom_order=Case(When(name='기타', then=Value(1)), default=Value(0), output_field=IntegerField())
-        ).order_by('custom_order', 'name')
 
     # def __init__(self, *args, **kwargs):
     #     super().__init__(*args, **kwargs)
@@ -101,3 +136,36 @@ class TransactionFilterForm(forms.Form):
     #             output_field=IntegerField()
     #         )
     #     ).order_by('custom_order', 'name')
+
+
+class TransactionImportForm(forms.Form):
+    """거래내역 파일(CSV/OFX) 가져오기 폼"""
+    file = forms.FileField(
+        label='거래내역 파일',
+        help_text='CSV(거래일시, 금액, 거래유형, 가맹점, 메모, 카테고리 열) 또는 OFX/QFX 파일',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.ofx,.qfx'})
+    )
+    account = forms.ModelChoiceField(
+        queryset=None,
+        label='기본 계좌',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    trip = forms.ModelChoiceField(
+        queryset=None,
+        required=False,
+        label='여행',
+        empty_label='여행 없음',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['account'].queryset = user.accounts.filter(is_active=True)
+        self.fields['trip'].queryset = user.trips.all()
+
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        ext = os.path.splitext(file.name)[1].lower()
+        if ext not in ('.csv', '.ofx', '.qfx'):
+            raise forms.ValidationError('CSV 또는 OFX/QFX 파일만 가져올 수 있습니다.')
+        return file
@@ -0,0 +1,272 @@
+"""
+은행 거래내역(CSV/OFX) 일괄 가져오기.
+
+파일 전체를 메모리에 올리지 않고 한 줄씩 읽으면서 Transaction 객체로 변환하고,
+batch_size 단위로 bulk_create 합니다. 잘못된 행은 건너뛰고 행 번호와 함께 보고합니다.
+"""
+import csv
+import io
+import os
+import re
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from django.utils import timezone
+from .categorize import FALLBACK_CATEGORY, Categorizer
+from .models import Category, Transaction
+from .signals import transactions_bulk_created
+
+BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 200
+
+# CSV 헤더 별칭 -> Transaction 필드
+CSV_COLUMNS = {
+    'occurred_at': ('occurred_at', 'date', 'datetime', '거래일시', '거래일', '일자', '날짜'),
+    'amount': ('amount', '금액', '거래금액'),
+    'transaction_type': ('transaction_type', 'type', '거래유형', '구분'),
+    'merchant': ('merchant', 'payee', 'description', '가맹점', '가맹점명', '적요'),
+    'memo': ('memo', 'note', '메모'),
+    'category': ('category', '카테고리'),
+    'account': ('account', '계좌'),
+    'trip': ('trip', '여행'),
+}
+
+TYPE_ALIASES = {
+    'income': 'income', '입금': 'income', 'credit': 'income', 'deposit': 'income', 'dep': 'income',
+    'expense': 'expense', '출금': 'expense', 'debit': 'expense', 'withdrawal': 'expense',
+    'payment': 'expense', 'pos': 'expense', 'atm': 'expense', 'fee': 'expense', 'check': 'expense',
+}
+
+
+class RowError(Exception):
+    """행 단위 변환 오류"""
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.error_count = 0
+        self.errors = []  # [(행 번호, 메시지)] - 최대 MAX_REPORTED_ERRORS개
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def detect_format(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in ('.ofx', '.qfx'):
+        return 'ofx'
+    return 'csv'
+
+
+def open_text(fileobj):
+    """바이너리 파일 객체를 스트리밍 텍스트로 감쌉니다 (BOM 제거)"""
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return io.TextIOWrapper(fileobj, encoding='utf-8-sig', errors='replace', newline='')
+
+
+def parse_csv(fileobj):
+    """CSV 행을 (행 번호, {필드: 값}) 형태로 하나씩 반환"""
+    reader = csv.reader(open_text(fileobj))
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = {}
+    for index, name in enumerate(header):
+        name = name.strip().lower()
+        for field, aliases in CSV_COLUMNS.items():
+            if name in aliases and field not in columns:
+                columns[field] = index
+    missing = {'occurred_at', 'amount'} - columns.keys()
+    if missing:
+        raise RowError(f"필수 열이 없습니다: {', '.join(sorted(missing))}")
+
+    for line, values in enumerate(reader, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield line, {
+            field: values[index].strip() if index < len(values) else ''
+            for field, index in columns.items()
+        }
+
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+
+def parse_ofx(fileobj):
+    """
+    OFX(SGML/XML) 파일에서 <STMTTRN> 블록을 하나씩 반환.
+    닫는 태그가 없는 SGML 형식(OFX 1.x)도 처리합니다.
+    """
+    current = None
+    start_line = 0
+    for line_no, text in enumerate(open_text(fileobj), start=1):
+        for closing, tag, value in OFX_TAG.findall(text):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing and current is not None:
+                    yield start_line, _ofx_row(current)
+                    current = None
+                elif not closing:
+                    current = {}
+                    start_line = line_no
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+def _ofx_row(fields):
+    amount = fields.get('TRNAMT', '')
+    trn_type = fields.get('TRNTYPE', '').lower()
+    return {
+        'occurred_at': fields.get('DTPOSTED', ''),
+        'amount': amount,
+        'transaction_type': TYPE_ALIASES.get(trn_type, ''),
+        'merchant': fields.get('NAME') or fields.get('PAYEE', ''),
+        'memo': fields.get('MEMO', ''),
+    }
+
+
+OFX_DATETIME = re.compile(r'(\d{8}(?:\d{4}|\d{6})?)(?:\.\d+)?(?:\[([^:\]]*)(?::[^\]]*)?\])?')
+
+
+def parse_datetime_value(value):
+    value = value.strip()
+    match = OFX_DATETIME.fullmatch(value)
+    if match:
+        # OFX: YYYYMMDD[HHMM[SS]][.XXX][gmt offset[:tz name]]
+        digits, offset = match.group(1), match.group(2)
+        fmt = {8: '%Y%m%d', 12: '%Y%m%d%H%M', 14: '%Y%m%d%H%M%S'}[len(digits)]
+        try:
+            parsed = datetime.strptime(digits, fmt)
+        except ValueError:
+            raise RowError(f'날짜 형식을 알 수 없습니다: {value}')
+        if offset:
+            try:
+                hours = Decimal(offset)
+                if not hours.is_finite() or abs(hours) > 14:
+                    raise InvalidOperation(offset)
+            except InvalidOperation:
+                raise RowError(f'시간대 형식을 알 수 없습니다: {value}')
+            parsed = parsed.replace(tzinfo=dt_timezone(timedelta(minutes=int(hours * 60))))
+    else:
+        try:
+            parsed = datetime.fromisoformat(re.sub(r'^(\d{4})[./](\d{1,2})[./](\d{1,2})', _iso_date, value))
+        except ValueError:
+            raise RowError(f'날짜 형식을 알 수 없습니다: {value}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _iso_date(match):
+    year, month, day = match.groups()
+    return f'{year}-{int(month):02d}-{int(day):02d}'
+
+
+def parse_amount_value(value):
+    cleaned = value.replace(',', '').replace('원', '').replace(' ', '')
+    try:
+        amount = Decimal(cleaned)
+        if not amount.is_finite():
+            raise InvalidOperation(value)
+        amount = amount.quantize(Decimal('1'))
+    except InvalidOperation:
+        raise RowError(f'금액 형식이 잘못되었습니다: {value}')
+    if abs(amount) >= 10 ** 15:  # amount 필드 max_digits=15
+        raise RowError(f'금액이 너무 큽니다: {value}')
+    return amount
+
+
+class TransactionImporter:
+    """
+    한 사용자의 거래를 일괄 등록합니다.
+    account/trip/category는 파일의 열 값(이름)으로 찾고, 없으면 기본값을 사용합니다.
+    카테고리는 기본값을 지정하지 않았으면 가맹점명으로 자동 분류하고, 분류되지 않으면 '기타'로 둡니다.
+    """
+
+    def __init__(self, user, account=None, trip=None, category=None, batch_size=BATCH_SIZE):
+        self.user = user
+        self.default_account = account
+        self.default_trip = trip
+        self.default_category = category
+        self.batch_size = batch_size
+        # 참조 테이블은 작으므로 한 번만 읽어서 이름으로 찾음
+        self.accounts = {a.name: a for a in user.accounts.filter(is_active=True)}
+        self.trips = {t.name: t for t in user.trips.all()}
+        self.categories = {c.name: c for c in Category.objects.all()}
+        self.categorizer = None
+        if self.default_category is None:
+            self.default_category = self.categories.get(FALLBACK_CATEGORY)
+            self.categorizer = Categorizer(
+                user.pk, ignore_category_id=self.default_category.pk if self.default_category else None
+            )
+
+    def run(self, fileobj, file_format='csv'):
+        result = ImportResult()
+        parser = parse_ofx if file_format == 'ofx' else parse_csv
+        batch = []
+        try:
+            for line, row in parser(fileobj):
+                try:
+                    batch.append(self.build(row))
+                except RowError as exc:
+                    result.add_error(line, str(exc))
+                    continue
+                if len(batch) >= self.batch_size:
+                    result.created += self.save(batch)
+                    batch = []
+        except RowError as exc:
+            result.add_error(1, str(exc))
+        if batch:
+            result.created += self.save(batch)
+        return result
+
+    def build(self, row):
+        amount = parse_amount_value(row['amount'])
+        transaction_type = TYPE_ALIASES.get(row.get('transaction_type', '').strip().lower())
+        if transaction_type is None:
+            if row.get('transaction_type'):
+                raise RowError(f"거래유형을 알 수 없습니다: {row['transaction_type']}")
+            # 유형 열이 없으면 부호로 판단 (음수 = 출금)
+            transaction_type = 'expense' if amount < 0 else 'income'
+        amount = abs(amount)
+
+        trip = self.resolve(self.trips, row.get('trip'), self.default_trip, '여행', required=False)
+        merchant = row.get('merchant', '')[:200]
+        category_id = None
+        if not row.get('category') and self.categorizer is not None:
+            category_id = self.categorizer.categorize(merchant)
+        if category_id is None:
+            category_id = self.resolve(self.categories, row.get('category'), self.default_category, '카테고리').pk
+        # 인스턴스 대신 *_id로 지정하면 행마다 관계 디스크립터를 거치지 않아 더 빠름
+        return Transaction(
+            user_id=self.user.pk,
+            account_id=self.resolve(self.accounts, row.get('account'), self.default_account, '계좌').pk,
+            trip_id=trip.pk if trip else None,
+            category_id=category_id,
+            transaction_type=transaction_type,
+            amount=amount,
+            occurred_at=parse_datetime_value(row['occurred_at']),
+            merchant=merchant,
+            memo=row.get('memo', ''),
+        )
+
+    def resolve(self, lookup, name, default, label, required=True):
+        if name:
+            try:
+                return lookup[name]
+            except KeyError:
+                raise RowError(f'{label}을(를) 찾을 수 없습니다: {name}')
+        if default is None and required:
+            raise RowError(f'{label}이(가) 지정되지 않았습니다.')
+        return default
+
+    def save(self, batch):
+        with transaction.atomic():
+            created = Transaction.objects.bulk_create(batch)
+            transactions_bulk_created.send(sender=Transaction, transactions=created)
+        return len(created)
@@ -0,0 +1,17 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from apps.transactions.receipts import collect_garbage
+
+
+class Command(BaseCommand):
+    help = '영수증 파일 참조 수를 다시 맞추고, 더 이상 쓰이지 않는 파일을 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes', type=int, default=60,
+            help='이 시간보다 최근에 저장된 파일은 업로드 중일 수 있으므로 삭제하지 않음'
+        )
+
+    def handle(self, *args, **options):
+        repaired, deleted = collect_garbage(grace=timedelta(minutes=options['grace_minutes']))
+        self.stdout.write(f'참조 수 보정 {repaired}건, 미사용 파일 삭제 {deleted}건')
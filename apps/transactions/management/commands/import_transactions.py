@@ -0,0 +1,45 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from apps.transactions.importers import BATCH_SIZE, TransactionImporter, detect_format
+
+
+class Command(BaseCommand):
+    help = '은행 거래내역 파일(CSV/OFX)을 사용자 거래로 일괄 등록합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV 또는 OFX/QFX 파일 경로')
+        parser.add_argument('--user', required=True, help='거래를 등록할 사용자(username)')
+        parser.add_argument('--account', help='계좌 열이 없을 때 사용할 계좌 이름')
+        parser.add_argument('--trip', help='여행 열이 없을 때 연결할 여행 이름')
+        parser.add_argument('--format', choices=['csv', 'ofx'], help='파일 형식 (기본: 확장자로 판단)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"사용자를 찾을 수 없습니다: {options['user']}")
+
+        account = trip = None
+        if options['account']:
+            account = user.accounts.filter(name=options['account']).first()
+            if account is None:
+                raise CommandError(f"계좌를 찾을 수 없습니다: {options['account']}")
+        if options['trip']:
+            trip = user.trips.filter(name=options['trip']).first()
+            if trip is None:
+                raise CommandError(f"여행을 찾을 수 없습니다: {options['trip']}")
+
+        importer = TransactionImporter(user, account=account, trip=trip, batch_size=options['batch_size'])
+        file_format = options['format'] or detect_format(options['path'])
+        started = time.monotonic()
+        with open(options['path'], 'rb') as fileobj:
+            result = importer.run(fileobj, file_format)
+        elapsed = time.monotonic() - started
+
+        for line, message in result.errors:
+            self.stderr.write(f'{line}행: {message}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.created}건 등록, {result.error_count}건 오류 ({elapsed:.1f}초)'
+        ))
@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.transactions.receipts import process_pending
+
+
+class Command(BaseCommand):
+    help = '처리 대기 중인 영수증 이미지를 축소하고 썸네일/미리보기를 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='한 번에 처리할 최대 건수')
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 주기적으로 계속 처리')
+        parser.add_argument('--interval', type=int, default=30, help='--loop 사용 시 확인 간격(초)')
+
+    def handle(self, *args, **options):
+        while True:
+            counts = process_pending(limit=options['limit'])
+            if counts or not options['loop']:
+                summary = ', '.join(f'{status} {count}건' for status, count in sorted(counts.items()))
+                self.stdout.write(f"영수증 처리 완료: {summary or '대기 중인 영수증 없음'}")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
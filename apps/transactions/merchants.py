@@ -0,0 +1,201 @@
+"""
+가맹점 자동완성.
+
+사용자별로 지금까지 입력한 가맹점을 한 번 집계해
+[(검색 키, 가맹점명, 사용 횟수, {카테고리 id: 횟수}), ...] (검색 키 순 정렬) 목록으로 캐시에 두고,
+입력할 때마다 이분 탐색으로 접두어 범위를 찾아 많이 쓴 순으로 돌려줍니다. (거래 테이블을 조회하지 않음)
+
+- 검색 키는 정규화 후 자모로 분해한 문자열이라 입력 중인 글자('스ㅌ')로도 '스타벅스'가 찾아집니다.
+- 목록은 사용자의 가맹점 목록 버전(DB의 DataVersion.merchant_version)을 넣은 키에 둡니다.
+  거래가 바뀌면 같은 트랜잭션에서 버전을 올리므로, 캐시가 프로세스마다 따로 있어도(LocMemCache)
+  다른 워커는 다음 조회 때 새 버전의 키를 찾지 못해 다시 집계합니다.
+- 새 거래(일반 등록/일괄 등록)는 커밋 후 이 프로세스에 캐시된 직전 버전(n-1)의 목록에 더해 새 버전(n)으로 저장합니다.
+  버전은 DB에서 한 번에 하나씩만 오르므로 n-1 -> n 목록은 하나뿐이고, 잠금 없이도 갱신이 사라지지 않습니다.
+  수정/삭제/일괄 수정/픽스처 로드는 이전 값을 알 수 없으므로 버전만 올려 다음 조회 때 다시 집계합니다.
+- 사용자당 많이 쓴 가맹점 MAX_MERCHANTS곳까지만 둡니다. 가득 찬 뒤 새 가맹점이 나오면 다시 집계합니다.
+"""
+import bisect
+import time
+import unicodedata
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core import metrics
+from core.fixtures import fixture_loaded
+from core.models import DataVersion
+from core.utils import normalize_search_text
+from .models import Transaction
+from .signals import transactions_bulk_created, transactions_bulk_updated
+
+MERCHANT_INDEX_KEY = 'transactions:merchants:{user_id}:{version}'
+MERCHANT_INDEX_TIMEOUT = 60 * 60 * 24
+MAX_MERCHANTS = 5000
+
+
+def merchant_key(value):
+    return unicodedata.normalize('NFKD', normalize_search_text(value))
+
+
+def build_merchant_index(user_id):
+    """사용자의 가맹점 목록을 거래 테이블에서 집계"""
+    rows = (
+        Transaction.objects.filter(user_id=user_id).exclude(merchant='')
+        .values_list('merchant', 'category_id').annotate(count=Count('id')).order_by()
+    )
+    merchants = {}
+    for merchant, category_id, count in rows:
+        key = merchant_key(merchant)
+        if not key:
+            continue
+        entry = merchants.setdefault(key, {'names': {}, 'count': 0, 'categories': {}})
+        entry['names'][merchant] = entry['names'].get(merchant, 0) + count
+        entry['count'] += count
+        entry['categories'][category_id] = entry['categories'].get(category_id, 0) + count
+
+    # 표기가 여러 가지면(대소문자 등) 가장 많이 쓴 표기로
+    frequent = sorted(merchants.items(), key=lambda item: -item[1]['count'])[:MAX_MERCHANTS]
+    return sorted(
+        [key, max(entry['names'], key=entry['names'].get), entry['count'], entry['categories']]
+        for key, entry in frequent
+    )
+
+
+def get_merchant_version(user_id):
+    """가맹점 목록 버전 (거래를 바꾼 적이 없으면 0)"""
+    return DataVersion.objects.filter(user_id=user_id).values_list('merchant_version', flat=True).first() or 0
+
+
+def bump_merchant_version(user_id):
+    """가맹점 목록 버전을 1 올리고 새 버전을 반환 (호출한 쪽의 트랜잭션 안에서, 없으면 바로 커밋)"""
+    versions = DataVersion.objects.filter(user_id=user_id)
+    with transaction.atomic():
+        if not versions.update(merchant_version=F('merchant_version') + 1):
+            try:
+                with transaction.atomic():
+                    # DB를 다시 만들어도 캐시에 남은 이전 버전의 목록과 겹치지 않도록 현재 시각으로 시작
+                    now = time.time_ns()
+                    DataVersion.objects.create(user_id=user_id, version=now, merchant_version=now)
+            except IntegrityError:
+                # 동시에 처음 올린 경우
+                versions.update(merchant_version=F('merchant_version') + 1)
+        # 갱신한 행은 이 트랜잭션이 끝날 때까지 잠겨 있으므로 읽은 값이 이 트랜잭션이 올린 버전
+        return versions.values_list('merchant_version', flat=True).get()
+
+
+def merchant_index_key(user_id, version=None):
+    if version is None:
+        version = get_merchant_version(user_id)
+    return MERCHANT_INDEX_KEY.format(user_id=user_id, version=version)
+
+
+def get_merchant_index(user_id):
+    key = merchant_index_key(user_id)
+    index = cache.get(key)
+    metrics.record_cache('transactions:merchants', index is not None)
+    if index is None:
+        index = build_merchant_index(user_id)
+        cache.set(key, index, MERCHANT_INDEX_TIMEOUT)
+    return index
+
+
+def suggest_merchants(user_id, prefix, limit=10):
+    """
+    접두어로 시작하는 가맹점을 많이 쓴 순으로.
+    반환: [{'merchant': 가맹점명, 'count': 사용 횟수, 'category_id': 가장 많이 쓴 카테고리 id}, ...]
+    """
+    prefix = merchant_key(prefix)
+    if not prefix:
+        return []
+    index = get_merchant_index(user_id)
+    start = bisect.bisect_left(index, [prefix])
+    end = bisect.bisect_left(index, [prefix + '\U0010ffff'], lo=start)
+    matches = sorted(index[start:end], key=lambda entry: (-entry[2], entry[0]))[:limit]
+    return [
+        {
+            'merchant': name,
+            'count': count,
+            'category_id': max(categories, key=categories.get),
+        }
+        for _, name, count, categories in matches
+    ]
+
+
+def add_to_merchant_index(index, transactions):
+    """
+    캐시된 목록에 새 거래들을 더함 (자리는 이분 탐색으로 찾음).
+    목록이 가득 차 새 가맹점을 넣을 수 없으면 False (다시 집계해야 함)
+    """
+    for tx in transactions:
+        key = merchant_key(tx.merchant)
+        if not key:
+            continue
+        position = bisect.bisect_left(index, [key])
+        if position < len(index) and index[position][0] == key:
+            entry = index[position]
+            entry[2] += 1
+            entry[3][tx.category_id] = entry[3].get(tx.category_id, 0) + 1
+        elif len(index) < MAX_MERCHANTS:
+            index.insert(position, [key, tx.merchant, 1, {tx.category_id: 1}])
+        else:
+            return False
+    return True
+
+
+def update_merchant_indexes(transactions):
+    """
+    새 거래들의 버전을 올리고, 커밋 후 직전 버전의 목록이 캐시에 있으면 거래를 더해 새 버전으로 저장
+    (없거나 가득 찼으면 다음 조회 때 집계)
+    """
+    by_user = {}
+    for tx in transactions:
+        if tx.merchant:
+            by_user.setdefault(tx.user_id, []).append(tx)
+    for user_id, user_transactions in by_user.items():
+        version = bump_merchant_version(user_id)
+        # 롤백되면 반영하지 않도록 커밋 후에 더함
+        transaction.on_commit(
+            lambda user_id=user_id, version=version, user_transactions=user_transactions:
+            _add_to_cached_index(user_id, version, user_transactions)
+        )
+
+
+def _add_to_cached_index(user_id, version, transactions):
+    index = cache.get(merchant_index_key(user_id, version - 1))
+    if index is not None and add_to_merchant_index(index, transactions):
+        cache.set(merchant_index_key(user_id, version), index, MERCHANT_INDEX_TIMEOUT)
+
+
+def invalidate_merchant_index(user_id):
+    bump_merchant_version(user_id)
+
+
+@receiver(post_save, sender=Transaction)
+def update_merchants_on_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_merchant_indexes([instance])
+    else:
+        invalidate_merchant_index(instance.user_id)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_merchants_on_delete(sender, instance, **kwargs):
+    invalidate_merchant_index(instance.user_id)
+
+
+@receiver(transactions_bulk_created)
+def update_merchants_on_bulk_create(sender, transactions, **kwargs):
+    update_merchant_indexes(transactions)
+
+
+@receiver(transactions_bulk_updated)
+def invalidate_merchants_on_bulk_update(sender, user_ids, **kwargs):
+    for user_id in user_ids:
+        invalidate_merchant_index(user_id)
+
+
+@receiver(fixture_loaded, sender=Transaction)
+def invalidate_merchants_on_fixture_load(sender, instances, **kwargs):
+    for user_id in {tx.user_id for tx in instances}:
+        invalidate_merchant_index(user_id)
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-18 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0002_alter_transaction_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='receipt',
+            name='preview',
+            field=models.FileField(blank=True, upload_to='receipts/previews/%Y/%m/%d/', verbose_name='미리보기'),
+        ),
+        migrations.AddField(
+            model_name='receipt',
+            name='status',
+            field=models.CharField(choices=[('pending', '처리 대기'), ('done', '처리 완료'), ('skipped', '처리 안 함'), ('failed', '처리 실패')], default='pending', max_length=10, verbose_name='이미지 처리 상태'),
+        ),
+        migrations.AddField(
+            model_name='receipt',
+            name='thumbnail',
+            field=models.FileField(blank=True, upload_to='receipts/thumbnails/%Y/%m/%d/', verbose_name='썸네일'),
+        ),
+    ]
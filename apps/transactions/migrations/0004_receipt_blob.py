@@ -0,0 +1,42 @@
+# Generated by Django 5.0 on 2026-10-18 17:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_receipt_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='내용 해시')),
+                ('file', models.FileField(upload_to='receipts/blobs/', verbose_name='영수증 파일')),
+                ('thumbnail', models.FileField(blank=True, upload_to='receipts/blobs/', verbose_name='썸네일')),
+                ('preview', models.FileField(blank=True, upload_to='receipts/blobs/', verbose_name='미리보기')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='파일 크기')),
+                ('status', models.CharField(choices=[('pending', '처리 대기'), ('done', '처리 완료'), ('skipped', '처리 안 함'), ('failed', '처리 실패')], default='pending', max_length=10, verbose_name='이미지 처리 상태')),
+                ('ref_count', models.IntegerField(default=0, verbose_name='참조 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+            ],
+            options={
+                'verbose_name': '영수증 파일',
+                'verbose_name_plural': '영수증 파일 목록',
+            },
+        ),
+        migrations.AddField(
+            model_name='receipt',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255, verbose_name='원본 파일명'),
+        ),
+        migrations.AddField(
+            model_name='receipt',
+            name='blob',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='receipts', to='transactions.receiptblob', verbose_name='파일'),
+        ),
+    ]
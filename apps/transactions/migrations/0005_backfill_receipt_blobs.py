@@ -0,0 +1,47 @@
+import hashlib
+from django.db import migrations
+
+
+def backfill_blobs(apps, schema_editor):
+    """기존 영수증 파일을 해시해서 ReceiptBlob으로 옮김 (파일 위치는 그대로 유지)"""
+    Receipt = apps.get_model('transactions', 'Receipt')
+    ReceiptBlob = apps.get_model('transactions', 'ReceiptBlob')
+
+    for receipt in Receipt.objects.filter(blob__isnull=True).iterator():
+        digest = hashlib.sha256()
+        try:
+            with receipt.file.open('rb') as fileobj:
+                for chunk in fileobj.chunks():
+                    digest.update(chunk)
+            size = receipt.file.size
+        except OSError:
+            # 파일이 없어진 영수증은 경로로 구분해서 따로 보존
+            digest.update(f'missing:{receipt.file.name}'.encode())
+            size = 0
+
+        blob, created = ReceiptBlob.objects.get_or_create(
+            sha256=digest.hexdigest(),
+            defaults={
+                'file': receipt.file.name,
+                'thumbnail': receipt.thumbnail.name,
+                'preview': receipt.preview.name,
+                'size': size,
+                'status': receipt.status,
+            },
+        )
+        blob.ref_count += 1
+        blob.save(update_fields=['ref_count'])
+        receipt.blob = blob
+        receipt.original_name = receipt.file.name.rsplit('/', 1)[-1][:255]
+        receipt.save(update_fields=['blob', 'original_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0004_receipt_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_blobs, migrations.RunPython.noop),
+    ]
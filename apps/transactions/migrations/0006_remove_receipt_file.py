@@ -0,0 +1,33 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0005_backfill_receipt_blobs'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='receipt',
+            name='file',
+        ),
+        migrations.RemoveField(
+            model_name='receipt',
+            name='preview',
+        ),
+        migrations.RemoveField(
+            model_name='receipt',
+            name='status',
+        ),
+        migrations.RemoveField(
+            model_name='receipt',
+            name='thumbnail',
+        ),
+        migrations.AlterField(
+            model_name='receipt',
+            name='blob',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='receipts', to='transactions.receiptblob', verbose_name='파일'),
+        ),
+    ]
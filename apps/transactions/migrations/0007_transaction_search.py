@@ -0,0 +1,64 @@
+from django.db import migrations, transaction
+
+TABLE = 'transactions_transaction'
+SEARCH = 'transactions_transaction_search'
+
+
+def create_search_index(apps, schema_editor):
+    """가맹점/메모 트라이그램 검색 인덱스 (지원하지 않는 DB에서는 건너뜀)"""
+    vendor = schema_editor.connection.vendor
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            if vendor == 'postgresql':
+                schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                schema_editor.execute(
+                    f'CREATE INDEX IF NOT EXISTS transactions_merchant_trgm ON {TABLE} USING gin (merchant gin_trgm_ops)'
+                )
+                schema_editor.execute(
+                    f'CREATE INDEX IF NOT EXISTS transactions_memo_trgm ON {TABLE} USING gin (memo gin_trgm_ops)'
+                )
+            elif vendor == 'sqlite':
+                schema_editor.execute(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH} USING fts5('
+                    f"merchant, memo, content='{TABLE}', content_rowid='id', tokenize='trigram')"
+                )
+                schema_editor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {SEARCH}_insert AFTER INSERT ON {TABLE} BEGIN '
+                    f'INSERT INTO {SEARCH}(rowid, merchant, memo) VALUES (new.id, new.merchant, new.memo); END'
+                )
+                schema_editor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {SEARCH}_delete AFTER DELETE ON {TABLE} BEGIN '
+                    f"INSERT INTO {SEARCH}({SEARCH}, rowid, merchant, memo) "
+                    f"VALUES ('delete', old.id, old.merchant, old.memo); END"
+                )
+                schema_editor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {SEARCH}_update AFTER UPDATE OF merchant, memo ON {TABLE} BEGIN '
+                    f"INSERT INTO {SEARCH}({SEARCH}, rowid, merchant, memo) "
+                    f"VALUES ('delete', old.id, old.merchant, old.memo); "
+                    f'INSERT INTO {SEARCH}(rowid, merchant, memo) VALUES (new.id, new.merchant, new.memo); END'
+                )
+                schema_editor.execute(f"INSERT INTO {SEARCH}({SEARCH}) VALUES ('rebuild')")
+    except Exception:
+        pass
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS transactions_merchant_trgm')
+        schema_editor.execute('DROP INDEX IF EXISTS transactions_memo_trgm')
+    elif vendor == 'sqlite':
+        for suffix in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {SEARCH}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0006_remove_receipt_file'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
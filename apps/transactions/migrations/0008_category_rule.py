@@ -0,0 +1,35 @@
+# Generated by Django 5.0 on 2026-10-18 18:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0007_transaction_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=100, verbose_name='가맹점 키워드')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rules', to='transactions.category', verbose_name='카테고리')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='category_rules', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '자동 분류 규칙',
+                'verbose_name_plural': '자동 분류 규칙 목록',
+                'ordering': ['keyword'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='categoryrule',
+            constraint=models.UniqueConstraint(fields=('user', 'keyword'), name='unique_category_rule_keyword'),
+        ),
+    ]
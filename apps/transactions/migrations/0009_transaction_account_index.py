@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-18 18:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_account_balance'),
+        ('transactions', '0008_category_rule'),
+        ('trips', '0003_city_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'occurred_at'], name='transaction_account_c0b560_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0009_transaction_account_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='receiptblob',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='처리 시작일시'),
+        ),
+        migrations.AlterField(
+            model_name='receiptblob',
+            name='status',
+            field=models.CharField(choices=[('pending', '처리 대기'), ('processing', '처리 중'), ('done', '처리 완료'), ('skipped', '처리 안 함'), ('failed', '처리 실패')], default='pending', max_length=10, verbose_name='이미지 처리 상태'),
+        ),
+    ]
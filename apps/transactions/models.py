@@ -3,7 +3,6 @@ from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from apps.accounts.models import Account
 from apps.trips.models import Trip
-from core.validators import validate_file_extension, validate_file_size
 
 class Category(models.Model):
     """카테고리 모델"""
@@ -58,6 +57,7 @@ class Transaction(models.Model):
         indexes = [
             models.Index(fields=['-occurred_at']),
             models.Index(fields=['user', 'occurred_at']),
+            models.Index(fields=['account', 'occurred_at']),
         ]
         verbose_name = '거래'
         verbose_name_plural = '거래 목록'
@@ -65,18 +65,87 @@ class Transaction(models.Model):
     def __str__(self):
         return f"{self.get_transaction_type_display()} {self.amount}원 - {self.category}"
 
+class CategoryRule(models.Model):
+    """
+    자동 분류 규칙: 가맹점명에 keyword가 들어 있으면 category로 분류.
+    user가 없으면 모든 사용자에게 적용되는 공통 규칙입니다.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='category_rules',
+        verbose_name='사용자'
+    )
+    keyword = models.CharField(max_length=100, verbose_name='가맹점 키워드')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='rules', verbose_name='카테고리')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
+    
+    class Meta:
+        ordering = ['keyword']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'keyword'], name='unique_category_rule_keyword'),
+        ]
+        verbose_name = '자동 분류 규칙'
+        verbose_name_plural = '자동 분류 규칙 목록'
+    
+    def __str__(self):
+        return f"{self.keyword} → {self.category}"
+
+class ReceiptBlob(models.Model):
+    """
+    영수증 파일 본문.
+    업로드 내용의 SHA-256으로 한 번만 저장하고, 이를 가리키는 Receipt 수를 ref_count로 관리합니다.
+    """
+    STATUS_CHOICES = [
+        ('pending', '처리 대기'),
+        ('processing', '처리 중'),
+        ('done', '처리 완료'),
+        ('skipped', '처리 안 함'),
+        ('failed', '처리 실패'),
+    ]
+    
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name='내용 해시')
+    file = models.FileField(upload_to='receipts/blobs/', verbose_name='영수증 파일')
+    thumbnail = models.FileField(upload_to='receipts/blobs/', blank=True, verbose_name='썸네일')
+    preview = models.FileField(upload_to='receipts/blobs/', blank=True, verbose_name='미리보기')
+    size = models.PositiveIntegerField(default=0, verbose_name='파일 크기')
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name='이미지 처리 상태'
+    )
+    ref_count = models.IntegerField(default=0, verbose_name='참조 수')
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name='처리 시작일시')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
+    
+    class Meta:
+        verbose_name = '영수증 파일'
+        verbose_name_plural = '영수증 파일 목록'
+    
+    def __str__(self):
+        return self.sha256
+    
+    @property
+    def is_image(self):
+        return not self.file.name.lower().endswith('.pdf')
+
 class Receipt(models.Model):
-    """영수증 모델"""
+    """영수증 모델 (파일 본문은 ReceiptBlob이 가지고, 같은 파일은 여러 영수증이 공유)"""
     transaction = models.ForeignKey(
         Transaction, 
         on_delete=models.CASCADE, 
         related_name='receipts'
     )
-    file = models.FileField(
-        upload_to='receipts/%Y/%m/%d/',
-        validators=[validate_file_extension, validate_file_size],
-        verbose_name='영수증 파일'
+    blob = models.ForeignKey(
+        ReceiptBlob,
+        on_delete=models.PROTECT,
+        related_name='receipts',
+        verbose_name='파일'
     )
+    original_name = models.CharField(max_length=255, blank=True, verbose_name='원본 파일명')
     uploaded_at = models.DateTimeField(auto_now_add=True, verbose_name='업로드일시')
     
     class Meta:
@@ -86,3 +155,15 @@ class Receipt(models.Model):
     
     def __str__(self):
         return f"영수증 - {self.transaction}"
+    
+    @property
+    def file(self):
+        return self.blob.file
+    
+    @property
+    def thumbnail(self):
+        return self.blob.thumbnail
+    
+    @property
+    def preview(self):
+        return self.blob.preview
@@ -0,0 +1,275 @@
+"""
+영수증 파일 저장과 이미지 후처리.
+
+저장
+- 업로드를 청크 단위로 읽으며 SHA-256을 계산하고, 같은 내용의 파일(ReceiptBlob)이 있으면 재사용합니다.
+- ReceiptBlob.ref_count는 이를 가리키는 Receipt 수이며, 0이 되면 행과 파일을 함께 삭제합니다.
+- 파일은 업로드 트랜잭션이 커밋되기 전에 저장되므로, 롤백되어 행 없이 남은 파일은
+  collect_garbage(gc_receipt_blobs 명령)가 BLOB_DIR을 훑어 지웁니다.
+
+후처리 (새 파일에 대해 한 번만)
+- EXIF 회전 정보를 적용한 뒤 메타데이터(EXIF/GPS 등) 제거
+- 긴 변을 RECEIPT_MAX_DIMENSION 이하로 줄이고 JPEG로 재압축해 원본을 교체
+- 목록용 썸네일, 상세 화면용 미리보기 생성
+
+업로드 트랜잭션이 커밋되면 프로세스 내 스레드 풀에서 처리하고,
+처리되지 못한 파일은 `process_receipts` 명령으로 다시 처리할 수 있습니다.
+같은 파일을 동시에 처리하지 않도록 상태를 pending -> processing으로 바꾼 쪽만 처리합니다
+(RECEIPT_PROCESSING_TIMEOUT보다 오래 processing이면 처리하던 프로세스가 죽은 것으로 보고 다시 가져감).
+"""
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+from core import metrics
+from .models import Receipt, ReceiptBlob
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = 'receipts/blobs'
+
+_executor = None
+
+
+def blob_name(sha256, suffix):
+    """내용 해시 기반 저장 경로 (디렉터리당 파일 수를 줄이기 위해 앞 2글자로 분산)"""
+    return f'{BLOB_DIR}/{sha256[:2]}/{sha256}{suffix}'
+
+
+def hash_upload(upload):
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()
+
+
+def acquire_blob(upload):
+    """
+    업로드 내용과 같은 ReceiptBlob의 참조 수를 올려 반환합니다. 없으면 새로 저장합니다.
+    참조 수를 먼저 올리므로 동시에 실행되는 GC가 방금 찾은 파일을 지우지 않습니다.
+    """
+    sha256 = hash_upload(upload)
+    if ReceiptBlob.objects.filter(sha256=sha256).update(ref_count=F('ref_count') + 1):
+        return ReceiptBlob.objects.get(sha256=sha256)
+
+    storage = ReceiptBlob._meta.get_field('file').storage
+    name = blob_name(sha256, os.path.splitext(upload.name)[1].lower())
+    if not storage.exists(name):
+        name = storage.save(name, upload)
+    try:
+        with transaction.atomic():
+            blob = ReceiptBlob.objects.create(sha256=sha256, file=name, size=upload.size, ref_count=1)
+    except IntegrityError:
+        # 같은 파일이 동시에 업로드된 경우
+        ReceiptBlob.objects.filter(sha256=sha256).update(ref_count=F('ref_count') + 1)
+        return ReceiptBlob.objects.get(sha256=sha256)
+    schedule_processing(blob.pk)
+    return blob
+
+
+def attach_receipt(tx, upload):
+    """거래에 영수증 파일을 연결합니다. 같은 내용의 파일은 한 번만 저장됩니다."""
+    metrics.receipt_upload_bytes.observe(upload.size)
+    with transaction.atomic():
+        blob = acquire_blob(upload)
+        return Receipt.objects.create(transaction=tx, blob=blob, original_name=upload.name[:255])
+
+
+def release_blob(blob_id):
+    """영수증 하나가 삭제될 때 참조 수를 내리고, 0이 되면 커밋 후 정리"""
+    ReceiptBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+    transaction.on_commit(lambda: collect_blob(blob_id))
+
+
+def collect_blob(blob_id):
+    """참조가 없는 ReceiptBlob을 삭제하고 파일을 지웁니다. 삭제했으면 True"""
+    with transaction.atomic():
+        blob = ReceiptBlob.objects.select_for_update().filter(pk=blob_id, ref_count__lte=0).first()
+        if blob is None or blob.receipts.exists():
+            return False
+        names = [field.name for field in (blob.file, blob.preview, blob.thumbnail) if field]
+        blob.delete()
+    storage = ReceiptBlob._meta.get_field('file').storage
+    for name in names:
+        storage.delete(name)
+    return True
+
+
+def collect_garbage(grace=timedelta(hours=1)):
+    """
+    ref_count를 실제 Receipt 수로 다시 맞추고, 참조가 없는 파일을 정리합니다.
+    업로드 도중인 파일을 지우지 않도록 grace보다 오래된 것만 삭제합니다.
+    반환: (보정한 행 수, 삭제한 파일 수)
+    """
+    actual = Receipt.objects.filter(blob=OuterRef('pk')).order_by().values('blob').annotate(
+        count=Count('pk')
+    ).values('count')
+    drifted = ReceiptBlob.objects.annotate(
+        actual=Coalesce(Subquery(actual), 0)
+    ).exclude(ref_count=F('actual'))
+    repaired = 0
+    for blob_id, count in drifted.values_list('pk', 'actual'):
+        repaired += ReceiptBlob.objects.filter(pk=blob_id).update(ref_count=count)
+
+    orphans = ReceiptBlob.objects.filter(
+        ref_count__lte=0, created_at__lt=timezone.now() - grace
+    ).values_list('pk', flat=True)
+    deleted = sum(collect_blob(blob_id) for blob_id in list(orphans))
+    deleted += collect_stray_files(grace)
+    return repaired, deleted
+
+
+def collect_stray_files(grace):
+    """BLOB_DIR에서 어떤 ReceiptBlob도 가리키지 않는 파일(롤백된 업로드 등)을 삭제하고 그 수를 반환"""
+    storage = ReceiptBlob._meta.get_field('file').storage
+    try:
+        directories, _ = storage.listdir(BLOB_DIR)
+    except FileNotFoundError:
+        return 0
+    cutoff = timezone.now() - grace
+    deleted = 0
+    for directory in directories:
+        prefix = f'{BLOB_DIR}/{directory}/'
+        used = set()
+        for names in ReceiptBlob.objects.filter(
+            Q(file__startswith=prefix) | Q(preview__startswith=prefix) | Q(thumbnail__startswith=prefix)
+        ).values_list('file', 'preview', 'thumbnail'):
+            used.update(names)
+        for filename in storage.listdir(prefix)[1]:
+            name = prefix + filename
+            if name not in used and storage.get_modified_time(name) < cutoff:
+                storage.delete(name)
+                deleted += 1
+    return deleted
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.RECEIPT_PROCESSING_WORKERS,
+            thread_name_prefix='receipt',
+        )
+    return _executor
+
+
+def schedule_processing(blob_id):
+    """업로드 트랜잭션 커밋 후 백그라운드에서 처리하도록 예약"""
+    if not settings.RECEIPT_PROCESS_IN_BACKGROUND:
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_process_in_background, blob_id))
+
+
+def _process_in_background(blob_id):
+    close_old_connections()
+    try:
+        process_blob(blob_id)
+    except Exception:
+        logger.exception('영수증 이미지 처리 실패 (blob=%s)', blob_id)
+    finally:
+        connection.close()  # 스레드 전용 DB 연결 정리
+
+
+def _to_rgb(image):
+    """투명 배경(PNG)은 흰 배경 위에 합쳐서 JPEG로 저장할 수 있게 변환"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, max_dimension, quality):
+    """긴 변을 max_dimension 이하로 줄여 JPEG 바이트로 반환 (메타데이터 없이 저장)"""
+    image = image.copy()
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _replace(storage, name, content):
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(content))
+
+
+def process_blob(blob_id):
+    """영수증 파일 하나를 처리하고 상태를 반환합니다. (다른 프로세스가 처리 중이면 'processing')"""
+    if not claim_blob(blob_id):
+        return ReceiptBlob.objects.filter(pk=blob_id).values_list('status', flat=True).first()
+    blob = ReceiptBlob.objects.get(pk=blob_id)
+    try:
+        return _process_claimed(blob)
+    except BaseException:
+        # 예상하지 못한 오류: 다음 process_receipts에서 다시 처리하도록 되돌림
+        ReceiptBlob.objects.filter(pk=blob.pk, status='processing').update(status='pending', claimed_at=None)
+        raise
+
+
+def claim_blob(blob_id):
+    """처리 대기(또는 오래 멈춘 처리 중) 파일을 처리 중으로 바꿈 - 바꾼 쪽만 처리 (조건부 UPDATE)"""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.RECEIPT_PROCESSING_TIMEOUT)
+    return bool(ReceiptBlob.objects.filter(
+        Q(status='pending') | Q(status='processing', claimed_at__lt=stale), pk=blob_id,
+    ).update(status='processing', claimed_at=now))
+
+
+def _process_claimed(blob):
+    if not blob.is_image:
+        ReceiptBlob.objects.filter(pk=blob.pk).update(status='skipped')
+        return 'skipped'
+
+    try:
+        with blob.file.open('rb') as fileobj:
+            image = Image.open(fileobj)
+            image = ImageOps.exif_transpose(image)
+            image = _to_rgb(image)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        logger.warning('영수증 이미지를 읽을 수 없습니다 (blob=%s)', blob.pk)
+        ReceiptBlob.objects.filter(pk=blob.pk).update(status='failed')
+        return 'failed'
+
+    quality = settings.RECEIPT_JPEG_QUALITY
+    original = _encode(image, settings.RECEIPT_MAX_DIMENSION, quality)
+    preview = _encode(image, settings.RECEIPT_PREVIEW_DIMENSION, quality)
+    thumbnail = _encode(image, settings.RECEIPT_THUMBNAIL_DIMENSION, quality)
+
+    storage = blob.file.storage
+    old_name = blob.file.name
+    blob.file.name = _replace(storage, blob_name(blob.sha256, '.jpg'), original)
+    blob.preview.name = _replace(storage, blob_name(blob.sha256, '_preview.jpg'), preview)
+    blob.thumbnail.name = _replace(storage, blob_name(blob.sha256, '_thumb.jpg'), thumbnail)
+    blob.size = len(original)
+    blob.status = 'done'
+    blob.save(update_fields=['file', 'preview', 'thumbnail', 'size', 'status'])
+    if old_name != blob.file.name:
+        storage.delete(old_name)
+    return 'done'
+
+
+def process_pending(limit=None):
+    """처리 대기 중인(또는 오래 멈춘) 파일을 순서대로 처리하고 {상태: 건수}를 반환"""
+    stale = timezone.now() - timedelta(seconds=settings.RECEIPT_PROCESSING_TIMEOUT)
+    pending = ReceiptBlob.objects.filter(
+        Q(status='pending') | Q(status='processing', claimed_at__lt=stale)
+    ).order_by('pk').values_list('pk', flat=True)
+    if limit:
+        pending = pending[:limit]
+    counts = {}
+    for blob_id in list(pending):
+        status = process_blob(blob_id)
+        counts[status] = counts.get(status, 0) + 1
+    return counts
@@ -0,0 +1,17 @@
+from django.db.models import Case, IntegerField, Value, When
+from core.refdata import ReferenceTable
+from .models import Category
+
+
+def ordered_categories():
+    """카테고리 순서: 이름순 정렬, 단 '기타'는 맨 마지막"""
+    return Category.objects.annotate(
+        custom_order=Case(
+            When(name='기타', then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    ).order_by('custom_order', 'name')
+
+
+categories = ReferenceTable(Category, ordered_categories)
@@ -0,0 +1,158 @@
+"""
+거래 가맹점/메모 검색.
+
+한글 가맹점명은 띄어쓰기 없이 붙어 있는 경우가 많아(예: '스타벅스강남점'에서 '강남')
+단어 단위 전문 검색 대신 부분 문자열을 찾는 트라이그램 인덱스를 씁니다.
+- PostgreSQL: merchant/memo의 pg_trgm GIN 인덱스 (ILIKE '%검색어%'가 인덱스를 탐, 유사도로 순위)
+- SQLite: FTS5 trigram 외부 콘텐츠 테이블 transactions_transaction_search
+  (거래 테이블 트리거로 갱신되므로 bulk_create/파일 가져오기/픽스처 로드도 반영, bm25로 순위)
+- 인덱스가 없거나 3글자 미만인 검색어: icontains (다른 필터로 좁혀진 범위만 훑음)
+
+검색어는 공백으로 나눈 단어를 모두 포함하는 거래를 찾습니다.
+"""
+from django.db import DatabaseError, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from .models import Transaction
+
+SQLITE_SEARCH_TABLE = 'transactions_transaction_search'
+POSTGRES_INDEXES = ('transactions_merchant_trgm', 'transactions_memo_trgm')
+TRIGRAM_MIN_LENGTH = 3
+MAX_TERMS = 10
+
+_backends = {}
+
+
+def search_terms(query):
+    """검색어를 단어 목록으로 (중복 제거, 최대 MAX_TERMS개)"""
+    return list(dict.fromkeys(query.split()))[:MAX_TERMS]
+
+
+def search_backend(using):
+    """'sqlite' / 'postgresql' / None(인덱스 없음), 연결별로 한 번만 확인"""
+    if using not in _backends:
+        connection = connections[using]
+        backend = None
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'sqlite':
+                    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SQLITE_SEARCH_TABLE])
+                    backend = 'sqlite' if cursor.fetchone() else None
+                elif connection.vendor == 'postgresql':
+                    cursor.execute('SELECT count(*) FROM pg_indexes WHERE indexname = ANY(%s)', [list(POSTGRES_INDEXES)])
+                    backend = 'postgresql' if cursor.fetchone()[0] == len(POSTGRES_INDEXES) else None
+        except DatabaseError:
+            backend = None
+        _backends[using] = backend
+    return _backends[using]
+
+
+def _fts_match(terms):
+    """FTS5 MATCH 식 (각 단어를 구문으로 감싸 AND)"""
+    return ' '.join('"%s"' % term.replace('"', '""') for term in terms)
+
+
+def _like_pattern(term):
+    return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def search_transactions(queryset, query):
+    """merchant/memo에 검색어의 모든 단어가 들어 있는 거래로 좁힘 (다른 필터와 AND로 결합)"""
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    backend = search_backend(queryset.db)
+    indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH] if backend else []
+    table = Transaction._meta.db_table
+
+    if indexed and backend == 'sqlite':
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s', [_fts_match(indexed)]
+        ))
+    elif indexed and backend == 'postgresql':
+        for term in indexed:
+            pattern = _like_pattern(term)
+            queryset = queryset.filter(RawSQL(
+                f'("{table}"."merchant" ILIKE %s OR "{table}"."memo" ILIKE %s)',
+                [pattern, pattern], output_field=BooleanField(),
+            ))
+    for term in terms:
+        if term not in indexed:
+            queryset = queryset.filter(Q(merchant__icontains=term) | Q(memo__icontains=term))
+    return queryset
+
+
+def rank_transactions(queryset, query):
+    """
+    검색어와의 관련도(search_rank, 클수록 관련 높음)를 붙여 관련도 순으로 정렬.
+    SQLite 검색 테이블을 쓰면 검색어에 맞는 거래만 남습니다 (search_transactions로 좁힌 뒤에 씀).
+    """
+    terms = search_terms(query)
+    backend = search_backend(queryset.db)
+    indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    table = Transaction._meta.db_table
+    if indexed and backend == 'sqlite':
+        # 검색 테이블을 한 번 조인해 MATCH한 행의 bm25 점수(rank, 작을수록 관련이 높음)를 그대로 씀
+        # (거래마다 검색 테이블을 다시 조회하는 상관 서브쿼리를 피하려고 extra로 조인)
+        return queryset.extra(
+            select={'search_rank': f'-{SQLITE_SEARCH_TABLE}.rank'},
+            tables=[SQLITE_SEARCH_TABLE],
+            where=[f'{SQLITE_SEARCH_TABLE}.rowid = "{table}"."id"', f'{SQLITE_SEARCH_TABLE} MATCH %s'],
+            params=[_fts_match(indexed)],
+        ).order_by('-search_rank', '-occurred_at', '-id')
+    if indexed and backend == 'postgresql':
+        text = ' '.join(terms)
+        rank = RawSQL(
+            f'GREATEST(similarity("{table}"."merchant", %s), similarity("{table}"."memo", %s))',
+            [text, text], output_field=FloatField(),
+        )
+    else:
+        rank = Value(0.0, output_field=FloatField())
+    return queryset.annotate(search_rank=rank).order_by('-search_rank', '-occurred_at', '-id')
+
+
+def install_search_index(using):
+    """
+    SQLite 검색 테이블의 동기화 트리거를 다시 만듦 (테이블은 0007 마이그레이션이 만듦).
+    SQLite는 필드 변경 마이그레이션에서 거래 테이블을 새로 만들어 트리거가 사라지므로
+    post_migrate마다 확인하고, 트리거를 다시 만든 경우에는 인덱스도 다시 채웁니다.
+    """
+    _backends.pop(using, None)
+    if search_backend(using) != 'sqlite':
+        return
+    connection = connections[using]
+    table, search = Transaction._meta.db_table, SQLITE_SEARCH_TABLE
+    triggers = {
+        f'{search}_insert': (
+            f'AFTER INSERT ON {table} BEGIN '
+            f'INSERT INTO {search}(rowid, merchant, memo) VALUES (new.id, new.merchant, new.memo); END'
+        ),
+        f'{search}_delete': (
+            f'AFTER DELETE ON {table} BEGIN '
+            f"INSERT INTO {search}({search}, rowid, merchant, memo) VALUES ('delete', old.id, old.merchant, old.memo); END"
+        ),
+        f'{search}_update': (
+            f'AFTER UPDATE OF merchant, memo ON {table} BEGIN '
+            f"INSERT INTO {search}({search}, rowid, merchant, memo) VALUES ('delete', old.id, old.merchant, old.memo); "
+            f'INSERT INTO {search}(rowid, merchant, memo) VALUES (new.id, new.merchant, new.memo); END'
+        ),
+    }
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [table])
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in triggers if name not in existing]
+            for name in missing:
+                cursor.execute(f'CREATE TRIGGER {name} {triggers[name]}')
+            if missing:
+                cursor.execute(f"INSERT INTO {search}({search}) VALUES ('rebuild')")
+    except DatabaseError:
+        pass
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using, **kwargs):
+    if sender.name == 'apps.transactions':
+        install_search_index(using)
@@ -0,0 +1,94 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+from core.fixtures import fixture_loaded
+from core.versioning import bump_data_version
+from .models import Receipt, ReceiptBlob, Transaction
+from .receipts import release_blob
+
+# bulk_create는 post_save를 보내지 않으므로 일괄 등록 후 직접 보내는 시그널
+# (인자: transactions - 생성된 Transaction 목록)
+transactions_bulk_created = Signal()
+
+# bulk_update 등으로 거래를 일괄 수정한 뒤 보내는 시그널 (인자: user_ids - 거래가 바뀐 사용자 id 집합)
+transactions_bulk_updated = Signal()
+
+
+# 수정 전 값으로 이전 집계/잔액을 차감하는 데 필요한 필드
+PREVIOUS_FIELDS = ('user_id', 'account_id', 'occurred_at', 'category_id', 'transaction_type', 'amount')
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_values(sender, instance, **kwargs):
+    """수정 전 값을 instance._previous에 기억 (새 거래면 None, 월간 집계와 계좌 잔액이 함께 씀)"""
+    instance._previous = None
+    if instance.pk:
+        instance._previous = Transaction.objects.filter(pk=instance.pk).values(*PREVIOUS_FIELDS).first()
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def bump_version_on_transaction_change(sender, instance, **kwargs):
+    """거래가 바뀌면 사용자 데이터 버전을 올려 집계 캐시를 무효화 (같은 트랜잭션 안에서)"""
+    bump_data_version(instance.user_id)
+
+
+@receiver(transactions_bulk_created)
+def bump_version_on_bulk_create(sender, transactions, **kwargs):
+    for user_id in {tx.user_id for tx in transactions}:
+        bump_data_version(user_id)
+
+
+@receiver(transactions_bulk_updated)
+def bump_version_on_bulk_update(sender, user_ids, **kwargs):
+    for user_id in user_ids:
+        bump_data_version(user_id)
+
+
+@receiver(fixture_loaded, sender=Transaction)
+def bump_version_on_fixture_load(sender, instances, **kwargs):
+    bump_version_on_bulk_create(sender, transactions=instances)
+
+
+def receipt_user_ids(receipts):
+    """영수증들이 붙은 거래의 사용자 id 집합 (거래와 함께 삭제된 영수증은 빠짐)"""
+    user_ids, transaction_ids = set(), set()
+    for receipt in receipts:
+        if Receipt.transaction.is_cached(receipt):
+            user_ids.add(receipt.transaction.user_id)
+        else:
+            transaction_ids.add(receipt.transaction_id)
+    transaction_ids = list(transaction_ids)
+    for offset in range(0, len(transaction_ids), 500):
+        user_ids.update(
+            Transaction.objects.filter(pk__in=transaction_ids[offset:offset + 500]).values_list('user_id', flat=True)
+        )
+    return user_ids
+
+
+@receiver(post_save, sender=Receipt)
+@receiver(post_delete, sender=Receipt)
+def bump_version_on_receipt_change(sender, instance, **kwargs):
+    for user_id in receipt_user_ids([instance]):
+        bump_data_version(user_id)
+
+
+@receiver(fixture_loaded, sender=Receipt)
+def bump_version_on_receipt_fixture_load(sender, instances, **kwargs):
+    for user_id in receipt_user_ids(instances):
+        bump_data_version(user_id)
+
+
+@receiver(post_save, sender=ReceiptBlob)
+def bump_version_on_blob_change(sender, instance, created, **kwargs):
+    """영수증 후처리가 끝나면(썸네일 생성 등) 그 파일을 쓰는 사용자들의 데이터 버전을 올림"""
+    if created:
+        return
+    user_ids = Transaction.objects.filter(receipts__blob=instance).values_list('user_id', flat=True).distinct()
+    for user_id in user_ids:
+        bump_data_version(user_id)
+
+
+@receiver(post_delete, sender=Receipt)
+def release_receipt_blob(sender, instance, **kwargs):
+    """영수증이 삭제되면 파일 참조 수를 내리고, 더 이상 쓰이지 않는 파일은 정리"""
+    release_blob(instance.blob_id)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.dashboard.models import MonthlyRollup
+from apps.transactions.categorize import Categorizer, recategorize
+from apps.transactions.forms import TransactionForm
+from apps.transactions.importers import TransactionImporter
+from apps.transactions.models import CategoryRule, Transaction
+from .utils import make_user, make_account, make_category, make_tx
+
+
+class CategorizerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user("u1")
+        self.account = make_account(self.user)
+        self.misc = make_category("기타")
+        self.food = make_category("식비")
+        self.cafe = make_category("카페")
+        self.transport = make_category("교통")
+        CategoryRule.objects.create(keyword="스타벅스", category=self.food)
+        CategoryRule.objects.create(keyword="택시", category=self.transport)
+        CategoryRule.objects.create(user=self.user, keyword="벅스", category=self.cafe)
+
+    def tearDown(self):
+        cache.clear()
+
+    def add(self, merchant, category):
+        tx = make_tx(user=self.user, account=self.account, category=category)
+        Transaction.objects.filter(pk=tx.pk).update(merchant=merchant)
+        cache.clear()
+        return Transaction.objects.get(pk=tx.pk)
+
+    def categorizer(self):
+        return Categorizer(self.user.pk, ignore_category_id=self.misc.pk)
+
+    def test_rule_precedence(self):
+        self.add("동네 식당", self.food)
+        self.add("Kakao 택시", self.food)
+        categorizer = self.categorizer()
+        # 사용자 규칙이 공통 규칙보다 먼저
+        self.assertEqual(categorizer.categorize("스타벅스 강남점"), self.cafe.pk)
+        # 이전 거래가 공통 규칙보다 먼저
+        self.assertEqual(categorizer.categorize("KAKAO  택시"), self.food.pk)
+        self.assertEqual(categorizer.categorize("서울 택시"), self.transport.pk)
+        self.assertEqual(categorizer.categorize("동네 식당"), self.food.pk)
+        self.assertIsNone(categorizer.categorize("처음 보는 곳"))
+
+    def test_fallback_category_is_not_learned(self):
+        self.add("동네 식당", self.misc)
+        self.assertIsNone(self.categorizer().categorize("동네 식당"))
+
+    def test_import_categorizes_rows_without_category(self):
+        content = "date,amount,merchant,category\n2026-02-01,-3000,서울택시,\n2026-02-02,-4000,서울택시,식비\n2026-02-03,-100,편의점,\n"
+        TransactionImporter(self.user, account=self.account).run(io.BytesIO(content.encode()), "csv")
+        rows = Transaction.objects.order_by("occurred_at")
+        self.assertEqual([tx.category for tx in rows], [self.transport, self.food, self.misc])
+
+    def test_form_fills_blank_category(self):
+        form = TransactionForm({
+            "account": self.account.pk, "transaction_type": "expense", "amount": "5000",
+            "occurred_at": "2026-02-01T12:00", "merchant": "공항 택시", "memo": "",
+        }, user=self.user)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data["category"], self.transport)
+
+        form = TransactionForm({**form.data, "merchant": "모르는 가게"}, user=self.user)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data["category"], self.misc)
+
+    def test_recategorize_updates_rollups(self):
+        taxi = self.add("서울택시", self.misc)
+        other = self.add("모르는 가게", self.misc)
+        self.assertEqual(recategorize(Transaction.objects.all()), 1)
+        taxi.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(taxi.category, self.transport)
+        self.assertEqual(other.category, self.misc)
+        rollup = MonthlyRollup.objects.get(user=self.user, month=date(2026, 2, 1), category=self.transport)
+        self.assertEqual(rollup.total_amount, Decimal("1000"))
+        self.assertEqual(rollup.transaction_count, 1)
+
+    def test_categorizes_many_transactions_quickly(self):
+        rules = [CategoryRule(keyword=f"체인{i:04d}", category=self.food) for i in range(1000)]
+        CategoryRule.objects.bulk_create(rules)
+        categorizer = self.categorizer()
+        transactions = [Transaction(merchant=f"체인{i % 2000:04d} {i % 5000}호점") for i in range(100_000)]
+        changed = categorizer.apply(transactions)
+        self.assertEqual(len(changed), 50_000)
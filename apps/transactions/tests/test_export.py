@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import csv
+import io
+import zipfile
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import make_user, make_account, make_trip, make_category, make_tx
+
+
+class TransactionExportTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1")
+        self.other = make_user("u2")
+        self.client.login(username="u1", password="pass1234!")
+
+        self.account = make_account(self.user, name="생활비")
+        self.trip = make_trip(self.user, name="도쿄")
+        self.food = make_category("식비")
+        self.salary = make_category("급여")
+
+        make_tx(user=self.user, account=self.account, category=self.food, trip=self.trip,
+                amount=Decimal("12000"), occurred_at=datetime(2026, 2, 1, 3, 0, tzinfo=timezone.utc))
+        make_tx(user=self.user, account=self.account, category=self.salary, tx_type="income",
+                amount=Decimal("500000"), occurred_at=datetime(2026, 2, 2, 3, 0, tzinfo=timezone.utc))
+
+        other_account = make_account(self.other)
+        make_tx(user=self.other, account=other_account, category=self.food, amount=Decimal("777"))
+
+        self.url = reverse("transaction_export")
+
+    def read_csv(self, response):
+        body = b"".join(response.streaming_content).decode("utf-8")
+        self.assertTrue(body.startswith("\ufeff"))
+        return list(csv.reader(io.StringIO(body[1:])))
+
+    def test_csv_export_streams_own_transactions(self):
+        response = self.client.get(self.url, {"format": "csv"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0][0], "거래일시")
+        self.assertEqual(len(rows), 3)
+        # 최신순, 로컬 시간(Asia/Seoul) 기준
+        self.assertEqual(rows[1][:5], ["2026-02-02 12:00", "입금", "", "급여", "500000"])
+        self.assertEqual(rows[2][:5], ["2026-02-01 12:00", "출금", "도쿄", "식비", "12000"])
+        self.assertNotIn("777", [row[4] for row in rows])
+
+    def test_csv_export_applies_list_filters(self):
+        response = self.client.get(self.url, {"format": "csv", "transaction_type": "expense"})
+
+        rows = self.read_csv(response)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][3], "식비")
+
+    def test_xlsx_export_is_valid_workbook(self):
+        response = self.client.get(self.url, {"format": "xlsx"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertIn("xl/workbook.xml", archive.namelist())
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertEqual(sheet.count("<row>"), 3)
+        self.assertIn("<c><v>500000</v></c>", sheet)
+        self.assertIn("도쿄", sheet)
+
+    def test_unknown_format_returns_404(self):
+        response = self.client.get(self.url, {"format": "pdf"})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import io
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.dashboard.models import MonthlyRollup
+from apps.transactions.importers import RowError, TransactionImporter, parse_datetime_value, parse_ofx
+from apps.transactions.models import Transaction
+from .utils import make_user, make_account, make_trip, make_category
+
+CSV_CONTENT = """거래일시,금액,거래유형,가맹점,카테고리,메모
+2026-02-01 12:30,"12,000",출금,스타벅스,식비,커피
+2026.02.02,50000,입금,회사,급여,
+2026-02-03T09:00:00,abc,출금,편의점,식비,
+2026-02-04,3000,출금,택시,없는카테고리,
+"""
+
+OFX_CONTENT = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260205120000.000[+9:KST]
+<TRNAMT>-4500
+<NAME>CAFE
+<MEMO>latte
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260206
+<TRNAMT>100000
+<NAME>SALARY
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class TransactionImporterTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1", password="pass1234!")
+        self.account = make_account(self.user)
+        self.food = make_category("식비")
+        self.salary = make_category("급여")
+        self.misc = make_category("기타")
+
+    def test_csv_import_creates_rows_and_reports_errors(self):
+        importer = TransactionImporter(self.user, account=self.account)
+        result = importer.run(io.BytesIO(CSV_CONTENT.encode("utf-8-sig")), "csv")
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.error_count, 2)
+        self.assertEqual([line for line, _ in result.errors], [4, 5])
+
+        coffee = Transaction.objects.get(merchant="스타벅스")
+        self.assertEqual(coffee.amount, Decimal("12000"))
+        self.assertEqual(coffee.transaction_type, "expense")
+        self.assertEqual(coffee.category, self.food)
+        self.assertEqual(coffee.memo, "커피")
+
+    def test_import_batches_and_updates_rollups(self):
+        rows = "\n".join(f"2026-02-{day:02d},-1000,가맹점{day}" for day in range(1, 26))
+        content = "date,amount,merchant\n" + rows
+        importer = TransactionImporter(self.user, account=self.account, batch_size=10)
+        result = importer.run(io.BytesIO(content.encode()), "csv")
+
+        self.assertEqual(result.created, 25)
+        rollup = MonthlyRollup.objects.get(user=self.user, month=date(2026, 2, 1))
+        self.assertEqual(rollup.category, self.misc)
+        self.assertEqual(rollup.total_amount, Decimal("25000"))
+        self.assertEqual(rollup.transaction_count, 25)
+
+    def test_missing_required_column(self):
+        importer = TransactionImporter(self.user, account=self.account)
+        result = importer.run(io.BytesIO(b"merchant\nA\n"), "csv")
+        self.assertEqual(result.created, 0)
+        self.assertEqual(result.error_count, 1)
+
+    def test_parse_ofx_sgml(self):
+        rows = [row for _, row in parse_ofx(io.BytesIO(OFX_CONTENT.encode()))]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["amount"], "-4500")
+        self.assertEqual(rows[0]["transaction_type"], "expense")
+        self.assertEqual(rows[1]["merchant"], "SALARY")
+
+    def test_ofx_import(self):
+        importer = TransactionImporter(self.user, account=self.account)
+        result = importer.run(io.BytesIO(OFX_CONTENT.encode()), "ofx")
+        self.assertEqual(result.created, 2)
+        cafe = Transaction.objects.get(merchant="CAFE")
+        self.assertEqual(cafe.amount, Decimal("4500"))
+        self.assertEqual(cafe.category, self.misc)
+
+    def test_non_finite_amount_is_row_error(self):
+        content = "date,amount\n2026-01-01,100\n2026-01-02,NaN\n2026-01-03,Infinity\n2026-01-04,-inf\n"
+        importer = TransactionImporter(self.user, account=self.account)
+        result = importer.run(io.BytesIO(content.encode()), "csv")
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5])
+        self.assertEqual(Transaction.objects.get(user=self.user).amount, Decimal("100"))
+
+    def test_ofx_datetime_offset_and_malformed_value(self):
+        self.assertEqual(
+            parse_datetime_value("20260205120000.000[-5:EST]"),
+            datetime(2026, 2, 5, 17, 0, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            parse_datetime_value("20260205120000[+5.5]"),
+            datetime(2026, 2, 5, 6, 30, tzinfo=timezone.utc),
+        )
+        for value in ("99999999999999", "20261301", "20260205[abc:X]"):
+            with self.subTest(value=value), self.assertRaises(RowError):
+                parse_datetime_value(value)
+
+        content = OFX_CONTENT.replace("<DTPOSTED>20260206", "<DTPOSTED>99999999999999")
+        importer = TransactionImporter(self.user, account=self.account)
+        result = importer.run(io.BytesIO(content.encode()), "ofx")
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.error_count, 1)
+
+
+class TransactionImportViewTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1", password="pass1234!")
+        self.account = make_account(self.user)
+        self.trip = make_trip(self.user)
+        make_category("식비")
+        make_category("기타")
+        self.client.login(username="u1", password="pass1234!")
+
+    def test_upload_csv_links_trip(self):
+        upload = SimpleUploadedFile("bank.csv", "date,amount,merchant\n2026-02-01,-3000,택시\n".encode())
+        resp = self.client.post(reverse("transaction_import"), {
+            "file": upload, "account": self.account.id, "trip": self.trip.id,
+        })
+        self.assertRedirects(resp, reverse("transaction_list"), fetch_redirect_response=False)
+        tx = Transaction.objects.get(merchant="택시")
+        self.assertEqual(tx.trip, self.trip)
+        self.assertEqual(tx.user, self.user)
+
+    def test_upload_with_errors_shows_rows(self):
+        upload = SimpleUploadedFile("bank.csv", "date,amount\nbad,1000\n".encode())
+        resp = self.client.post(reverse("transaction_import"), {"file": upload, "account": self.account.id})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["result"].errors[0][0], 2)
+
+    def test_rejects_unknown_extension(self):
+        upload = SimpleUploadedFile("bank.txt", b"date,amount\n")
+        resp = self.client.post(reverse("transaction_import"), {"file": upload, "account": self.account.id})
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("file", resp.context["form"].errors)
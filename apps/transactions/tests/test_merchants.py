@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.transactions.merchants import get_merchant_index, suggest_merchants
+from apps.transactions.models import Transaction
+from .utils import make_user, make_account, make_category, make_tx, make_transactions
+
+
+class MerchantSuggestionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user("u1", password="pass1234!")
+        self.account = make_account(self.user)
+        self.food = make_category("식비")
+        self.cafe = make_category("카페")
+        for merchant, category, count in [
+            ("스타벅스 강남점", self.cafe, 3),
+            ("스타벅스 강남점", self.food, 1),
+            ("스타필드", self.food, 1),
+            ("STARBUCKS", self.cafe, 2),
+        ]:
+            for _ in range(count):
+                self.add(merchant, category)
+        other = make_user("u2")
+        self.add("스타벅스 역삼점", self.food, user=other, account=make_account(other))
+
+    def tearDown(self):
+        cache.clear()
+
+    def add(self, merchant, category, user=None, account=None):
+        tx = make_tx(user=user or self.user, account=account or self.account, category=category)
+        Transaction.objects.filter(pk=tx.pk).update(merchant=merchant)
+        cache.clear()
+        return tx
+
+    def names(self, prefix):
+        return [s["merchant"] for s in suggest_merchants(self.user.pk, prefix)]
+
+    def test_prefix_ranked_by_frequency_with_usual_category(self):
+        suggestions = suggest_merchants(self.user.pk, "스타")
+        self.assertEqual([s["merchant"] for s in suggestions], ["스타벅스 강남점", "스타필드"])
+        self.assertEqual(suggestions[0]["count"], 4)
+        self.assertEqual(suggestions[0]["category_id"], self.cafe.pk)
+        self.assertEqual(self.names("starb"), ["STARBUCKS"])
+
+    def test_matches_partially_typed_hangul(self):
+        self.assertEqual(self.names("스ㅌ"), ["스타벅스 강남점", "스타필드"])
+        self.assertEqual(self.names("없는"), [])
+
+    def test_lookups_use_cached_index(self):
+        get_merchant_index(self.user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.names("스")
+            self.names("스타벅")
+        # 가맹점 목록 버전만 조회
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(all("core_dataversion" in query["sql"] for query in queries))
+
+    def test_new_transactions_are_added_incrementally(self):
+        get_merchant_index(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            tx = make_tx(user=self.user, account=self.account, category=self.food)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.names("테스트"), ["테스트가맹점"])
+        self.assertEqual(len(queries), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_transactions(user=self.user, account=self.account, categories=[self.food], count=3)
+        self.assertEqual(self.names("가맹점"), ["가맹점0", "가맹점1", "가맹점2"])
+
+        tx.merchant = "스타필드"
+        tx.save()
+        self.assertEqual(self.names("테스트"), [])
+
+    def test_full_index_is_rebuilt_for_new_merchant(self):
+        with mock.patch("apps.transactions.merchants.MAX_MERCHANTS", 3):
+            self.assertEqual(len(get_merchant_index(self.user.pk)), 3)
+            with self.captureOnCommitCallbacks(execute=True):
+                make_tx(user=self.user, account=self.account, category=self.food)
+                make_tx(user=self.user, account=self.account, category=self.food)
+            # 2회 쓴 새 가맹점이 1회 쓴 '스타필드' 대신 들어감
+            self.assertEqual(self.names("테스트"), ["테스트가맹점"])
+            self.assertEqual(self.names("스타필"), [])
+
+    def test_changes_reach_other_workers_cache(self):
+        # 프로세스마다 따로 있는 캐시(LocMemCache)를 가진 다른 워커
+        other_worker = LocMemCache("other-worker", {})
+        with mock.patch("apps.transactions.merchants.cache", other_worker):
+            self.assertEqual(self.names("스타필"), ["스타필드"])
+
+        tx = Transaction.objects.get(user=self.user, merchant="스타필드")
+        with self.captureOnCommitCallbacks(execute=True):
+            tx.merchant = "스타필드 하남"
+            tx.save()
+            make_tx(user=self.user, account=self.account, category=self.food)
+        with mock.patch("apps.transactions.merchants.cache", other_worker):
+            self.assertEqual(self.names("스타필"), ["스타필드 하남"])
+            self.assertEqual(self.names("테스트"), ["테스트가맹점"])
+
+    def test_concurrent_new_transactions_are_not_lost(self):
+        get_merchant_index(self.user.pk)
+        # 두 요청이 각각 거래를 추가하고, 나중에 커밋한 요청의 처리가 먼저 실행됨
+        with self.captureOnCommitCallbacks() as first:
+            make_tx(user=self.user, account=self.account, category=self.food)
+        with self.captureOnCommitCallbacks() as second:
+            make_tx(user=self.user, account=self.account, category=self.food)
+        for callback in second + first:
+            callback()
+        self.assertEqual(suggest_merchants(self.user.pk, "테스트")[0]["count"], 2)
+
+    def test_api_returns_own_merchants_with_category_name(self):
+        self.client.login(username="u1", password="pass1234!")
+        resp = self.client.get(reverse("merchant_suggestions"), {"q": "스타벅"})
+        self.assertEqual(resp.json(), [
+            {"merchant": "스타벅스 강남점", "count": 4, "category_id": self.cafe.pk, "category": "카페"},
+        ])
+        self.assertIn("private", resp["Cache-Control"])
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from urllib.parse import parse_qs
+
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import make_user, make_account, make_trip, make_category, make_tx
+
+
+class TransactionKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1", password="pass1234!")
+        self.account = make_account(self.user)
+        self.category = make_category("식비")
+        base = datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc)
+        # 45건, 일부는 같은 시각(동률)이 되도록 생성
+        self.txs = [
+            make_tx(
+                user=self.user, account=self.account, category=self.category,
+                amount=Decimal(1000 + i), occurred_at=base + timedelta(hours=i // 2),
+            )
+            for i in range(45)
+        ]
+        self.client.login(username="u1", password="pass1234!")
+        self.url = reverse("transaction_list")
+
+    def expected_order(self):
+        return sorted(self.txs, key=lambda t: (t.occurred_at, t.id), reverse=True)
+
+    def cursor_from(self, query):
+        return parse_qs(query)["cursor"][0]
+
+    def test_pages_cover_all_rows_in_order_without_count(self):
+        seen = []
+        params = {}
+        while True:
+            resp = self.client.get(self.url, params)
+            self.assertEqual(resp.status_code, 200)
+            self.assertIsNone(resp.context["paginator"].count)
+            seen.extend(resp.context["transactions"])
+            if not resp.context["next_page_query"]:
+                break
+            params = {"cursor": self.cursor_from(resp.context["next_page_query"])}
+        self.assertEqual(seen, self.expected_order())
+
+    def test_previous_link_returns_same_page(self):
+        first = self.client.get(self.url)
+        cursor = self.cursor_from(first.context["next_page_query"])
+        second = self.client.get(self.url, {"cursor": cursor})
+        back = self.client.get(
+            self.url, {"cursor": self.cursor_from(second.context["previous_page_query"])}
+        )
+        self.assertEqual(list(back.context["transactions"]), list(first.context["transactions"]))
+        self.assertIsNone(back.context["previous_page_query"])
+
+    def test_next_page_is_stable_under_concurrent_insert(self):
+        first = self.client.get(self.url)
+        cursor = self.cursor_from(first.context["next_page_query"])
+        expected = list(self.client.get(self.url, {"cursor": cursor}).context["transactions"])
+
+        # 가장 최신 거래가 새로 추가되어도 다음 페이지 내용은 밀리지 않음
+        make_tx(
+            user=self.user, account=self.account, category=self.category,
+            occurred_at=datetime(2026, 3, 1, tzinfo=timezone.utc),
+        )
+        resp = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual(list(resp.context["transactions"]), expected)
+
+    def test_cursor_keeps_filters(self):
+        trip = make_trip(self.user)
+        for tx in self.txs[:25]:
+            tx.trip = trip
+            tx.save()
+        resp = self.client.get(self.url, {"trip": trip.id})
+        self.assertIn(f"trip={trip.id}", resp.context["next_page_query"])
+        resp = self.client.get(self.url + "?" + resp.context["next_page_query"])
+        self.assertEqual(len(resp.context["transactions"]), 5)
+        self.assertIsNone(resp.context["next_page_query"])
+
+    def test_page_number_falls_back_to_offset_pagination(self):
+        resp = self.client.get(self.url, {"page": 2})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["paginator"].count, 45)
+        self.assertEqual(list(resp.context["transactions"]), self.expected_order()[20:40])
+
+    def test_page_number_links_render(self):
+        resp = self.client.get(self.url, {"category": self.category.id, "page": 2})
+        self.assertEqual(resp.context["previous_page_query"], f"category={self.category.id}&page=1")
+        self.assertEqual(resp.context["next_page_query"], f"category={self.category.id}&page=3")
+        self.assertContains(resp, f'href="?category={self.category.id}&amp;page=1"')
+        self.assertContains(resp, f'href="?category={self.category.id}&amp;page=3"')
+
+        resp = self.client.get(self.url, {"page": 3})
+        self.assertEqual(len(resp.context["transactions"]), 5)
+        self.assertIsNone(resp.context["next_page_query"])
+        self.assertContains(resp, 'href="?page=2"')
+
+    def test_invalid_cursor_returns_404(self):
+        resp = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(resp.status_code, 404)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from apps.transactions.models import Receipt, ReceiptBlob
+from apps.transactions.receipts import attach_receipt, claim_blob, collect_garbage, process_blob, process_pending
+from .utils import make_user, make_account, make_category, make_tx
+
+
+def make_image(fmt="JPEG", size=(3000, 1500), mode="RGB", orientation=None):
+    image = Image.new(mode, size, "red" if mode == "RGB" else (255, 0, 0, 128))
+    buffer = io.BytesIO()
+    if orientation is not None:
+        exif = Image.Exif()
+        exif[0x0112] = orientation  # Orientation
+        exif[0x010F] = "PhoneMaker"  # Make
+        image.save(buffer, fmt, exif=exif)
+    else:
+        image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+@override_settings(
+    RECEIPT_PROCESS_IN_BACKGROUND=False,
+    RECEIPT_MAX_DIMENSION=1000,
+    RECEIPT_PREVIEW_DIMENSION=400,
+    RECEIPT_THUMBNAIL_DIMENSION=100,
+)
+class ReceiptProcessingTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        user = make_user("u1")
+        self.tx = make_tx(user=user, account=make_account(user), category=make_category())
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def make_receipt(self, name, content, tx=None):
+        return attach_receipt(tx or self.tx, SimpleUploadedFile(name, content))
+
+    def test_downscales_strips_exif_and_fixes_orientation(self):
+        # Orientation 6 = 90도 회전해서 봐야 하는 사진
+        receipt = self.make_receipt("photo.jpg", make_image(orientation=6))
+        original_name = receipt.file.name
+
+        self.assertEqual(process_blob(receipt.blob_id), "done")
+
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.blob.status, "done")
+        with receipt.file.open("rb") as f:
+            image = Image.open(f)
+            self.assertEqual(image.size, (500, 1000))
+            self.assertEqual(len(image.getexif()), 0)
+        with receipt.preview.open("rb") as f:
+            self.assertEqual(max(Image.open(f).size), 400)
+        with receipt.thumbnail.open("rb") as f:
+            self.assertEqual(max(Image.open(f).size), 100)
+        # JPEG 원본은 같은 이름으로 교체됨
+        self.assertEqual(receipt.file.name, original_name)
+
+    def test_png_with_alpha_is_converted_to_jpeg(self):
+        receipt = self.make_receipt("scan.png", make_image("PNG", size=(200, 100), mode="RGBA"))
+        original_name = receipt.file.name
+
+        process_blob(receipt.blob_id)
+
+        receipt.refresh_from_db()
+        self.assertTrue(receipt.file.name.endswith(".jpg"))
+        self.assertFalse(receipt.file.storage.exists(original_name))
+        with receipt.file.open("rb") as f:
+            image = Image.open(f)
+            self.assertEqual((image.format, image.size), ("JPEG", (200, 100)))
+
+    def test_pdf_and_broken_images_are_not_processed(self):
+        pdf = self.make_receipt("bill.pdf", b"%PDF-1.4 fake")
+        broken = self.make_receipt("broken.jpg", b"fakejpgcontent")
+
+        with self.assertLogs("apps.transactions.receipts", "WARNING"):
+            self.assertEqual(process_pending(), {"skipped": 1, "failed": 1})
+
+        pdf.refresh_from_db()
+        broken.refresh_from_db()
+        self.assertEqual((pdf.blob.status, broken.blob.status), ("skipped", "failed"))
+        self.assertFalse(broken.thumbnail)
+
+    def test_new_file_is_scheduled_after_commit_once(self):
+        content = make_image(size=(50, 50))
+        with override_settings(RECEIPT_PROCESS_IN_BACKGROUND=True):
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.make_receipt("photo.jpg", content)
+                self.make_receipt("again.jpg", content)
+        self.assertEqual(len(callbacks), 1)
+
+
+@override_settings(RECEIPT_PROCESS_IN_BACKGROUND=False)
+class ReceiptBlobTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        user = make_user("u1")
+        account = make_account(user)
+        category = make_category()
+        self.tx1 = make_tx(user=user, account=account, category=category)
+        self.tx2 = make_tx(user=user, account=account, category=category)
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def attach(self, tx, name, content):
+        return attach_receipt(tx, SimpleUploadedFile(name, content))
+
+    def test_identical_uploads_share_one_blob(self):
+        content = make_image(size=(40, 40))
+        first = self.attach(self.tx1, "a.jpg", content)
+        second = self.attach(self.tx2, "b.jpg", content)
+        other = self.attach(self.tx2, "c.jpg", make_image(size=(41, 41)))
+
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertNotEqual(first.blob_id, other.blob_id)
+        self.assertEqual(ReceiptBlob.objects.get(pk=first.blob_id).ref_count, 2)
+        self.assertEqual((first.original_name, second.original_name), ("a.jpg", "b.jpg"))
+        self.assertIn(first.blob.sha256, first.file.name)
+
+    def test_blob_is_deleted_with_its_last_receipt(self):
+        content = make_image(size=(40, 40))
+        first = self.attach(self.tx1, "a.jpg", content)
+        self.attach(self.tx2, "b.jpg", content)
+        blob = first.blob
+        storage = blob.file.storage
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(storage.exists(blob.file.name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tx2.delete()  # 거래 삭제 시 영수증도 CASCADE 삭제
+        self.assertFalse(ReceiptBlob.objects.filter(pk=blob.pk).exists())
+        self.assertFalse(storage.exists(blob.file.name))
+
+    def test_collect_garbage_repairs_counts_and_removes_orphans(self):
+        kept = self.attach(self.tx1, "a.jpg", make_image(size=(40, 40))).blob
+        orphan = self.attach(self.tx2, "b.jpg", make_image(size=(41, 41))).blob
+        Receipt.objects.filter(blob=orphan).update(blob=kept)
+        ReceiptBlob.objects.filter(pk=kept.pk).update(ref_count=5)
+
+        self.assertEqual(collect_garbage(grace=timedelta(0)), (2, 1))
+
+        kept.refresh_from_db()
+        self.assertEqual(kept.ref_count, 2)
+        self.assertFalse(ReceiptBlob.objects.filter(pk=orphan.pk).exists())
+        self.assertFalse(orphan.file.storage.exists(orphan.file.name))
+
+    def test_collect_garbage_removes_files_of_rolled_back_uploads(self):
+        kept = self.attach(self.tx1, "a.jpg", make_image(size=(40, 40))).blob
+        sid = transaction.savepoint()
+        stray = self.attach(self.tx2, "b.jpg", make_image(size=(41, 41))).blob
+        transaction.savepoint_rollback(sid)
+        storage = kept.file.storage
+        self.assertTrue(storage.exists(stray.file.name))
+
+        self.assertEqual(collect_garbage(grace=timedelta(hours=1)), (0, 0))
+        self.assertEqual(collect_garbage(grace=timedelta(0)), (0, 1))
+        self.assertFalse(storage.exists(stray.file.name))
+        self.assertTrue(storage.exists(kept.file.name))
+
+    def test_claimed_blob_is_processed_once(self):
+        blob = self.attach(self.tx1, "a.jpg", make_image(size=(40, 40))).blob
+        self.assertTrue(claim_blob(blob.pk))
+        self.assertFalse(claim_blob(blob.pk))
+        self.assertEqual(process_blob(blob.pk), "processing")
+        self.assertEqual(process_pending(), {})
+
+        # 처리하던 프로세스가 죽어 오래 멈춘 경우에는 다시 가져감
+        ReceiptBlob.objects.filter(pk=blob.pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(process_pending(), {"done": 1})
+
+
+@override_settings(RECEIPT_PROCESS_IN_BACKGROUND=False)
+class ReceiptFileViewTests(TestCase):
+    content = b"0123456789" * 100
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        self.user = make_user("u1")
+        make_user("u2")
+        tx = make_tx(user=self.user, account=make_account(self.user), category=make_category())
+        self.receipt = attach_receipt(tx, SimpleUploadedFile("bill.pdf", self.content))
+        self.url = reverse("receipt_file", kwargs={"pk": self.receipt.pk})
+        self.client.login(username="u1", password="pass1234!")
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_owner_gets_file_with_cache_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Content-Length"], str(len(self.content)))
+        self.assertIn('filename="bill.pdf"', response["Content-Disposition"])
+        self.assertTrue(response["ETag"])
+        self.assertTrue(response["Last-Modified"])
+        self.assertTrue(response["Cache-Control"].startswith("private"))
+
+    def test_other_user_gets_404(self):
+        self.client.login(username="u2", password="pass1234!")
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_conditional_get_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.content)}")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5000-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+        # 올바르지 않은 구간(끝 < 시작)은 무시하고 전체 응답
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5-3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+
+        # If-Range가 현재 버전과 다르면 전체 응답
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_variant_falls_back_to_original(self):
+        url = reverse("receipt_file_variant", kwargs={"pk": self.receipt.pk, "variant": "thumbnail"})
+        self.assertEqual(self.client.get(url).status_code, 200)
+        url = reverse("receipt_file_variant", kwargs={"pk": self.receipt.pk, "variant": "huge"})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    @override_settings(PROTECTED_MEDIA_SENDFILE="x-accel-redirect", PROTECTED_MEDIA_ACCEL_PREFIX="/protected/")
+    def test_x_accel_redirect_mode(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected/" + self.receipt.file.name)
+        self.assertEqual(response.content, b"")
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.transactions.models import Transaction
+from apps.transactions.search import rank_transactions, search_backend, search_transactions
+from .utils import make_user, make_account, make_trip, make_category, make_tx, make_transactions
+
+
+def make_search_tx(user, account, category, merchant, memo="", **kwargs):
+    tx = make_tx(user=user, account=account, category=category, **kwargs)
+    Transaction.objects.filter(pk=tx.pk).update(merchant=merchant, memo=memo)
+    tx.refresh_from_db()
+    return tx
+
+
+class TransactionSearchTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1", password="pass1234!")
+        self.other = make_user("u2")
+        self.account = make_account(self.user)
+        self.trip = make_trip(self.user)
+        self.food = make_category("식비")
+        self.starbucks = make_search_tx(
+            self.user, self.account, self.food, "스타벅스강남점", memo="아이스 아메리카노", trip=self.trip,
+            occurred_at=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        )
+        self.cafe = make_search_tx(
+            self.user, self.account, self.food, "동네 카페", memo="스타벅스 기프티콘 사용",
+            occurred_at=datetime(2026, 2, 3, tzinfo=timezone.utc),
+        )
+        self.taxi = make_search_tx(self.user, self.account, self.food, "Kakao T", memo="공항 택시")
+        self.others = make_search_tx(self.other, make_account(self.other), self.food, "스타벅스역삼점")
+
+    def search(self, query, queryset=None):
+        return set(search_transactions(queryset or Transaction.objects.all(), query))
+
+    def test_uses_sqlite_index(self):
+        self.assertEqual(search_backend("default"), "sqlite")
+
+    def test_matches_substring_in_merchant_and_memo(self):
+        self.assertEqual(self.search("스타벅스"), {self.starbucks, self.cafe, self.others})
+        self.assertEqual(self.search("강남점"), {self.starbucks})
+        self.assertEqual(self.search("kakao"), {self.taxi})
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search("스타벅스 아메리카노"), {self.starbucks})
+        self.assertEqual(self.search("스타벅스 택시"), set())
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(self.search("공항"), {self.taxi})
+        self.assertEqual(self.search("스타벅스 카페"), {self.cafe})
+
+    def test_index_follows_update_delete_and_bulk_create(self):
+        self.taxi.merchant = "우버택시"
+        self.taxi.save()
+        self.assertEqual(self.search("우버택"), {self.taxi})
+        self.assertEqual(self.search("Kakao"), set())
+
+        self.cafe.delete()
+        self.assertEqual(self.search("기프티콘"), set())
+
+        make_transactions(user=self.user, account=self.account, categories=[self.food], count=3)
+        self.assertEqual(len(self.search("가맹점1")), 1)
+
+    def test_rank_orders_by_relevance(self):
+        queryset = rank_transactions(Transaction.objects.filter(user=self.user), "스타벅스강남점")
+        self.assertEqual(list(queryset)[0], self.starbucks)
+        # 거래마다 검색 테이블을 다시 조회하지 않고 한 번 조인
+        self.assertEqual(str(queryset.query).count("MATCH"), 1)
+
+    def test_list_view_combines_search_with_filters(self):
+        self.client.login(username="u1", password="pass1234!")
+        url = reverse("transaction_list")
+        resp = self.client.get(url, {"q": "스타벅스"})
+        self.assertEqual(list(resp.context["transactions"]), [self.cafe, self.starbucks])
+        self.assertEqual(resp.context["summary"]["transaction_count"], 2)
+        self.assertIn("q=", resp.context["export_query"])
+
+        resp = self.client.get(url, {"q": "스타벅스", "trip": self.trip.pk})
+        self.assertEqual(list(resp.context["transactions"]), [self.starbucks])
+
+    def test_list_view_relevance_sort_uses_page_numbers(self):
+        make_transactions(user=self.user, account=self.account, categories=[self.food], count=45)
+        self.client.login(username="u1", password="pass1234!")
+        resp = self.client.get(reverse("transaction_list"), {"q": "가맹점", "sort": "relevance"})
+        self.assertEqual(len(resp.context["transactions"]), 20)
+        self.assertIn("page=2", resp.context["next_page_query"])
+        self.assertIsNone(resp.context["previous_page_query"])
+
+        resp = self.client.get(reverse("transaction_list") + "?" + resp.context["next_page_query"])
+        self.assertEqual(resp.context["page_obj"].number, 2)
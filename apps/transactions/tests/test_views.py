@@ -3,8 +3,11 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from decimal import Decimal
 
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from apps.transactions.models import Receipt, Transaction
@@ -107,4 +110,54 @@ class TransactionViewTests(TestCase):
         url = reverse("transaction_delete", kwargs={"pk": self.t1.pk})
         resp = self.client.post(url)
         self.assertEqual(resp.status_code, 302)
-        self.assertFalse(Transaction.objects.filter(pk=self.t1.pk).exists())
\ No newline at end of file
+        self.assertFalse(Transaction.objects.filter(pk=self.t1.pk).exists())
+
+class TransactionListSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user("u1", password="pass1234!")
+        self.account = make_account(self.user)
+        self.trip = make_trip(self.user)
+        self.food = make_category("식비")
+        self.salary = make_category("급여")
+        for i in range(25):
+            make_tx(
+                user=self.user, account=self.account, category=self.food,
+                amount=Decimal("1000"), trip=self.trip,
+                occurred_at=datetime(2026, 2, 1, 12, i, tzinfo=timezone.utc),
+            )
+        make_tx(
+            user=self.user, account=self.account, category=self.salary,
+            tx_type="income", amount=Decimal("50000"),
+        )
+        self.client.login(username="u1", password="pass1234!")
+        self.url = reverse("transaction_list")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_summary_covers_whole_filtered_set_not_just_page(self):
+        resp = self.client.get(self.url, {"trip": self.trip.id})
+        summary = resp.context["summary"]
+        self.assertEqual(len(resp.context["transactions"]), 20)
+        self.assertEqual(summary["transaction_count"], 25)
+        self.assertEqual(summary["total_expense"], Decimal("25000"))
+        self.assertEqual(summary["total_income"], 0)
+        self.assertEqual(summary["categories"][0]["category__name"], "식비")
+
+    def test_summary_is_cached_across_pages(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.context["summary"]["net_amount"], Decimal("25000"))
+        cursor = first.context["next_page_query"]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url + "?" + cursor)
+        self.assertFalse(any("SUM(" in q["sql"] for q in queries.captured_queries))
+
+    def test_summary_cache_invalidated_by_new_transaction(self):
+        self.client.get(self.url)
+        make_tx(
+            user=self.user, account=self.account, category=self.food,
+            amount=Decimal("5000"),
+        )
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.context["summary"]["total_expense"], Decimal("30000"))
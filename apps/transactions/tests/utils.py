@@ -86,3 +86,42 @@ def make_tx(
         merchant="테스트가맹점",
         memo="",
     )
+
+
+def make_transactions(
+    *,
+    user,
+    account,
+    categories,
+    count: int,
+    trips=(),
+    start: Optional[datetime] = None,
+    batch_size: int = 5000,
+):
+    """
+    거래 count건을 bulk_create로 빠르게 생성 (벤치마크/대량 데이터용).
+    카테고리/여행은 순서대로 돌려 쓰고, 10건마다 1건은 수입, 시각은 1시간씩 과거로.
+    post_save 대신 transactions_bulk_created를 보내 집계/캐시가 일반 등록과 같게 갱신됩니다.
+    """
+    from apps.transactions.signals import transactions_bulk_created
+
+    if start is None:
+        start = datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc)
+    categories, trips = list(categories), list(trips)
+    for offset in range(0, count, batch_size):
+        batch = [
+            Transaction(
+                user=user,
+                account=account,
+                trip=trips[i % len(trips)] if trips else None,
+                category=categories[i % len(categories)],
+                transaction_type="income" if i % 10 == 0 else "expense",
+                amount=Decimal(1000 + i % 97 * 100),
+                occurred_at=start - timedelta(hours=i),
+                merchant=f"가맹점{i % 500}",
+                memo="",
+            )
+            for i in range(offset, min(offset + batch_size, count))
+        ]
+        created = Transaction.objects.bulk_create(batch)
+        transactions_bulk_created.send(sender=Transaction, transactions=created)
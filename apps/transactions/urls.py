@@ -6,7 +6,12 @@ from . import views
 urlpatterns = [
     path('', views.TransactionListView.as_view(), name='transaction_list'),
     path('create/', views.TransactionCreateView.as_view(), name='transaction_create'),
+    path('import/', views.TransactionImportView.as_view(), name='transaction_import'),
+    path('export/', views.TransactionExportView.as_view(), name='transaction_export'),
+    path('api/merchants/', views.MerchantSuggestionView.as_view(), name='merchant_suggestions'),
     path('<int:pk>/', views.TransactionDetailView.as_view(), name='transaction_detail'),
     path('<int:pk>/edit/', views.TransactionUpdateView.as_view(), name='transaction_update'),
     path('<int:pk>/delete/', views.TransactionDeleteView.as_view(), name='transaction_delete'),
+    path('receipts/<int:pk>/', views.ReceiptFileView.as_view(), name='receipt_file'),
+    path('receipts/<int:pk>/<str:variant>/', views.ReceiptFileView.as_view(), name='receipt_file_variant'),
 ]
@@ -1,59 +1,173 @@
-from django.shortcuts import render, redirect
+import hashlib
+from urllib.parse import urlencode
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.generic import View, ListView, DetailView, CreateView, UpdateView, DeleteView, FormView
+from django.views.generic.list import MultipleObjectMixin
 from django.urls import reverse_lazy
 from django.db.models import Q
-from core.mixins import UserOwnershipMixin
+from core.aggregates import summarize
+from core.http import serve_file
+from core.mixins import AtomicWriteMixin, ConditionalGetMixin, UserOwnershipMixin
+from core.pagination import KeysetPaginationMixin
+from core.versioning import cached_for_user
 from .models import Transaction, Receipt
-from .forms import TransactionForm, TransactionFilterForm
+from .forms import TransactionForm, TransactionFilterForm, TransactionImportForm
+from .importers import TransactionImporter, detect_format
+from .exporters import EXPORT_FORMATS
+from .merchants import suggest_merchants
+from .receipts import attach_receipt
+from .refdata import categories
+from .search import rank_transactions, search_transactions
 
-class TransactionListView(UserOwnershipMixin, ListView):
-    """거래 목록 뷰"""
+class TransactionFilterMixin:
+    """거래 목록/내보내기 공통 필터 (trip, category, transaction_type, 기간, 가맹점/메모 검색어)"""
+    filter_fields = ('trip', 'category', 'transaction_type', 'start_date', 'end_date', 'q')
+    max_query_length = 100
+    
+    def get_filter_params(self):
+        """필터 파라미터 정규화: 값이 있는 필터만, 키 순서 고정 (커서/페이지 번호 제외)"""
+        return {
+            field: self.request.GET[field].strip()
+            for field in sorted(self.filter_fields)
+            if self.request.GET.get(field, '').strip()
+        }
+    
+    def filter_queryset(self, queryset):
+        params = self.get_filter_params()
+        
+        if 'trip' in params:
+            queryset = queryset.filter(trip_id=params['trip'])
+        
+        if 'category' in params:
+            queryset = queryset.filter(category_id=params['category'])
+        
+        if 'transaction_type' in params:
+            queryset = queryset.filter(transaction_type=params['transaction_type'])
+        
+        if 'start_date' in params:
+            queryset = queryset.filter(occurred_at__date__gte=params['start_date'])
+        
+        if 'end_date' in params:
+            queryset = queryset.filter(occurred_at__date__lte=params['end_date'])
+        
+        if 'q' in params:
+            queryset = search_transactions(queryset, params['q'][:self.max_query_length])
+        
+        return queryset
+
+class TransactionListView(UserOwnershipMixin, ConditionalGetMixin, TransactionFilterMixin, KeysetPaginationMixin, ListView):
+    """거래 목록 뷰 (occurred_at, id 기준 커서 페이지네이션)"""
     model = Transaction
     template_name = 'transactions/transaction_list.html'
     context_object_name = 'transactions'
     paginate_by = 20
+    summary_cache_timeout = 60 * 60
     
     def get_queryset(self):
-        queryset = super().get_queryset().select_related(
+        queryset = self.filter_queryset(super().get_queryset()).select_related(
             'account', 'trip', 'category'
-        ).prefetch_related('receipts')
-        
-        category = self.request.GET.get('category')
-        transaction_type = self.request.GET.get('transaction_type')
-        start_date = self.request.GET.get('start_date')
-        end_date = self.request.GET.get('end_date')
-        trip_id = self.request.GET.get('trip')#추가하였음
-        if trip_id:                           #추가하였음
-            queryset = queryset.filter(trip_id=trip_id) #추가하였음
-        if category:
-            queryset = queryset.filter(category_id=category)
-        
-        if transaction_type:
-            queryset = queryset.filter(transaction_type=transaction_type)
-        
-        if start_date:
-            queryset = queryset.filter(occurred_at__date__gte=start_date)
-        
-        if end_date:
-            queryset = queryset.filter(occurred_at__date__lte=end_date)
-        
+        ).prefetch_related('receipts__blob')
+        if self.sort_by_relevance():
+            queryset = rank_transactions(queryset, self.get_filter_params()['q'])
         return queryset
     
+    def sort_by_relevance(self):
+        return self.request.GET.get('sort') == 'relevance' and 'q' in self.get_filter_params()
+    
+    def paginate_queryset(self, queryset, page_size):
+        if not self.sort_by_relevance():
+            return super().paginate_queryset(queryset, page_size)
+        # 관련도 순은 (occurred_at, id) 커서로 이어 갈 수 없으므로 페이지 번호 방식
+        return MultipleObjectMixin.paginate_queryset(self, queryset, page_size)
+    
+    def get_summary(self):
+        """
+        필터된 전체 거래의 입금/출금/순액/건수 및 카테고리별 합계.
+        (사용자, 정규화된 필터, 데이터 버전) 단위로 캐시하므로
+        같은 필터로 페이지를 넘길 때는 다시 계산하지 않습니다.
+        """
+        queryset = self.filter_queryset(super().get_queryset())
+        user = self.request.user
+        if user.is_superuser:
+            # 전체 사용자 데이터를 보므로 한 사용자의 버전으로는 무효화할 수 없음
+            return summarize(queryset, by_category=True)
+        
+        signature = hashlib.md5(urlencode(self.get_filter_params()).encode()).hexdigest()
+        return cached_for_user(
+            user.pk, 'transactions:summary', signature,
+            lambda: summarize(queryset, by_category=True), timeout=self.summary_cache_timeout,
+            version=self.data_version, references=('transactions.category',),
+        )
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # context['filter_form'] = TransactionFilterForm(self.request.GET)
         context['filter_form'] = TransactionFilterForm(self.request.GET, user=self.request.user)
-        context['total_amount'] = sum(t.amount for t in context['transactions'])
+        context['summary'] = self.get_summary()
+        context['export_query'] = urlencode(self.get_filter_params())
         return context
 
+class TransactionExportView(UserOwnershipMixin, TransactionFilterMixin, MultipleObjectMixin, View):
+    """필터된 거래 내역 내보내기 (CSV/XLSX 스트리밍)"""
+    model = Transaction
+    
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            raise Http404('지원하지 않는 형식입니다.')
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        content_type, stream = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+        filename = f"transactions_{timezone.localdate():%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
 class TransactionDetailView(UserOwnershipMixin, DetailView):
     """거래 상세 뷰"""
     model = Transaction
     template_name = 'transactions/transaction_detail.html'
     context_object_name = 'transaction'
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'account', 'trip', 'category'
+        ).prefetch_related('receipts__blob')
 
-class TransactionCreateView(UserOwnershipMixin, CreateView):
+class ReceiptFileView(LoginRequiredMixin, View):
+    """
+    영수증 파일 전송 (본인 거래의 영수증만).
+    variant: original(기본) / preview / thumbnail - 아직 처리되지 않았으면 원본을 보냅니다.
+    """
+    variants = ('original', 'preview', 'thumbnail')
+    cache_max_age = 60 * 60 * 24
+    
+    def get(self, request, pk, variant='original'):
+        if variant not in self.variants:
+            raise Http404('잘못된 파일 종류입니다.')
+        receipts = Receipt.objects.select_related('blob')
+        if not request.user.is_superuser:
+            receipts = receipts.filter(transaction__user=request.user)
+        receipt = get_object_or_404(receipts, pk=pk)
+        
+        blob = receipt.blob
+        field_file = blob.file if variant == 'original' else getattr(blob, variant) or blob.file
+        # 처리 전에는 파일이 바뀔 수 있으므로 매번 재검증
+        if blob.status in ('pending', 'processing'):
+            cache_control = 'private, no-cache'
+        else:
+            cache_control = f'private, max-age={self.cache_max_age}'
+        try:
+            return serve_file(request, field_file, filename=receipt.original_name, cache_control=cache_control)
+        except FileNotFoundError:
+            raise Http404('파일을 찾을 수 없습니다.')
+
+class TransactionCreateView(UserOwnershipMixin, AtomicWriteMixin, CreateView):
     """거래 생성 뷰"""
     model = Transaction
     form_class = TransactionForm
@@ -69,17 +183,14 @@ class TransactionCreateView(UserOwnershipMixin, CreateView):
         form.instance.user = self.request.user
         response = super().form_valid(form)
         
-        receipt_file = self.request.FILES.get('receipt')
+        receipt_file = form.cleaned_data.get('receipt')
         if receipt_file:
-            Receipt.objects.create(
-                transaction=self.object,
-                file=receipt_file
-            )
+            attach_receipt(self.object, receipt_file)
         
         messages.success(self.request, '거래가 등록되었습니다.')
         return response
 
-class TransactionUpdateView(UserOwnershipMixin, UpdateView):
+class TransactionUpdateView(UserOwnershipMixin, AtomicWriteMixin, UpdateView):
     """거래 수정 뷰"""
     model = Transaction
     form_class = TransactionForm
@@ -92,17 +203,14 @@ class TransactionUpdateView(UserOwnershipMixin, UpdateView):
         return kwargs
     
     def form_valid(self, form):
-        receipt_file = self.request.FILES.get('receipt')
+        receipt_file = form.cleaned_data.get('receipt')
         if receipt_file:
-            Receipt.objects.create(
-                transaction=self.object,
-                file=receipt_file
-            )
+            attach_receipt(self.object, receipt_file)
         
         messages.success(self.request, '거래 정보가 수정되었습니다.')
         return super().form_valid(form)
 
-class TransactionDeleteView(UserOwnershipMixin, DeleteView):
+class TransactionDeleteView(UserOwnershipMixin, AtomicWriteMixin, DeleteView):
     """거래 삭제 뷰"""
     model = Transaction
     template_name = 'transactions/transaction_confirm_delete.html'
@@ -111,3 +219,47 @@ class TransactionDeleteView(UserOwnershipMixin, DeleteView):
     def delete(self, request, *args, **kwargs):
         messages.success(request, '거래가 삭제되었습니다.')
         return super().delete(request, *args, **kwargs)
+
+class MerchantSuggestionView(LoginRequiredMixin, View):
+    """
+    가맹점 자동완성 (AJAX용): ?q=접두어
+    사용자가 많이 쓴 가맹점과 그 가맹점에 주로 쓴 카테고리를 반환합니다. (캐시된 가맹점 목록에서 찾음)
+    """
+    max_query_length = 100
+    
+    def get(self, request):
+        suggestions = suggest_merchants(request.user.pk, request.GET.get('q', '')[:self.max_query_length])
+        for suggestion in suggestions:
+            category = categories.get(suggestion['category_id'])
+            suggestion['category'] = category.name if category else ''
+        response = JsonResponse(suggestions, safe=False, json_dumps_params={'ensure_ascii': False})
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+class TransactionImportView(LoginRequiredMixin, FormView):
+    """거래내역 파일 가져오기 뷰"""
+    form_class = TransactionImportForm
+    template_name = 'transactions/transaction_import.html'
+    
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['user'] = self.request.user
+        return kwargs
+    
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        importer = TransactionImporter(
+            self.request.user,
+            account=form.cleaned_data['account'],
+            trip=form.cleaned_data['trip'],
+        )
+        result = importer.run(upload.file, detect_format(upload.name))
+        
+        if result.created:
+            messages.success(self.request, f'거래 {result.created}건을 가져왔습니다.')
+        if result.error_count:
+            messages.warning(self.request, f'{result.error_count}개 행은 오류로 건너뛰었습니다.')
+        if not result.error_count:
+            return redirect('transaction_list')
+        # 오류가 있으면 행별 오류 목록을 보여줌
+        return self.render_to_response(self.get_context_data(form=form, result=result))
@@ -4,3 +4,7 @@ class TripsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.trips'
     verbose_name = '여행 관리'
+
+    def ready(self):
+        from . import cities, refdata, search  # noqa: F401 (국가/도시 변경 시 참조 데이터/검색 인덱스 갱신)
+        from . import signals  # noqa: F401 (여행 변경 시 데이터 버전 갱신)
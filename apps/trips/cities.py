@@ -0,0 +1,54 @@
+"""
+국가별 도시 목록 번들.
+
+도시 테이블 전체를 폼에 렌더링하지 않고, 선택된 국가의 도시만 캐시에서 꺼내 씁니다.
+번들은 (국가, 도시 데이터 버전) 단위로 캐시되며, 도시가 저장/삭제되면 같은 트랜잭션에서
+DB의 참조 데이터 버전(core.versioning)이 올라갑니다.
+"""
+import hashlib
+import json
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core import metrics
+from core.fixtures import fixture_loaded
+from core.versioning import bump_reference_version, get_reference_version
+from .models import City
+
+CITIES_VERSION_NAME = 'trips.city'
+CITY_BUNDLE_KEY = 'trips:cities:{country_id}:{version}'
+CITY_BUNDLE_TIMEOUT = 60 * 60 * 24
+
+
+def cities_version():
+    return get_reference_version(CITIES_VERSION_NAME)
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(fixture_loaded, sender=City)
+def invalidate_city_bundles(sender, **kwargs):
+    bump_reference_version(CITIES_VERSION_NAME)
+
+
+def get_city_bundle(country_id):
+    """
+    국가의 도시 목록 번들.
+    반환: {'cities': [(id, 이름), ...], 'body': JSON 바이트, 'etag': 내용 해시}
+    """
+    key = CITY_BUNDLE_KEY.format(country_id=country_id, version=cities_version())
+    bundle = cache.get(key)
+    metrics.record_cache('trips:cities', bundle is not None)
+    if bundle is None:
+        cities = list(City.objects.filter(country_id=country_id).order_by('name').values_list('id', 'name'))
+        body = json.dumps(
+            [{'id': pk, 'name': name} for pk, name in cities], ensure_ascii=False
+        ).encode()
+        bundle = {
+            'cities': cities,
+            'body': body,
+            # 내용 기준이므로 다른 국가의 변경으로 버전이 올라도 ETag는 그대로
+            'etag': '"%s"' % hashlib.md5(body).hexdigest(),
+        }
+        cache.set(key, bundle, CITY_BUNDLE_TIMEOUT)
+    return bundle
@@ -1,11 +1,47 @@
 from django import forms
+from django.forms.models import ModelChoiceIterator
+from core.refdata import ReferenceChoiceField
+from . import refdata  # noqa: F401 (국가 참조 테이블 등록)
+from .cities import cities_version, get_city_bundle
 from .models import Trip, Country, City
 
-class TripForm(forms.ModelForm):
-    """여행 생성/수정 폼"""
+
+class CityChoiceIterator(ModelChoiceIterator):
+    """선택된 국가의 도시만 캐시된 번들에서 나열"""
+    
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from self.field.city_choices()
+    
+    def __len__(self):
+        return len(self.field.city_choices()) + (self.field.empty_label is not None)
+
+
+class CityChoiceField(forms.ModelChoiceField):
+    """
+    국가에 속한 도시만 선택지로 렌더링하는 필드.
+    country_id가 없으면 선택지가 비어 있고, 나머지 국가의 도시는 화면에서 필요할 때 불러옵니다.
+    """
+    iterator = CityChoiceIterator
+    
+    def __init__(self, queryset, *args, **kwargs):
+        self.country_id = None
+        super().__init__(queryset, *args, **kwargs)
     
-    # Country 선택 후 → 해당 국가의 City만 보이도록 (JavaScript 필요)
-    # 일단은 모든 Country, City를 보여주는 방식으로 구현
+    def set_country(self, country_id):
+        self.country_id = country_id
+        # 검증(to_python)도 선택된 국가의 도시로 제한
+        self.queryset = City.objects.filter(country_id=country_id)
+    
+    def city_choices(self):
+        if not self.country_id:
+            return []
+        return get_city_bundle(self.country_id)['cities']
+
+
+class TripForm(forms.ModelForm):
+    """여행 생성/수정 폼 (도시는 선택된 국가의 것만 렌더링)"""
     
     class Meta:
         model = Trip
@@ -18,6 +54,11 @@ class TripForm(forms.ModelForm):
             'end_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'memo': forms.Textarea(attrs={'class': 'form-control', 'rows': 4, 'placeholder': '여행 메모'}),
         }
+        # 국가는 참조 데이터 레지스트리, 도시는 국가별 캐시 번들에서 (렌더링 시 DB 조회 없음)
+        field_classes = {
+            'country': ReferenceChoiceField,
+            'city': CityChoiceField,
+        }
         labels = {
             'name': '여행명',
             'country': '국가',
@@ -27,6 +68,23 @@ class TripForm(forms.ModelForm):
             'memo': '메모',
         }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        city_field = self.fields['city']
+        city_field.set_country(self.selected_country_id())
+        city_field.widget.attrs['data-cities-version'] = cities_version()
+    
+    def selected_country_id(self):
+        """제출된 값 > 초기값 > 수정 중인 여행의 국가 순으로 선택된 국가"""
+        if self.is_bound:
+            value = self.data.get(self.add_prefix('country'))
+        else:
+            value = self.initial.get('country') or self.instance.country_id
+        try:
+            return int(getattr(value, 'pk', value))
+        except (TypeError, ValueError):
+            return None
+    
     def clean(self):
         cleaned_data = super().clean()
         start_date = cleaned_data.get('start_date')
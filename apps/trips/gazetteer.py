@@ -0,0 +1,125 @@
+"""
+지명 사전(gazetteer) 일괄 로더.
+
+파일을 한 줄씩 읽으며 batch_size 단위로 bulk_create(ignore_conflicts=True) 하므로
+수십만 건도 메모리 사용량이 일정하고, 이미 있는 (도시명, 국가) 조합은 건너뜁니다.
+
+지원 형식
+- geonames: GeoNames cities*.txt (탭 구분, 1=name, 8=country code, 14=population)
+  --country-info countryInfo.txt를 주면 국가 코드를 국가명으로 바꾸고, 없으면 코드를 그대로 국가명으로 사용
+- csv: 헤더가 있는 CSV (country/국가, city/name/도시, population/인구)
+"""
+import csv
+import io
+from django.db import transaction
+from core.utils import normalize_search_text
+from .cities import invalidate_city_bundles
+from .models import City, Country
+from .refdata import countries
+from .search import rebuild_search_index
+
+BATCH_SIZE = 5000
+NAME_MAX_LENGTH = 100
+
+CSV_COLUMNS = {
+    'country': ('country', '국가', '국가명'),
+    'city': ('city', 'name', '도시', '도시명'),
+    'population': ('population', '인구'),
+}
+
+
+def read_country_info(fileobj):
+    """GeoNames countryInfo.txt -> {ISO 코드: 국가명}"""
+    names = {}
+    for line in io.TextIOWrapper(fileobj, encoding='utf-8'):
+        if line.startswith('#') or not line.strip():
+            continue
+        fields = line.rstrip('\n').split('\t')
+        if len(fields) > 4:
+            names[fields[0]] = fields[4]
+    return names
+
+
+def parse_geonames(fileobj, country_names=None):
+    """(국가명, 도시명, 인구)를 하나씩 반환"""
+    country_names = country_names or {}
+    for line in io.TextIOWrapper(fileobj, encoding='utf-8', newline=''):
+        fields = line.rstrip('\n').split('\t')
+        if len(fields) < 15:
+            continue
+        code = fields[8]
+        population = int(fields[14]) if fields[14].isdigit() else 0
+        yield country_names.get(code, code), fields[1], population
+
+
+def parse_csv(fileobj):
+    reader = csv.reader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+    header = [name.strip().lower() for name in next(reader, [])]
+    columns = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for index, name in enumerate(header):
+            if name in aliases:
+                columns[field] = index
+                break
+    if not {'country', 'city'} <= columns.keys():
+        raise ValueError('country, city 열이 필요합니다.')
+    for values in reader:
+        if len(values) <= max(columns.values()):
+            continue
+        population = values[columns['population']].strip() if 'population' in columns else ''
+        yield values[columns['country']], values[columns['city']], int(population) if population.isdigit() else 0
+
+
+class GazetteerLoader:
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.country_ids = dict(Country.objects.values_list('name', 'id'))
+        self.read = 0
+        self.skipped = 0
+
+    def run(self, rows):
+        """도시 행을 일괄 등록하고 새로 시도한 행 수를 반환 (중복은 DB에서 무시)"""
+        batch = []
+        for country_name, city_name, population in rows:
+            self.read += 1
+            country_name = country_name.strip()[:NAME_MAX_LENGTH]
+            city_name = city_name.strip()[:NAME_MAX_LENGTH]
+            if not country_name or not city_name:
+                self.skipped += 1
+                continue
+            batch.append((country_name, city_name, population))
+            if len(batch) >= self.batch_size:
+                self.save(batch)
+                batch = []
+        if batch:
+            self.save(batch)
+
+        # bulk_create는 시그널을 보내지 않으므로 캐시/검색 인덱스를 직접 갱신
+        rebuild_search_index()
+        invalidate_city_bundles(sender=City)
+        countries.invalidate()
+        return self.read - self.skipped
+
+    def save(self, batch):
+        with transaction.atomic():
+            new_countries = {name for name, _, _ in batch} - self.country_ids.keys()
+            if new_countries:
+                Country.objects.bulk_create(
+                    [Country(name=name) for name in new_countries], ignore_conflicts=True
+                )
+                self.country_ids.update(
+                    Country.objects.filter(name__in=new_countries).values_list('name', 'id')
+                )
+            City.objects.bulk_create(
+                [
+                    City(
+                        name=city_name,
+                        country_id=self.country_ids[country_name],
+                        search_name=normalize_search_text(city_name),
+                        population=population,
+                    )
+                    for country_name, city_name, population in batch
+                ],
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
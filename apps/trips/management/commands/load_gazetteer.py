@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.trips.gazetteer import BATCH_SIZE, GazetteerLoader, parse_csv, parse_geonames, read_country_info
+from apps.trips.models import City, Country
+
+
+class Command(BaseCommand):
+    help = '지명 사전 파일(GeoNames/CSV)의 국가와 도시를 일괄 등록합니다. 이미 있는 도시는 건너뜁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='GeoNames cities*.txt 또는 CSV 파일 경로')
+        parser.add_argument('--format', choices=['geonames', 'csv'], help='파일 형식 (기본: 확장자로 판단)')
+        parser.add_argument('--country-info', help='GeoNames countryInfo.txt 경로 (국가 코드를 국가명으로 변환)')
+        parser.add_argument('--min-population', type=int, default=0, help='이 인구 미만의 도시는 제외')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'geonames')
+        country_names = None
+        if options['country_info']:
+            with open(options['country_info'], 'rb') as fileobj:
+                country_names = read_country_info(fileobj)
+
+        cities_before, countries_before = City.objects.count(), Country.objects.count()
+        loader = GazetteerLoader(batch_size=options['batch_size'])
+        started = time.monotonic()
+        with open(path, 'rb') as fileobj:
+            rows = parse_csv(fileobj) if file_format == 'csv' else parse_geonames(fileobj, country_names)
+            if options['min_population']:
+                rows = (row for row in rows if row[2] >= options['min_population'])
+            try:
+                loader.run(rows)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'국가 {Country.objects.count() - countries_before}개, '
+            f'도시 {City.objects.count() - cities_before}개 등록 '
+            f'({loader.read}행 읽음, {loader.skipped}행 제외, {elapsed:.1f}초)'
+        ))
@@ -0,0 +1,76 @@
+# Generated by Django 5.0 on 2026-10-18 17:39
+
+import logging
+import unicodedata
+from django.db import OperationalError, ProgrammingError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(value):
+    # core.utils.normalize_search_text와 같은 규칙 (마이그레이션 시점 고정)
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(unicodedata.normalize('NFC', stripped).casefold().split())
+
+
+def backfill_search_name(apps, schema_editor):
+    City = apps.get_model('trips', 'City')
+    cities = list(City.objects.only('id', 'name'))
+    for city in cities:
+        city.search_name = normalize(city.name)
+    City.objects.bulk_update(cities, ['search_name'], batch_size=1000)
+
+
+def create_trigram_index(apps, schema_editor):
+    """오타 허용 검색용 트라이그램 인덱스 (지원하지 않는 DB에서는 건너뜀)"""
+    vendor = schema_editor.connection.vendor
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            if vendor == 'postgresql':
+                schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                schema_editor.execute(
+                    'CREATE INDEX IF NOT EXISTS trips_city_search_trgm '
+                    'ON trips_city USING gin (search_name gin_trgm_ops)'
+                )
+            elif vendor == 'sqlite':
+                schema_editor.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS trips_city_search "
+                    "USING fts5(search_name, tokenize='trigram')"
+                )
+                schema_editor.execute(
+                    'INSERT INTO trips_city_search(rowid, search_name) SELECT id, search_name FROM trips_city'
+                )
+    except (OperationalError, ProgrammingError) as exc:
+        # pg_trgm 확장을 설치할 수 없거나(권한/패키지 없음) SQLite에 FTS5 trigram이 없는 경우 - 접두어 검색만 사용
+        logger.warning('도시 트라이그램 인덱스를 만들지 않음 (%s): %s', vendor, exc)
+
+
+def drop_trigram_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS trips_city_search_trgm')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS trips_city_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0002_city_country_alter_trip_city_city_country_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='city',
+            name='population',
+            field=models.PositiveIntegerField(default=0, verbose_name='인구'),
+        ),
+        migrations.AddField(
+            model_name='city',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100, verbose_name='검색용 이름'),
+        ),
+        migrations.RunPython(backfill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from core.utils import normalize_search_text
 
 class Country(models.Model):
     """국가 모델"""
@@ -17,6 +18,9 @@ class City(models.Model):
     """도시 모델"""
     name = models.CharField(max_length=100, verbose_name='도시명')
     country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name='cities')
+    # 자동완성용: 정규화된 이름(접두어 검색 인덱스)과 결과 정렬용 인구
+    search_name = models.CharField(max_length=100, db_index=True, editable=False, default='', verbose_name='검색용 이름')
+    population = models.PositiveIntegerField(default=0, verbose_name='인구')
     
     class Meta:
         verbose_name = '도시'
@@ -25,6 +29,13 @@ class City(models.Model):
     
     def __str__(self):
         return f"{self.name} ({self.country.name})"
+    
+    def save(self, *args, **kwargs):
+        self.search_name = normalize_search_text(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(*args, **kwargs)
 
 
 class Trip(models.Model):
@@ -0,0 +1,5 @@
+from core.refdata import ReferenceTable
+from .models import Country
+
+# 도시는 국가별 번들(cities.py)로 필요한 만큼만 읽음
+countries = ReferenceTable(Country, lambda: Country.objects.order_by('name'))
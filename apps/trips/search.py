@@ -0,0 +1,127 @@
+"""
+도시 이름 자동완성.
+
+1) 접두어: 정규화된 search_name__startswith (인구 많은 순)
+   - PostgreSQL: Django가 db_index CharField에 만드는 varchar_pattern_ops 인덱스(*_like)를 사용
+     (LIKE 'x%'는 DB 정렬 규칙과 관계없이 이 인덱스를 탐)
+   - SQLite: LIKE는 대소문자 무시라 인덱스를 못 타므로, 기본 BINARY 정렬(UTF-8 바이트 비교)에서
+     정확한 범위 조건을 함께 걸어 search_name 인덱스를 사용
+2) 오타 허용(3글자 이상, 접두어 결과가 부족할 때): 트라이그램 인덱스로 후보를 찾고 유사도로 정렬
+   - PostgreSQL: pg_trgm GIN 인덱스 (search_name % 검색어)
+   - SQLite: FTS5 trigram 테이블 trips_city_search (도시 저장/삭제 시그널과 bulk 로더가 갱신)
+   - 그 외/인덱스 없음: 접두어 검색만 사용
+"""
+import difflib
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.fixtures import fixture_loaded
+from core.utils import normalize_search_text
+from .models import City
+
+SQLITE_SEARCH_TABLE = 'trips_city_search'
+FUZZY_MIN_LENGTH = 3
+FUZZY_CANDIDATES = 50
+
+
+def _trigrams(term):
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def fuzzy_candidate_ids(term, limit=FUZZY_CANDIDATES):
+    """트라이그램이 많이 겹치는 도시 id 후보 (인덱스가 없으면 빈 목록)"""
+    try:
+        # 실패해도 바깥 트랜잭션이 깨지지 않도록 세이브포인트 안에서 실행
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT id FROM trips_city WHERE search_name %% %s '
+                    'ORDER BY search_name <-> %s LIMIT %s',
+                    [term, term, limit],
+                )
+            elif connection.vendor == 'sqlite':
+                match = ' OR '.join('"%s"' % gram.replace('"', '""') for gram in _trigrams(term))
+                cursor.execute(
+                    f'SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s '
+                    'ORDER BY rank LIMIT %s',
+                    [match, limit],
+                )
+            else:
+                return []
+            return [row[0] for row in cursor.fetchall()]
+    except DatabaseError:
+        return []
+
+
+def search_cities(query, country_id=None, limit=10):
+    """검색어로 시작하거나 비슷한 도시 목록 (국가 정보 포함)"""
+    term = normalize_search_text(query)
+    if not term:
+        return []
+    cities = City.objects.select_related('country')
+    if country_id:
+        cities = cities.filter(country_id=country_id)
+
+    prefix = Q(search_name__startswith=term)
+    if connection.vendor == 'sqlite':
+        prefix &= Q(search_name__gte=term, search_name__lt=term + '\U0010ffff')
+    results = list(cities.filter(prefix).order_by('-population', 'search_name')[:limit])
+    if len(results) >= limit or len(term) < FUZZY_MIN_LENGTH:
+        return results
+
+    candidate_ids = fuzzy_candidate_ids(term)
+    if not candidate_ids:
+        return results
+    found = {city.pk for city in results}
+    similar = [city for city in cities.filter(pk__in=candidate_ids) if city.pk not in found]
+    similar.sort(key=lambda city: (
+        -difflib.SequenceMatcher(None, term, city.search_name).ratio(),
+        -city.population,
+    ))
+    return results + similar[:limit - len(results)]
+
+
+def rebuild_search_index():
+    """SQLite 트라이그램 테이블을 도시 테이블 기준으로 다시 채움 (bulk 로드 후 호출)"""
+    if connection.vendor != 'sqlite':
+        return  # PostgreSQL은 GIN 인덱스가 자동으로 유지됨
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_SEARCH_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_name) SELECT id, search_name FROM trips_city'
+            )
+    except DatabaseError:
+        pass  # FTS5 trigram을 지원하지 않는 SQLite
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def sync_search_index(sender, instance, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_SEARCH_TABLE} WHERE rowid = %s', [instance.pk])
+            if kwargs.get('signal') is post_save:
+                cursor.execute(
+                    f'INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_name) VALUES (%s, %s)',
+                    [instance.pk, instance.search_name],
+                )
+    except DatabaseError:
+        pass
+
+
+@receiver(fixture_loaded, sender=City)
+def index_loaded_cities(sender, instances, **kwargs):
+    """픽스처로 들어온 도시는 save()를 거치지 않으므로 검색용 이름을 채우고 인덱스를 다시 만듦"""
+    stale = []
+    for city in instances:
+        search_name = normalize_search_text(city.name)
+        if city.search_name != search_name:
+            city.search_name = search_name
+            stale.append(city)
+    City.objects.bulk_update(stale, ['search_name'], batch_size=1000)
+    rebuild_search_index()
+
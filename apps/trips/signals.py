@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.fixtures import fixture_loaded
+from core.versioning import bump_data_version
+from .models import Trip
+
+
+@receiver(post_save, sender=Trip)
+@receiver(post_delete, sender=Trip)
+def bump_version_on_trip_change(sender, instance, **kwargs):
+    """여행이 바뀌면 사용자 데이터 버전을 올려 집계 캐시를 무효화"""
+    bump_data_version(instance.user_id)
+
+
+@receiver(fixture_loaded, sender=Trip)
+def bump_version_on_trip_fixture_load(sender, instances, **kwargs):
+    for user_id in {trip.user_id for trip in instances}:
+        bump_data_version(user_id)
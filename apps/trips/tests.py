@@ -1,10 +1,19 @@
+import os
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from .models import Country, City, Trip
 from .forms import TripForm
+from .search import search_cities
+from django.utils import timezone
+from apps.accounts.models import Account
+from apps.transactions.models import Category, Transaction
 from datetime import date
 from decimal import Decimal
+from core.versioning import pinned_reference_versions
 
 
 class TripModelTest(TestCase):
@@ -210,6 +219,30 @@ class TripFormTest(TestCase):
         form = TripForm(data=form_data)
         self.assertTrue(form.is_valid())
     
+    def test_render_uses_reference_data(self):
+        """국가는 참조 데이터, 도시는 선택된 국가의 캐시 번들에서 (두 번째 렌더링부터 쿼리 없음)"""
+        other = Country.objects.create(name="프랑스")
+        City.objects.create(name="파리", country=other)
+        with pinned_reference_versions():
+            str(TripForm(initial={'country': self.country.id}))
+            with self.assertNumQueries(0):
+                html = str(TripForm(initial={'country': self.country.id}))
+        self.assertIn('프랑스', html)
+        self.assertIn('도쿄', html)
+        self.assertNotIn('파리', html)
+    
+    def test_city_must_belong_to_country(self):
+        """다른 국가의 도시는 선택할 수 없음"""
+        other = Country.objects.create(name="프랑스")
+        form = TripForm(data={
+            'name': '여행',
+            'country': other.id,
+            'city': self.city.id,
+            'start_date': '2026-03-01',
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('city', form.errors)
+    
     def test_end_date_before_start_date_invalid(self):
         """종료일이 시작일보다 이전이면 에러"""
         form_data = {
@@ -250,4 +283,137 @@ class TripFormTest(TestCase):
         self.assertFalse(form.is_valid())
         self.assertIn('name', form.errors)
         self.assertIn('country', form.errors)
-        self.assertIn('start_date', form.errors)
\ No newline at end of file
+        self.assertIn('start_date', form.errors)
+
+class CitiesApiTest(TestCase):
+    """국가별 도시 목록 API 캐시/ETag"""
+    
+    def setUp(self):
+        cache.clear()
+        self.country = Country.objects.create(name="일본")
+        City.objects.create(name="오사카", country=self.country)
+        City.objects.create(name="도쿄", country=self.country)
+        self.url = reverse('get_cities_by_country', args=[self.country.id])
+    
+    def test_returns_cities_with_cache_headers(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['name'] for c in response.json()], ['도쿄', '오사카'])
+        self.assertTrue(response['ETag'])
+        self.assertIn('max-age=', response['Cache-Control'])
+    
+    def test_repeat_request_hits_cache_and_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        # 도시 데이터 버전만 조회
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+    
+    def test_new_city_changes_bundle(self):
+        etag = self.client.get(self.url)['ETag']
+        City.objects.create(name="교토", country=self.country)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 3)
+
+
+class CitySearchTest(TestCase):
+    """지명 사전 일괄 등록과 도시 자동완성"""
+    
+    def setUp(self):
+        cache.clear()
+        self.path = self.write_csv(
+            'country,city,population\n'
+            '프랑스,Paris,2100000\n'
+            '미국,Paris,25000\n'
+            '미국,Parsons,10000\n'
+            '스페인,Málaga,570000\n'
+            '독일,München,1500000\n'
+        )
+    
+    def write_csv(self, text):
+        import tempfile
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as fileobj:
+            fileobj.write(text)
+        self.addCleanup(os.remove, fileobj.name)
+        return fileobj.name
+    
+    def load(self, path):
+        out = StringIO()
+        call_command('load_gazetteer', path, stdout=out)
+        return out.getvalue()
+    
+    def test_load_creates_countries_and_cities_once(self):
+        self.assertIn('도시 5개', self.load(self.path))
+        self.assertEqual(Country.objects.count(), 4)
+        self.assertEqual(City.objects.get(name='Málaga').search_name, 'malaga')
+        # 다시 실행해도 중복 없이 건너뜀
+        self.assertIn('도시 0개', self.load(self.path))
+        self.assertEqual(City.objects.count(), 5)
+    
+    def test_prefix_search_orders_by_population(self):
+        self.load(self.path)
+        names = [(c.name, c.country.name) for c in search_cities('par')]
+        self.assertEqual(names[:3], [('Paris', '프랑스'), ('Paris', '미국'), ('Parsons', '미국')])
+        france = Country.objects.get(name='프랑스')
+        self.assertEqual([c.name for c in search_cities('PAR', country_id=france.id)], ['Paris'])
+    
+    def test_prefix_is_matched_literally(self):
+        self.load(self.path)
+        self.assertEqual(search_cities('p_'), [])
+        self.assertEqual(search_cities('%'), [])
+        self.assertEqual(len(search_cities('pa')), 3)
+    
+    def test_search_ignores_accents_and_allows_typos(self):
+        self.load(self.path)
+        self.assertEqual([c.name for c in search_cities('malaga')], ['Málaga'])
+        self.assertEqual([c.name for c in search_cities('munchen')], ['München'])
+        self.assertIn('München', [c.name for c in search_cities('munhen')])
+    
+    def test_saved_city_is_searchable(self):
+        City.objects.create(name='Kyoto', country=Country.objects.create(name='일본'))
+        self.assertEqual([c.name for c in search_cities('kyotto')], ['Kyoto'])
+    
+    def test_search_api(self):
+        self.load(self.path)
+        response = self.client.get(reverse('search_cities'), {'q': 'münch'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['name'], 'München')
+        self.assertEqual(response.json()[0]['country'], '독일')
+        self.assertIn('max-age=', response['Cache-Control'])
+        self.assertEqual(self.client.get(reverse('search_cities')).json(), [])
+
+
+class TripDetailSummaryTest(TestCase):
+    """테스트 4: 여행 상세 합계 및 쿼리 수 테스트"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.country = Country.objects.create(name="일본")
+        self.city = City.objects.create(name="도쿄", country=self.country)
+        self.trip = Trip.objects.create(
+            user=self.user, name="도쿄 여행", country=self.country, city=self.city,
+            start_date=date(2026, 3, 1)
+        )
+        account = Account.objects.create(user=self.user, name='계좌', bank_name='은행', account_number='111')
+        category = Category.objects.create(name="식비")
+        for tx_type, amount in [('expense', 3000), ('expense', 2000), ('income', 10000)]:
+            Transaction.objects.create(
+                user=self.user, account=account, trip=self.trip, category=category,
+                transaction_type=tx_type, amount=Decimal(amount), occurred_at=timezone.now()
+            )
+        self.client.force_login(self.user)
+    
+    def test_summary_values(self):
+        response = self.client.get(reverse('trip_detail', args=[self.trip.id]))
+        self.assertEqual(response.context['total_expense'], Decimal('5000'))
+        self.assertEqual(response.context['total_income'], Decimal('10000'))
+        self.assertEqual(response.context['net_amount'], Decimal('5000'))
+    
+    def test_query_count(self):
+        """세션, 사용자, 여행, 데이터/참조 데이터 버전, 합계(1회), 거래 목록 = 7회"""
+        with self.assertNumQueries(7):
+            self.client.get(reverse('trip_detail', args=[self.trip.id]))
+        # 합계는 데이터 버전이 바뀔 때까지 캐시
+        with self.assertNumQueries(6):
+            self.client.get(reverse('trip_detail', args=[self.trip.id]))
@@ -2,14 +2,20 @@ from django.shortcuts import render
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Sum, Q
-from core.mixins import UserOwnershipMixin
+from core.aggregates import summarize
+from core.mixins import AtomicWriteMixin, ConditionalGetMixin, UserOwnershipMixin
+from core.versioning import cached_for_user
 from django.contrib.auth.mixins import LoginRequiredMixin
-from .models import Trip, City
+from .models import Trip
 from .forms import TripForm
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from .cities import CITY_BUNDLE_TIMEOUT, get_city_bundle
+from .search import search_cities
 
-class TripListView(UserOwnershipMixin, ListView):
+CITY_SEARCH_MAX_AGE = 60 * 5
+
+class TripListView(UserOwnershipMixin, ConditionalGetMixin, ListView):
     """여행 목록 뷰: 로그인한 사용자의 여행만 표시"""
     model = Trip
     template_name = 'trips/trip_list.html'
@@ -23,7 +29,7 @@ class TripListView(UserOwnershipMixin, ListView):
         # 일반 사용자는 본인 데이터만 (UserOwnershipMixin의 기본 동작 보완)
         return super().get_queryset()
 
-class TripDetailView(UserOwnershipMixin, DetailView):
+class TripDetailView(UserOwnershipMixin, ConditionalGetMixin, DetailView):
     """
     여행 상세 뷰: 
     로그인 시 본인 데이터가 아니면 404가 발생하던 문제를 
@@ -36,8 +42,8 @@ class TripDetailView(UserOwnershipMixin, DetailView):
     def get_queryset(self):
         # 데이터 소유권 체크 시, Admin은 모든 데이터에 접근 가능하게 수정
         if self.request.user.is_superuser:
-            return Trip.objects.all()
-        return super().get_queryset()
+            return Trip.objects.select_related('country', 'city__country')
+        return super().get_queryset().select_related('country', 'city__country')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -46,24 +52,21 @@ class TripDetailView(UserOwnershipMixin, DetailView):
         # 해당 여행에 연결된 모든 거래(지출/수입) 내역
         transactions = trip.transaction_set.select_related('account', 'category')
         
-        # 지출 합계 계산
-        total_expense = transactions.filter(
-            transaction_type='expense'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # 수입 합계 계산
-        total_income = transactions.filter(
-            transaction_type='income'
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        # 지출/수입 합계와 순액을 쿼리 한 번으로 계산 (여행 주인의 데이터 버전이 바뀔 때까지 캐시)
+        # data_version은 요청한 사용자(=여행 주인)의 버전, 관리자 요청이면 None이라 주인의 버전을 조회
+        summary = cached_for_user(
+            trip.user_id, 'trips:summary', trip.pk, lambda: summarize(trip.transaction_set.all()),
+            version=self.data_version,
+        )
         
         context['transactions'] = transactions.order_by('-occurred_at')[:20]
-        context['total_expense'] = total_expense
-        context['total_income'] = total_income
-        context['net_amount'] = total_income - total_expense
+        context['total_expense'] = summary['total_expense']
+        context['total_income'] = summary['total_income']
+        context['net_amount'] = summary['net_amount']
         
         return context
 
-class TripCreateView(UserOwnershipMixin, CreateView):
+class TripCreateView(UserOwnershipMixin, AtomicWriteMixin, CreateView):
     """여행 등록 뷰"""
     model = Trip
     form_class = TripForm
@@ -75,7 +78,7 @@ class TripCreateView(UserOwnershipMixin, CreateView):
         messages.success(self.request, '새로운 여행이 등록되었습니다.')
         return super().form_valid(form)
 
-class TripUpdateView(UserOwnershipMixin, UpdateView):
+class TripUpdateView(UserOwnershipMixin, AtomicWriteMixin, UpdateView):
     """여행 정보 수정 뷰"""
     model = Trip
     form_class = TripForm
@@ -91,7 +94,7 @@ class TripUpdateView(UserOwnershipMixin, UpdateView):
         messages.success(self.request, '여행 정보가 성공적으로 수정되었습니다.')
         return super().form_valid(form)
 
-class TripDeleteView(UserOwnershipMixin, DeleteView):
+class TripDeleteView(UserOwnershipMixin, AtomicWriteMixin, DeleteView):
     """여행 삭제 뷰"""
     model = Trip
     template_name = 'trips/trip_confirm_delete.html'
@@ -107,6 +110,37 @@ class TripDeleteView(UserOwnershipMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 def get_cities_by_country(request, country_id):
-    """특정 국가의 도시 목록 반환 (AJAX용)"""
-    cities = City.objects.filter(country_id=country_id).values('id', 'name')
-    return JsonResponse(list(cities), safe=False)
\ No newline at end of file
+    """
+    특정 국가의 도시 목록 반환 (AJAX용).
+    캐시된 번들을 그대로 내려주고, 내용이 같으면 If-None-Match에 304로 응답합니다.
+    화면에서는 도시 데이터 버전(?v=)을 붙여 요청하므로 오래 캐시해도 변경이 바로 반영됩니다.
+    """
+    bundle = get_city_bundle(country_id)
+    response = get_conditional_response(request, etag=bundle['etag'])
+    if response is None:
+        response = HttpResponse(bundle['body'], content_type='application/json')
+    response['ETag'] = bundle['etag']
+    patch_cache_control(response, public=True, max_age=CITY_BUNDLE_TIMEOUT)
+    return response
+
+
+def search_cities_api(request):
+    """
+    도시 자동완성 (AJAX용): ?q=검색어[&country=국가 id]
+    접두어가 일치하는 도시를 인구 순으로, 부족하면 철자가 비슷한 도시를 이어서 반환합니다.
+    """
+    country_id = request.GET.get('country', '')
+    cities = search_cities(
+        request.GET.get('q', '')[:100],
+        country_id=int(country_id) if country_id.isdigit() else None,
+    )
+    response = JsonResponse(
+        [
+            {'id': city.pk, 'name': city.name, 'country_id': city.country_id, 'country': city.country.name}
+            for city in cities
+        ],
+        safe=False,
+        json_dumps_params={'ensure_ascii': False},
+    )
+    patch_cache_control(response, public=True, max_age=CITY_SEARCH_MAX_AGE)
+    return response
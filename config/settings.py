@@ -1,4 +1,5 @@
 import os
+import time
 from pathlib import Path
 from decouple import config
 from dotenv import load_dotenv
@@ -46,6 +47,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 다른 미들웨어의 쿼리(세션/인증)까지 재도록 맨 앞에 둠
+    'core.middleware.RequestTimingMiddleware',
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -158,6 +162,68 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 캐시 설정 (기본: 프로세스 메모리, 워커 간 공유가 필요하면 환경변수로 교체)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'travelbank'),
+    }
+}
+
+# 메인 페이지 통계 스냅샷 갱신 주기(초)
+SITE_STATS_REFRESH_INTERVAL = int(os.environ.get('SITE_STATS_REFRESH_INTERVAL', '300'))
+
+# 영수증 이미지 후처리 (apps.transactions.receipts)
+# RECEIPT_PROCESS_IN_BACKGROUND=0이면 업로드 시 예약하지 않고 `process_receipts` 명령으로만 처리
+RECEIPT_PROCESS_IN_BACKGROUND = os.environ.get('RECEIPT_PROCESS_IN_BACKGROUND', '1') == '1'
+RECEIPT_PROCESSING_WORKERS = int(os.environ.get('RECEIPT_PROCESSING_WORKERS', '2'))
+# 처리 중 상태가 이 시간(초)보다 오래되면 처리하던 프로세스가 죽은 것으로 보고 다시 처리
+RECEIPT_PROCESSING_TIMEOUT = int(os.environ.get('RECEIPT_PROCESSING_TIMEOUT', '600'))
+RECEIPT_MAX_DIMENSION = int(os.environ.get('RECEIPT_MAX_DIMENSION', '2000'))
+RECEIPT_PREVIEW_DIMENSION = 1024
+RECEIPT_THUMBNAIL_DIMENSION = 240
+RECEIPT_JPEG_QUALITY = 82
+
+# 영수증 파일 전송 방식 (core.http.serve_file)
+# 'x-accel-redirect'(nginx) 또는 'x-sendfile'(Apache 등)이면 권한 확인 후 실제 전송은 프록시에 맡김
+PROTECTED_MEDIA_SENDFILE = os.environ.get('PROTECTED_MEDIA_SENDFILE') or None
+# X-Accel-Redirect 사용 시 MEDIA_ROOT를 가리키는 nginx internal location
+PROTECTED_MEDIA_ACCEL_PREFIX = os.environ.get('PROTECTED_MEDIA_ACCEL_PREFIX', '/protected-media/')
+
+# 테스트 실행기 - 벤치마크(core/test_benchmarks.py)는 `manage.py test --tag benchmark`로 지정할 때만 실행
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+# 요청별 SQL/처리 시간 계측 (core.middleware) - 'core.timing' JSON 로그와 Server-Timing 헤더(DEBUG 또는 스태프 요청에만)
+REQUEST_TIMING = os.environ.get('REQUEST_TIMING', '1') == '1'
+# 한 요청에서 같은 SQL이 이 횟수 이상 실행되면 N+1 의심 경고
+REQUEST_TIMING_REPEAT_THRESHOLD = int(os.environ.get('REQUEST_TIMING_REPEAT_THRESHOLD', '5'))
+
+# 배포 식별자 - 조건부 GET(core.mixins.ConditionalGetMixin)의 ETag에 섞어 배포로 템플릿이 바뀌면 캐시된 페이지를 다시 받게 함
+# 지정하지 않으면 Fly 이미지 참조, 그것도 없으면 프로세스 시작 시각 (gunicorn preload_app이면 워커끼리 같은 값)
+RELEASE_VERSION = os.environ.get('RELEASE_VERSION') or os.environ.get('FLY_IMAGE_REF') or str(time.time_ns())
+
+# 워커 공용 지표 (core.metrics) - /metrics/ 에서 Prometheus 형식으로 제공
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+# 워커별 지표 파일 디렉터리 (기본: 시스템 임시 디렉터리/travelbank-metrics)
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+# 설정하면 Authorization: Bearer <토큰>으로 /metrics/ 접근 허용 (그 외에는 staff 로그인 필요)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.timing': {
+            'handlers': ['console'],
+            'level': os.environ.get('REQUEST_TIMING_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/accounts/login/'
@@ -2,11 +2,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.views.static import serve  # 추가
-from django.urls import re_path       # 추가
+from core.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path('', include('apps.main.urls')), 
     path('accounts/', include('apps.accounts.urls')),
     path('dashboard/', include('apps.dashboard.urls')),
@@ -14,11 +14,7 @@ urlpatterns = [
     path('transactions/', include('apps.transactions.urls')),
 ]
 
-# 운영 환경(DEBUG=False)에서도 미디어 파일을 서빙하기 위한 설정
-if not settings.DEBUG:
-    urlpatterns += [
-        re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
-    ]
-else:
-    # 개발 환경일 때
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# 영수증 등 미디어 파일은 권한을 확인하는 전용 뷰(receipt_file)로만 제공하고,
+# 개발 환경에서만 /media/ 경로를 그대로 열어 둡니다.
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,51 @@
+from django.db.models import Count, F, Func, Q, Sum
+
+INCOME = Q(transaction_type='income')
+EXPENSE = Q(transaction_type='expense')
+
+
+class RunningSum(Func):
+    """
+    Window()에 넣는 SUM. Django의 Sum은 집계 결과(GROUP BY로 만든 annotate)를 다시 합칠 수 없어서
+    `SUM(SUM(amount)) OVER (ORDER BY ...)`처럼 구간별 합계의 누적합을 쿼리 한 번으로 구할 때 씁니다.
+    """
+    function = 'SUM'
+    window_compatible = True
+
+
+def summarize(queryset, by_category=False):
+    """
+    거래 QuerySet의 입금/출금/순액/건수를 SQL 한 번으로 집계합니다.
+
+    by_category=True이면 카테고리별로 GROUP BY한 결과 한 번으로
+    카테고리별 내역(categories)과 전체 합계를 함께 계산합니다.
+    """
+    aggregates = {
+        'total_income': Sum('amount', filter=INCOME),
+        'total_expense': Sum('amount', filter=EXPENSE),
+        'transaction_count': Count('id'),
+    }
+
+    if not by_category:
+        summary = queryset.aggregate(**aggregates)
+        return _finish(summary)
+
+    rows = queryset.order_by().values(
+        'category_id', 'category__name'
+    ).annotate(**aggregates).order_by(F('total_expense').desc(nulls_last=True), 'category__name')
+
+    categories = [_finish(row) for row in rows]
+    summary = _finish({
+        'total_income': sum(row['total_income'] for row in categories),
+        'total_expense': sum(row['total_expense'] for row in categories),
+        'transaction_count': sum(row['transaction_count'] for row in categories),
+    })
+    summary['categories'] = categories
+    return summary
+
+
+def _finish(row):
+    row['total_income'] = row['total_income'] or 0
+    row['total_expense'] = row['total_expense'] or 0
+    row['net_amount'] = row['total_income'] - row['total_expense']
+    return row
@@ -0,0 +1,68 @@
+"""
+Aho-Corasick 다중 키워드 매칭.
+
+키워드 수와 상관없이 문자열을 한 번 훑으면서 들어 있는 키워드를 모두 찾습니다.
+(키워드마다 `keyword in text`를 하면 키워드 수만큼 비용이 늘어남)
+"""
+from collections import deque
+
+
+class Automaton:
+    """
+    (키워드, 값) 목록으로 만드는 매칭 오토마톤.
+    같은 키워드가 여러 번 나오면 마지막 값을 씁니다.
+    """
+
+    def __init__(self, keywords=()):
+        self._goto = [{}]
+        self._fail = [0]
+        # 상태에서 끝나는 키워드 중 가장 긴 것의 (길이, 값) (실패 링크를 따라간 것 포함)
+        self._longest = [None]
+        for keyword, value in keywords:
+            if keyword:
+                self._add(keyword, value)
+        self._link()
+
+    def __bool__(self):
+        return len(self._goto) > 1
+
+    def _add(self, keyword, value):
+        state = 0
+        for char in keyword:
+            following = self._goto[state].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._longest.append(None)
+            state = following
+        self._longest[state] = (len(keyword), value)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[following] = fail if fail != following else 0
+                if self._longest[following] is None:
+                    self._longest[following] = self._longest[self._fail[following]]
+                queue.append(following)
+
+    def longest_match(self, text):
+        """text에 들어 있는 키워드 중 가장 긴 것의 값 (없으면 None)"""
+        goto, fail = self._goto, self._fail
+        best = None
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found = self._longest[state]
+            if found is not None and (best is None or found[0] > best[0]):
+                best = found
+        return best[1] if best is not None else None
@@ -0,0 +1,115 @@
+"""
+뷰 성능 벤치마크 도구.
+
+테스트 클라이언트로 뷰를 반복 호출해 지연 시간(p50/p95)과 SQL 쿼리 수를 재고,
+뷰마다 선언한 예산(Budget)을 넘으면 실패로 보고합니다.
+
+- 첫 요청은 캐시가 비어 있는 상태(cold)에서 보내 쿼리 수를 재고(최악의 경우),
+  이후 repeat회는 캐시가 채워진 상태(warm)에서 지연 시간을 잽니다.
+- 데이터 크기는 BENCHMARK_SIZE 환경변수(1k/100k/1m 또는 숫자)로 정합니다.
+- 실행: BENCHMARK_SIZE=100k python manage.py test --tag benchmark
+"""
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+DEFAULT_SIZE = '1k'
+DEFAULT_REPEAT = 20
+
+
+def benchmark_size():
+    """(이름, 거래 건수)"""
+    name = os.environ.get('BENCHMARK_SIZE', DEFAULT_SIZE).lower()
+    if name in SIZES:
+        return name, SIZES[name]
+    count = int(name)
+    for size_name, size_count in SIZES.items():
+        if count <= size_count:
+            return size_name, count
+    return '1m', count
+
+
+def benchmark_repeat():
+    return int(os.environ.get('BENCHMARK_REPEAT', DEFAULT_REPEAT))
+
+
+def percentile(values, percent):
+    """최근접 순위 방식 백분위수"""
+    ordered = sorted(values)
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[int(index)]
+
+
+@dataclass
+class Budget:
+    """
+    뷰의 성능 예산.
+    queries: cold 요청의 최대 쿼리 수 (데이터 크기와 무관해야 함)
+    p95_ms: 데이터 크기 이름별 warm p95 지연 시간 상한(ms), 없는 크기는 검사하지 않음
+    """
+    queries: int
+    p95_ms: dict = field(default_factory=dict)
+
+
+@dataclass
+class Result:
+    name: str
+    status_code: int
+    cold_queries: int
+    warm_queries: int
+    timings_ms: list
+
+    @property
+    def p50(self):
+        return statistics.median(self.timings_ms)
+
+    @property
+    def p95(self):
+        return percentile(self.timings_ms, 95)
+
+    def violations(self, budget, size_name):
+        problems = []
+        if self.status_code != 200:
+            problems.append(f'응답 코드 {self.status_code}')
+        if self.cold_queries > budget.queries:
+            problems.append(f'쿼리 {self.cold_queries}개 > 예산 {budget.queries}개')
+        limit = budget.p95_ms.get(size_name)
+        if limit is not None and self.p95 > limit:
+            problems.append(f'p95 {self.p95:.1f}ms > 예산 {limit}ms')
+        return problems
+
+    def row(self):
+        return (
+            f'{self.name:<24} {self.cold_queries:>6} {self.warm_queries:>6} '
+            f'{self.p50:>9.1f} {self.p95:>9.1f}'
+        )
+
+
+REPORT_HEADER = f"{'view':<24} {'cold q':>6} {'warm q':>6} {'p50(ms)':>9} {'p95(ms)':>9}"
+
+
+def measure(client, name, url, repeat=None, **extra):
+    """url을 cold 1회 + warm repeat회 요청해 Result를 반환"""
+    repeat = repeat or benchmark_repeat()
+    cache.clear()
+    with CaptureQueriesContext(connection) as cold:
+        response = client.get(url, **extra)
+    status_code = response.status_code
+
+    timings = []
+    warm_queries = 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as warm:
+            started = time.perf_counter()
+            response = client.get(url, **extra)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            timings.append((time.perf_counter() - started) * 1000)
+        warm_queries = max(warm_queries, len(warm.captured_queries))
+        status_code = max(status_code, response.status_code)
+    return Result(name, status_code, len(cold.captured_queries), warm_queries, timings)
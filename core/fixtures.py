@@ -0,0 +1,232 @@
+"""
+대용량 JSON 픽스처 일괄 로더 (bulkloaddata 명령).
+
+loaddata는 객체마다 역직렬화/저장(쿼리 1개 이상)을 하므로 픽스처가 커질수록 느려집니다.
+여기서는
+- JSON 배열을 조각 단위로 읽으며 객체를 하나씩 꺼내고(전체 문자열을 한 번에 읽지 않음)
+- 모델을 외래키 의존 순서(User → Profile/Account → Country → City → Trip → Category → Transaction → Receipt)로 정렬해
+- 모델별 bulk_create(pk 충돌 시 갱신)로 저장합니다.
+
+loaddata와 같은 결과가 되도록
+- 자연키(["username"])로 된 외래키와 pk 없는 객체는 모델별 {자연키: pk} 맵으로 pk를 찾아 바꾸고
+  (객체마다 get_by_natural_key를 호출하지 않음)
+- raw 저장처럼 auto_now/auto_now_add 필드도 픽스처 값을 그대로 쓰며
+- M2M은 기존 관계를 픽스처 값으로 교체하고, 끝나면 제약 조건 검사와 시퀀스 재설정을 합니다.
+bulk 저장은 post_save를 보내지 않으므로 모델마다 fixture_loaded 시그널을 보내고,
+각 앱이 집계/캐시/검색 인덱스를 다시 계산합니다.
+"""
+import json
+from contextlib import ExitStack, contextmanager
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.dispatch import Signal
+
+# 모델별로 저장이 끝난 뒤 보내는 시그널 (sender: 모델, instances: 저장한 객체 목록)
+fixture_loaded = Signal()
+
+BATCH_SIZE = 1000
+READ_SIZE = 64 * 1024
+
+
+def iter_json_array(fileobj, read_size=READ_SIZE):
+    """최상위 JSON 배열의 원소를 하나씩 반환 (파일을 read_size씩 읽음)"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = eof = False
+    while True:
+        while position < len(buffer) and (buffer[position].isspace() or (started and buffer[position] == ',')):
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != '[':
+                    raise DeserializationError('픽스처는 JSON 배열이어야 합니다.')
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise DeserializationError(f'JSON 형식 오류: {exc}') from exc
+            else:
+                yield value
+                continue
+        elif eof:
+            raise DeserializationError('JSON 배열이 끝나지 않았습니다.')
+        # 원소가 조각 경계에 걸쳐 있으면 더 읽어서 이어 붙임
+        chunk = fileobj.read(read_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def dependency_order(model_list):
+    """외래키/M2M 의존 순서로 정렬 (의존 관계가 없으면 처음 나온 순서 유지, 순환은 나온 순서로 끊음)"""
+    remaining = list(model_list)
+    ordered = []
+    while remaining:
+        for model in remaining:
+            fields = [*model._meta.concrete_fields, *model._meta.local_many_to_many]
+            dependencies = {field.related_model for field in fields if field.is_relation} - {model}
+            if not dependencies & set(remaining):
+                break
+        else:
+            model = remaining[0]
+        remaining.remove(model)
+        ordered.append(model)
+    return ordered
+
+
+@contextmanager
+def raw_timestamps(model_list):
+    """bulk_create가 auto_now/auto_now_add로 값을 덮어쓰지 않도록 잠시 끔 (loaddata의 raw 저장과 같게)"""
+    changed = []
+    for model in model_list:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                changed.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in changed:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class FixtureLoader:
+    def __init__(self, using=DEFAULT_DB_ALIAS, batch_size=BATCH_SIZE, ignore_nonexistent=False, exclude=()):
+        self.using = using
+        self.batch_size = batch_size
+        self.ignore_nonexistent = ignore_nonexistent
+        self.exclude_models = {apps.get_model(label) for label in exclude if '.' in label}
+        self.exclude_apps = {label for label in exclude if '.' not in label}
+        self._natural_keys = {}
+        self.counts = {}
+
+    def load(self, paths):
+        """픽스처 파일들을 저장하고 설치한 객체 수를 반환"""
+        groups = {}
+        for path in paths:
+            with open(path, encoding='utf-8') as fileobj:
+                for entry in iter_json_array(fileobj):
+                    model = self.get_model(entry)
+                    if model is not None:
+                        groups.setdefault(model, []).append(entry)
+
+        connection = connections[self.using]
+        order = dependency_order(groups)
+        loaded = {}
+        with transaction.atomic(using=self.using):
+            with ExitStack() as stack:
+                stack.enter_context(connection.constraint_checks_disabled())
+                stack.enter_context(raw_timestamps(order))
+                for model in order:
+                    loaded[model] = self.save(model, groups.pop(model))
+                connection.check_constraints(table_names=[model._meta.db_table for model in order])
+
+                sequence_sql = connection.ops.sequence_reset_sql(no_style(), order)
+                if sequence_sql:
+                    with connection.cursor() as cursor:
+                        for sql in sequence_sql:
+                            cursor.execute(sql)
+
+            # 파생 데이터(집계/잔액/데이터 버전) 갱신도 같은 트랜잭션에서
+            for model, instances in loaded.items():
+                fixture_loaded.send(sender=model, instances=instances, using=self.using)
+        return sum(len(instances) for instances in loaded.values())
+
+    def get_model(self, entry):
+        try:
+            model = apps.get_model(entry['model'])
+        except (LookupError, KeyError, TypeError) as exc:
+            raise DeserializationError(f"알 수 없는 모델: {entry.get('model')!r}") from exc
+        if model in self.exclude_models or model._meta.app_label in self.exclude_apps:
+            return None
+        return model
+
+    def natural_key_map(self, model):
+        """{자연키 튜플: pk} (모델별로 한 번만 조회, 저장 후에는 다시 조회)"""
+        if model not in self._natural_keys:
+            self._natural_keys[model] = {
+                tuple(obj.natural_key()): obj.pk for obj in model._default_manager.db_manager(self.using).all()
+            }
+        return self._natural_keys[model]
+
+    def related_pk(self, field, value):
+        related = field.remote_field.model
+        if isinstance(value, (list, tuple)) and hasattr(related._default_manager, 'get_by_natural_key'):
+            try:
+                return self.natural_key_map(related)[tuple(value)]
+            except KeyError:
+                raise DeserializationError(f'{related._meta.label}의 자연키 {value!r}를 찾을 수 없습니다.')
+        target = related._meta.pk if field.many_to_many else field.target_field
+        return target.to_python(value)
+
+    def build(self, model, entry):
+        """(객체, {M2M 필드: pk 목록})"""
+        opts = model._meta
+        data = {}
+        if entry.get('pk') is not None:
+            data[opts.pk.attname] = opts.pk.to_python(entry['pk'])
+        m2m = {}
+        for name, value in entry.get('fields', {}).items():
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                if self.ignore_nonexistent:
+                    continue
+                raise DeserializationError(f'{opts.label}에 {name} 필드가 없습니다.')
+            if field.many_to_many:
+                m2m[field] = [self.related_pk(field, item) for item in value]
+            elif field.is_relation and field.concrete:
+                data[field.attname] = None if value is None else self.related_pk(field, value)
+            else:
+                data[field.attname] = field.to_python(value)
+        obj = model(**data)
+        if obj.pk is None and hasattr(model._default_manager, 'get_by_natural_key') and hasattr(model, 'natural_key'):
+            # pk 없이 자연키만 있는 객체는 이미 있으면 그 pk로 갱신
+            obj.pk = self.natural_key_map(model).get(tuple(obj.natural_key()))
+        return obj, m2m
+
+    def save(self, model, entries):
+        opts = model._meta
+        built = [self.build(model, entry) for entry in entries]
+        objects = [obj for obj, _ in built]
+        update_fields = [field.name for field in opts.concrete_fields if not field.primary_key]
+        manager = model._base_manager.db_manager(self.using)
+        with_pk = [obj for obj in objects if obj.pk is not None]
+        without_pk = [obj for obj in objects if obj.pk is None]
+        if with_pk:
+            if update_fields:
+                manager.bulk_create(
+                    with_pk, batch_size=self.batch_size,
+                    update_conflicts=True, unique_fields=[opts.pk.name], update_fields=update_fields,
+                )
+            else:
+                manager.bulk_create(with_pk, batch_size=self.batch_size, ignore_conflicts=True)
+        if without_pk:
+            manager.bulk_create(without_pk, batch_size=self.batch_size)
+        self._natural_keys.pop(model, None)
+
+        for field in {field for _, m2m in built for field in m2m}:
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            pks = [obj.pk for obj, m2m in built if field in m2m]
+            through._base_manager.db_manager(self.using).filter(**{f'{source}__in': pks}).delete()
+            through._base_manager.db_manager(self.using).bulk_create(
+                [
+                    through(**{f'{source}_id': obj.pk, f'{target}_id': pk})
+                    for obj, m2m in built if field in m2m
+                    for pk in dict.fromkeys(m2m[field])
+                ],
+                batch_size=self.batch_size,
+            )
+        self.counts[opts.label] = self.counts.get(opts.label, 0) + len(objects)
+        return objects
@@ -0,0 +1,133 @@
+"""
+저장소(storage) 파일 응답 헬퍼.
+
+- ETag/Last-Modified 조건부 요청(304/412)
+- 단일 구간 Range 요청(206/416), If-Range
+- settings.PROTECTED_MEDIA_SENDFILE 설정 시 X-Accel-Redirect(nginx)/X-Sendfile(Apache 등)로
+  실제 전송은 프록시에 맡김
+"""
+import mimetypes
+import re
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _RangeReader:
+    """파일의 [start, start + length) 구간만 읽도록 감싼 객체"""
+
+    def __init__(self, fileobj, start, length):
+        fileobj.seek(start)
+        self.fileobj = fileobj
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fileobj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+
+def parse_range(header, size):
+    """
+    'bytes=start-end' 형식의 단일 구간을 (start, end)로 반환 (end 포함).
+    여러 구간이거나 올바르지 않은 구간(bytes=5-3 등)이면 None(Range를 무시하고 전체 응답, RFC 9110 14.2),
+    형식은 맞지만 만족할 수 없으면(시작이 파일 크기 이상, bytes=-0) ValueError.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # bytes=-N : 마지막 N바이트
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def serve_file(request, field_file, filename='', cache_control='private, no-cache'):
+    """
+    FieldFile(저장소 파일)을 조건부/구간 요청을 지원하는 응답으로 반환합니다.
+    파일이 없으면 FileNotFoundError를 그대로 올립니다.
+    """
+    storage = field_file.storage
+    name = field_file.name
+    size = storage.size(name)
+    last_modified = int(storage.get_modified_time(name).timestamp())
+    etag = quote_etag(f'{last_modified:x}-{size:x}')
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    def finish(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = cache_control
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return finish(not_modified)
+
+    sendfile = settings.PROTECTED_MEDIA_SENDFILE
+    if sendfile:
+        # 구간/본문 전송은 프록시가 처리
+        response = HttpResponse(content_type=content_type)
+        if sendfile == 'x-accel-redirect':
+            # nginx internal location 기준 URI
+            response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_ACCEL_PREFIX + name
+        else:
+            response['X-Sendfile'] = storage.path(name)
+        if filename:
+            response['Content-Disposition'] = content_disposition_header(False, filename)
+        return finish(response)
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.method == 'GET' and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return finish(response)
+
+    fileobj = storage.open(name, 'rb')
+    if byte_range is None:
+        response = FileResponse(fileobj, content_type=content_type, filename=filename)
+        response['Content-Length'] = size
+        return finish(response)
+
+    start, end = byte_range
+    length = end - start + 1
+    response = FileResponse(
+        _RangeReader(fileobj, start, length), status=206, content_type=content_type, filename=filename
+    )
+    response['Content-Length'] = length
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return finish(response)
@@ -0,0 +1,49 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+from core.fixtures import BATCH_SIZE, FixtureLoader
+
+
+class Command(BaseCommand):
+    help = (
+        'JSON 픽스처를 모델별 bulk_create로 빠르게 설치합니다. '
+        '결과는 loaddata와 같습니다 (같은 pk는 갱신, 자연키 지원, auto_now 값 유지).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+', help='JSON 픽스처 파일 경로')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '-i', '--ignorenonexistent', action='store_true',
+            help='모델에 없는 필드는 무시 (loaddata와 같음)',
+        )
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='제외할 앱 또는 app_label.ModelName (여러 번 지정 가능)',
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            loader = FixtureLoader(
+                using=options['database'],
+                batch_size=options['batch_size'],
+                ignore_nonexistent=options['ignorenonexistent'],
+                exclude=options['exclude'],
+            )
+        except LookupError as exc:
+            raise CommandError(f'알 수 없는 모델: {exc}')
+
+        started = time.monotonic()
+        try:
+            installed = loader.load(options['fixtures'])
+        except (DeserializationError, DatabaseError, OSError) as exc:
+            raise CommandError(f'픽스처 설치 실패: {exc}')
+
+        if options['verbosity'] >= 2:
+            for label, count in loader.counts.items():
+                self.stdout.write(f'  {label}: {count}')
+        self.stdout.write(
+            f"픽스처 {len(options['fixtures'])}개에서 객체 {installed}개 설치 ({time.monotonic() - started:.1f}초)"
+        )
@@ -0,0 +1,262 @@
+"""
+여러 워커 프로세스가 함께 쓰는 지표(카운터/히스토그램).
+
+- 각 프로세스는 METRICS_DIR 아래 자기 pid 파일(metrics_<pid>.db)에만 메모리 맵으로 값을 더하므로 프로세스 간 잠금이 필요 없습니다.
+- /metrics/ 요청은 디렉터리의 파일들을 읽어 합친 뒤 Prometheus 텍스트 형식으로 내보냅니다.
+  읽는 양은 시계열(지표×레이블) 수와 워커 수에만 비례하고 트래픽과는 무관합니다.
+- 종료된 워커의 파일은 gunicorn child_exit 훅(gunicorn.conf.py)에서 metrics_archive.db로 합쳐
+  재시작이 반복되어도 파일 수가 늘지 않습니다.
+
+파일 형식: [사용 바이트 수:uint32][예약:uint32] 다음에 항목이 이어짐
+           항목 = [키 길이:uint32][키(UTF-8, 8바이트 정렬)][값:float64]
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from django.conf import settings
+
+INITIAL_SIZE = 64 * 1024
+HEADER = struct.Struct('<II')
+KEY_LENGTH = struct.Struct('<I')
+VALUE = struct.Struct('<d')
+ARCHIVE_NAME = 'metrics_archive.db'
+
+_metrics = {}
+_lock = threading.Lock()
+_writer = None
+
+
+def metrics_dir():
+    return Path(settings.METRICS_DIR or Path(tempfile.gettempdir()) / 'travelbank-metrics')
+
+
+def _entry_size(encoded):
+    return KEY_LENGTH.size + (len(encoded) + 7) // 8 * 8 + VALUE.size
+
+
+def _iter_entries(data, used):
+    """(키, 값, 값 위치)를 순서대로 반환"""
+    pos = HEADER.size
+    while pos + KEY_LENGTH.size <= used:
+        (length,) = KEY_LENGTH.unpack_from(data, pos)
+        key_end = pos + KEY_LENGTH.size + length
+        value_pos = pos + KEY_LENGTH.size + (length + 7) // 8 * 8
+        if value_pos + VALUE.size > used:
+            break
+        key = bytes(data[pos + KEY_LENGTH.size:key_end]).decode()
+        yield key, VALUE.unpack_from(data, value_pos)[0], value_pos
+        pos = value_pos + VALUE.size
+
+
+class MmapValues:
+    """한 프로세스만 쓰는 (키 -> float) 메모리 맵 파일"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a+b')
+        capacity = max(os.fstat(self._file.fileno()).st_size, INITIAL_SIZE)
+        self._file.truncate(capacity)
+        self._map = mmap.mmap(self._file.fileno(), capacity)
+        self._used = HEADER.unpack_from(self._map, 0)[0] or HEADER.size
+        self._positions = {key: pos for key, _, pos in _iter_entries(self._map, self._used)}
+
+    def _append(self, key):
+        encoded = key.encode()
+        size = _entry_size(encoded)
+        if self._used + size > len(self._map):
+            capacity = len(self._map)
+            while self._used + size > capacity:
+                capacity *= 2
+            self._map.close()
+            self._file.truncate(capacity)
+            self._map = mmap.mmap(self._file.fileno(), capacity)
+        pos = self._used
+        KEY_LENGTH.pack_into(self._map, pos, len(encoded))
+        self._map[pos + KEY_LENGTH.size:pos + KEY_LENGTH.size + len(encoded)] = encoded
+        value_pos = pos + size - VALUE.size
+        VALUE.pack_into(self._map, value_pos, 0.0)
+        # 항목을 다 쓴 뒤에 사용량을 갱신해야 읽는 쪽이 반쯤 쓰인 항목을 보지 않음
+        self._used += size
+        HEADER.pack_into(self._map, 0, self._used, 0)
+        self._positions[key] = value_pos
+        return value_pos
+
+    def inc(self, key, amount):
+        pos = self._positions.get(key)
+        if pos is None:
+            pos = self._append(key)
+        VALUE.pack_into(self._map, pos, VALUE.unpack_from(self._map, pos)[0] + amount)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def read_values(path):
+    """지표 파일의 {키: 값} (읽는 중 파일이 없어지면 빈 dict)"""
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return {}
+    if len(data) < HEADER.size:
+        return {}
+    values = {}
+    for key, value, _ in _iter_entries(data, HEADER.unpack_from(data, 0)[0]):
+        values[key] = values.get(key, 0.0) + value
+    return values
+
+
+def _get_writer():
+    """현재 프로세스의 지표 파일 (fork 후에는 새 pid로 다시 엶, _lock 안에서 호출)"""
+    global _writer
+    path = metrics_dir() / f'metrics_{os.getpid()}.db'
+    if _writer is None or _writer.path != path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _writer = MmapValues(path)
+    return _writer
+
+
+def _key(name, labels):
+    return json.dumps([name, labels], sort_keys=True, ensure_ascii=False)
+
+
+def _inc(name, labels, amount):
+    if not settings.METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _get_writer().inc(key, amount)
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        _metrics[name] = self
+
+    def inc(self, amount=1, **labels):
+        _inc(self.name, labels, amount)
+
+    def samples(self, series):
+        for labels, value in series.get(self.name, []):
+            yield self.name, labels, value
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        _metrics[name] = self
+
+    def observe(self, value, **labels):
+        # 값이 들어가는 첫 구간 하나에만 더하고, 누적값은 내보낼 때 계산
+        bound = next((b for b in self.buckets if value <= b), float('inf'))
+        _inc(f'{self.name}_bucket', {**labels, 'le': _format_value(bound)}, 1)
+        _inc(f'{self.name}_sum', labels, value)
+        _inc(f'{self.name}_count', labels, 1)
+
+    def samples(self, series):
+        buckets = {}
+        for labels, value in series.get(f'{self.name}_bucket', []):
+            le = labels.pop('le')
+            buckets.setdefault(_key(self.name, labels), (labels, {}))[1][le] = value
+        for labels, counts in buckets.values():
+            total = 0.0
+            for bound in (*self.buckets, float('inf')):
+                total += counts.get(_format_value(bound), 0.0)
+                yield f'{self.name}_bucket', {**labels, 'le': _format_value(bound)}, total
+        for suffix in ('_sum', '_count'):
+            for labels, value in series.get(self.name + suffix, []):
+                yield self.name + suffix, labels, value
+
+
+def _format_value(value):
+    value = float(value)
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def collect():
+    """모든 프로세스 파일을 합친 {지표 이름: [(레이블, 값), ...]}"""
+    totals = {}
+    for path in sorted(metrics_dir().glob('metrics_*.db')):
+        for key, value in read_values(path).items():
+            totals[key] = totals.get(key, 0.0) + value
+    series = {}
+    for key, value in totals.items():
+        name, labels = json.loads(key)
+        series.setdefault(name, []).append((labels, value))
+    return series
+
+
+def render_prometheus():
+    series = collect()
+    lines = []
+    for metric in _metrics.values():
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for name, labels, value in metric.samples(series):
+            label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+            lines.append(f'{name}{{{label_text}}} {_format_value(value)}' if label_text else f'{name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def archive_process(pid):
+    """종료된 프로세스의 값을 보관 파일로 합치고 프로세스 파일을 지움 (gunicorn 마스터에서 호출)"""
+    path = metrics_dir() / f'metrics_{pid}.db'
+    values = read_values(path)
+    if values:
+        archive = MmapValues(metrics_dir() / ARCHIVE_NAME)
+        try:
+            for key, value in values.items():
+                archive.inc(key, value)
+        finally:
+            archive.close()
+    path.unlink(missing_ok=True)
+
+
+def reset():
+    """서버 시작 시 이전 실행의 지표 파일을 지움"""
+    global _writer
+    with _lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+        for path in metrics_dir().glob('metrics_*.db'):
+            path.unlink(missing_ok=True)
+
+
+# 요청 처리 (core.middleware.MetricsMiddleware)
+requests_total = Counter('http_requests_total', 'URL 이름/메서드/상태 코드별 요청 수')
+request_duration = Histogram(
+    'http_request_duration_seconds', 'URL 이름별 응답 시간(초)',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+db_queries_total = Counter('db_queries_total', 'URL 이름별 실행한 SQL 쿼리 수')
+
+# 애플리케이션 캐시 (hit / miss)
+cache_requests_total = Counter('cache_requests_total', '캐시 이름별 조회 결과(hit/miss) 수')
+
+# 영수증 업로드
+receipt_upload_bytes = Histogram(
+    'receipt_upload_bytes', '업로드된 영수증 파일 크기(바이트)',
+    buckets=(50_000, 200_000, 500_000, 1_000_000, 2_000_000, 5_000_000, 10_000_000),
+)
+
+
+def record_cache(name, hit):
+    cache_requests_total.inc(cache=name, result='hit' if hit else 'miss')
@@ -0,0 +1,158 @@
+"""
+요청별 SQL/처리 시간 계측 미들웨어.
+
+RequestTimingMiddleware - 개별 요청 진단용
+
+요청마다 SQL 쿼리 수, DB 시간, 뷰 시간, 템플릿 렌더링 시간을 재서
+- Server-Timing 응답 헤더(브라우저 개발자 도구 Network > Timing에서 확인)
+- 'core.timing' 로거의 JSON 한 줄 로그
+로 남깁니다. Server-Timing 헤더는 쿼리 수와 처리 시간을 드러내므로 DEBUG이거나
+스태프 사용자의 요청에만 붙입니다. 한 요청에서 같은 SQL이 REQUEST_TIMING_REPEAT_THRESHOLD번 이상 실행되면
+N+1 의심으로 WARNING 로그를 남깁니다.
+
+REQUEST_TIMING=0이면 MiddlewareNotUsed로 미들웨어 목록에서 빠지므로 추가 비용이 없습니다.
+뷰 시간에는 render()로 직접 그린 템플릿이 포함되고, 템플릿 렌더링 시간은
+TemplateResponse(클래스 기반 뷰)가 뷰 다음에 렌더링되는 시간입니다.
+
+MetricsMiddleware - 워커 전체 집계용
+URL 이름별 요청 수/응답 시간 히스토그램/쿼리 수를 core.metrics에 더합니다. (METRICS_ENABLED=0이면 빠짐)
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from . import metrics
+
+logger = logging.getLogger('core.timing')
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+class QueryRecorder:
+    """connection.execute_wrapper로 실행된 SQL의 수와 시간을 기록"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            # 값은 params로 따로 전달되므로 sql 자체가 쿼리의 형태(템플릿)
+            self.statements[sql] += 1
+
+    def repeated(self, threshold):
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = settings.REQUEST_TIMING_REPEAT_THRESHOLD
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._timing = {'view_started': None, 'view_finished': None}
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        marks = request._timing
+        view = render = 0.0
+        if marks['view_started'] is not None:
+            view_finished = marks['view_finished'] or finished
+            view = view_finished - marks['view_started']
+            if marks['view_finished'] is not None:
+                render = finished - marks['view_finished']
+        self.report(request, response, recorder, finished - started, view, render)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timing['view_started'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # 이 다음에 TemplateResponse가 렌더링됨
+        request._timing['view_finished'] = time.perf_counter()
+        return response
+
+    def report(self, request, response, recorder, total, view, render):
+        if settings.DEBUG or getattr(getattr(request, 'user', None), 'is_staff', False):
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={_ms(recorder.duration)};desc="{recorder.count} queries"',
+                f'view;dur={_ms(view)}',
+                f'render;dur={_ms(render)}',
+                f'total;dur={_ms(total)}',
+            ])
+
+        repeated = recorder.repeated(self.threshold)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            # 이미 조회된 사용자만 기록 (여기서 새로 조회하지 않음)
+            'user_id': getattr(getattr(request, '_cached_user', None), 'pk', None),
+            'queries': recorder.count,
+            'db_ms': _ms(recorder.duration),
+            'view_ms': _ms(view),
+            'render_ms': _ms(render),
+            'total_ms': _ms(total),
+            'repeated_queries': len(repeated),
+        }
+        logger.info(json.dumps(record, ensure_ascii=False))
+        for sql, count in repeated:
+            logger.warning(json.dumps({
+                'event': 'repeated_query',
+                'path': request.path,
+                'count': count,
+                'sql': sql[:500],
+            }, ensure_ascii=False))
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        # 경로 대신 URL 이름을 써서 레이블 수가 URL 패턴 수로 제한되도록 함
+        match = request.resolver_match
+        view = (match.view_name if match else None) or 'unmatched'
+        metrics.requests_total.inc(view=view, method=request.method, status=str(response.status_code))
+        metrics.request_duration.observe(duration, view=view)
+        metrics.db_queries_total.inc(counter.count, view=view)
+        return response
+
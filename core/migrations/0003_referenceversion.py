@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_dataversion_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceVersion',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='이름')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='버전')),
+            ],
+            options={
+                'verbose_name': '참조 데이터 버전',
+                'verbose_name_plural': '참조 데이터 버전 목록',
+            },
+        ),
+    ]
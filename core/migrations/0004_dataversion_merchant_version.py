@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 19:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_referenceversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataversion',
+            name='merchant_version',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='가맹점 목록 버전'),
+        ),
+    ]
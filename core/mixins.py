@@ -1,5 +1,14 @@
+import hashlib
+from datetime import datetime, time
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from .versioning import get_data_state, get_reference_versions
 
 class UserOwnershipMixin(LoginRequiredMixin):
     """
@@ -22,7 +31,78 @@ class UserOwnershipMixin(LoginRequiredMixin):
             return obj
             
         # 2. 일반 사용자는 객체의 소유권을 확인
-        if hasattr(obj, 'user') and obj.user != self.request.user:
+        # user_id로 비교하면 소유자(User)를 다시 조회하지 않아도 됩니다.
+        if hasattr(obj, 'user_id') and obj.user_id != self.request.user.pk:
             raise PermissionDenied("이 데이터에 접근할 권한이 없습니다.")
             
-        return obj
\ No newline at end of file
+        return obj
+
+
+class AtomicWriteMixin:
+    """
+    등록/수정/삭제 요청(POST) 처리 전체를 한 DB 트랜잭션으로 묶는 믹스인.
+    저장과 함께 시그널이 하는 파생 데이터 갱신(데이터 버전, 월간 집계, 계좌 잔액)과 영수증 연결까지
+    모두 커밋되거나, 중간에 실패하면 모두 롤백됩니다. LoginRequiredMixin/UserOwnershipMixin 뒤에 둡니다.
+    """
+
+    def post(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().post(request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    로그인한 사용자의 화면에 ETag/Last-Modified를 붙이고, 브라우저가 가진 화면과 같으면
+    뷰 본문(집계 쿼리, 템플릿 렌더링)을 실행하지 않고 304로 응답하는 믹스인.
+    LoginRequiredMixin/UserOwnershipMixin 뒤에 둡니다.
+
+    ETag는 화면을 결정하는 값만으로 계산하므로 DB 조회는 사용자 데이터 버전과 참조 데이터 버전(core.versioning)뿐입니다.
+    - 사용자, 데이터 버전, 참조 데이터 버전, 배포 식별자(RELEASE_VERSION)
+    - 요청 URL(쿼리스트링 포함), 오늘 날짜('이번 달' 등), CSRF 쿠키
+    뷰가 그 밖의 값에 따라 달라지면 get_etag_parts()에 더합니다.
+    관리자(전체 사용자 데이터를 봄)와 보여 줄 메시지가 남은 요청에는 적용하지 않습니다.
+    읽은 데이터 버전은 data_version에 남겨 두므로 뷰의 cached_for_user(version=...)에 넘기면 다시 조회하지 않습니다.
+    """
+    data_version = None
+
+    def get_etag_parts(self):
+        return []
+
+    def get_conditional_headers(self):
+        """(ETag, Last-Modified), 적용하지 않는 요청이면 None"""
+        request = self.request
+        user = request.user
+        if request.method not in ('GET', 'HEAD') or not user.is_authenticated or user.is_superuser:
+            return None
+        if len(messages.get_messages(request)):
+            # 메시지는 한 번 보여 주면 사라져야 하므로 다시 렌더링
+            return None
+
+        version, updated_at = get_data_state(user.pk)
+        self.data_version = version
+        today = timezone.localdate()
+        parts = [
+            settings.RELEASE_VERSION, user.pk, user.username, version, *sorted(get_reference_versions().items()),
+            request.get_full_path(), today, request.META.get('CSRF_COOKIE', ''), *self.get_etag_parts(),
+        ]
+        etag = quote_etag(hashlib.sha256(repr(parts).encode()).hexdigest()[:32])
+        # 날짜가 바뀌면 내용도 바뀔 수 있으므로 오늘 0시보다 이르게 두지 않음
+        start_of_day = timezone.make_aware(datetime.combine(today, time.min))
+        last_modified = max(updated_at, start_of_day) if updated_at else start_of_day
+        return etag, int(last_modified.timestamp())
+
+    def dispatch(self, request, *args, **kwargs):
+        headers = self.get_conditional_headers()
+        if headers is None:
+            return super().dispatch(request, *args, **kwargs)
+        etag, last_modified = headers
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # 저장은 브라우저에만, 쓸 때마다 재검증
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
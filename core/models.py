@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class DataVersion(models.Model):
+    """
+    사용자 데이터 버전 (거래/여행/계좌/영수증이 바뀔 때마다 1씩 증가, core.versioning 참고).
+    merchant_version은 가맹점 자동완성 목록의 버전 (거래가 바뀔 때만 증가, apps.transactions.merchants 참고).
+    사용자를 지울 때 거래 삭제 시그널이 버전을 다시 올리므로 FK 제약 없이 두고, 사용자 삭제 후 정리합니다.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name='+',
+    )
+    version = models.PositiveBigIntegerField(default=0, verbose_name='버전')
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name='변경일시')
+    merchant_version = models.PositiveBigIntegerField(default=0, verbose_name='가맹점 목록 버전')
+
+    class Meta:
+        verbose_name = '데이터 버전'
+        verbose_name_plural = '데이터 버전 목록'
+
+    def __str__(self):
+        return f"{self.user_id}: {self.version}"
+
+
+class ReferenceVersion(models.Model):
+    """참조 데이터(카테고리/국가/도시) 버전 (저장/삭제할 때마다 올라감, core.versioning 참고)"""
+    name = models.CharField(max_length=100, primary_key=True, verbose_name='이름')
+    version = models.PositiveBigIntegerField(default=0, verbose_name='버전')
+
+    class Meta:
+        verbose_name = '참조 데이터 버전'
+        verbose_name_plural = '참조 데이터 버전 목록'
+
+    def __str__(self):
+        return f"{self.name}: {self.version}"
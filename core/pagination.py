@@ -0,0 +1,152 @@
+import base64
+import json
+from datetime import datetime
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(direction, obj):
+    raw = json.dumps([direction, obj.occurred_at.isoformat(), obj.pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, occurred_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ('next', 'prev'):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(occurred_at), int(pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+class KeysetPaginator:
+    """
+    (occurred_at, id) 기준 커서(keyset) 페이지네이터.
+    OFFSET 대신 마지막으로 본 행 이후를 조회하므로 몇 번째 페이지든 비용이 같고,
+    그 사이에 새 거래가 추가되어도 이전/다음 링크가 밀리지 않습니다.
+    count=False(기본)이면 COUNT(*)를 실행하지 않습니다.
+    """
+
+    def __init__(self, queryset, per_page, count=False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.with_count = count
+
+    @cached_property
+    def count(self):
+        if not self.with_count:
+            return None
+        return self.queryset.order_by().count()
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._page(self.queryset.order_by('-occurred_at', '-id'), 'first')
+
+        direction, occurred_at, pk = decode_cursor(cursor)
+        if direction == 'next':
+            queryset = self.queryset.filter(
+                Q(occurred_at__lt=occurred_at) | Q(occurred_at=occurred_at, id__lt=pk)
+            ).order_by('-occurred_at', '-id')
+        else:
+            queryset = self.queryset.filter(
+                Q(occurred_at__gt=occurred_at) | Q(occurred_at=occurred_at, id__gt=pk)
+            ).order_by('occurred_at', 'id')
+        return self._page(queryset, direction)
+
+    def _page(self, queryset, direction):
+        # 한 행을 더 가져와서 다음 페이지 존재 여부를 COUNT 없이 판단
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == 'prev':
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=direction == 'next')
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next and bool(object_list)
+        self._has_previous = has_previous and bool(object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_cursor('next', self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return encode_cursor('prev', self.object_list[0])
+        return None
+
+
+class KeysetPaginationMixin:
+    """
+    ListView용 커서 페이지네이션 믹스인.
+    ?page=N 으로 요청하면 기존 OFFSET 페이지네이션을 그대로 사용하고, 이전/다음 링크도 페이지 번호로 만듭니다.
+    (템플릿에는 어느 쪽이든 next_page_query/previous_page_query로 전달)
+    """
+    cursor_kwarg = 'cursor'
+    keyset_count = False  # True이면 전체 건수(COUNT)를 함께 계산
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, count=self.keyset_count)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404('잘못된 페이지 커서입니다.')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if isinstance(page, KeysetPage):
+            context['next_page_query'] = self._page_query(self.cursor_kwarg, page.next_cursor)
+            context['previous_page_query'] = self._page_query(self.cursor_kwarg, page.previous_cursor)
+        elif page is not None:
+            context['next_page_query'] = self._page_query(
+                self.page_kwarg, page.next_page_number() if page.has_next() else None
+            )
+            context['previous_page_query'] = self._page_query(
+                self.page_kwarg, page.previous_page_number() if page.has_previous() else None
+            )
+        return context
+
+    def _page_query(self, kwarg, value):
+        """현재 쿼리스트링(필터 포함)에서 페이지 위치만 바꾼 쿼리스트링"""
+        if value is None:
+            return None
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        query.pop(self.page_kwarg, None)
+        query[kwarg] = value
+        return query.urlencode()
@@ -0,0 +1,125 @@
+"""
+참조 데이터(카테고리, 국가, 도시 등) 레지스트리.
+
+작고 거의 바뀌지 않는 테이블을 워커 프로세스마다 한 번만 읽어(정렬까지 적용해) 메모리에 두고,
+폼의 선택지 렌더링과 값 검증을 DB 조회 없이 처리합니다.
+
+- 저장/삭제 시그널이 같은 트랜잭션에서 DB의 참조 데이터 버전(core.versioning)을 올리면,
+  각 워커는 다음 요청에서 버전이 바뀐 것을 보고 다시 읽습니다. (버전 조회는 요청마다 한 번)
+- 스냅샷에 없는 pk는 DB에서 한 번 더 찾으므로, 방금 추가된 항목도 검증에서 거절되지 않습니다.
+- gunicorn --preload(gunicorn.conf.py)에서는 마스터가 warm_all()로 미리 읽어 두므로 워커가 fork 시 그대로 공유합니다.
+"""
+import copy
+import threading
+from django.db.models.signals import post_delete, post_save
+from django import forms
+from django.forms.models import ModelChoiceIterator
+from .fixtures import fixture_loaded
+from .versioning import bump_reference_version, get_reference_version
+
+_tables = {}
+
+
+class ReferenceTable:
+    """한 참조 테이블의 프로세스 내 스냅샷"""
+
+    def __init__(self, model, get_queryset=None):
+        self.model = model
+        self.get_queryset = get_queryset or (lambda: model._default_manager.all())
+        self.version_name = model._meta.label_lower
+        self._lock = threading.Lock()
+        self._snapshot = None  # (버전, 객체 목록, {pk: 객체})
+        _tables[model] = self
+        post_save.connect(self.invalidate, sender=model, weak=False)
+        post_delete.connect(self.invalidate, sender=model, weak=False)
+        fixture_loaded.connect(self.invalidate, sender=model, weak=False)
+
+    def invalidate(self, **kwargs):
+        bump_reference_version(self.version_name)
+
+    def _load(self):
+        version = get_reference_version(self.version_name)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == version:
+            return snapshot
+        with self._lock:
+            if self._snapshot is not snapshot:
+                # 다른 스레드가 먼저 다시 읽음
+                return self._snapshot
+            objects = list(self.get_queryset())
+            self._snapshot = (version, objects, {obj.pk: obj for obj in objects})
+            return self._snapshot
+
+    def all(self):
+        """정렬된 전체 객체 목록 (공유 객체이므로 수정하지 말 것)"""
+        return self._load()[1]
+
+    def get(self, pk):
+        """pk로 찾은 객체의 복사본, 스냅샷에 없으면 DB에서 찾고 그래도 없으면 None"""
+        obj = self._load()[2].get(pk)
+        if obj is None:
+            return self.get_queryset().filter(pk=pk).first()
+        return copy.copy(obj)
+
+
+def table_for(model):
+    return _tables[model]
+
+
+def warm_all():
+    """등록된 모든 참조 테이블을 미리 읽음"""
+    for table in _tables.values():
+        table.all()
+
+
+class ReferenceChoiceIterator(ModelChoiceIterator):
+    """queryset 대신 ReferenceTable의 객체로 선택지를 만드는 반복자"""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in self.field.reference_objects():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.reference_objects()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.reference_objects())
+
+
+class ReferenceChoiceField(forms.ModelChoiceField):
+    """
+    선택지와 값 검증을 ReferenceTable에서 처리하는 ModelChoiceField.
+    전달된 queryset은 모델을 찾는 데만 쓰고, 필드의 queryset은 테이블과 같은 정렬의 (평가되지 않는) 쿼리셋이 됩니다.
+    """
+    iterator = ReferenceChoiceIterator
+
+    def __init__(self, queryset, *args, **kwargs):
+        self.table = table_for(queryset.model)
+        super().__init__(self.table.get_queryset(), *args, **kwargs)
+
+    def reference_objects(self):
+        """선택지로 보여줄 객체 목록"""
+        return self.table.all()
+
+    def is_allowed(self, obj):
+        """reference_objects()를 좁히는 하위 클래스에서 검증도 함께 좁힐 때 재정의"""
+        return True
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            return value
+        try:
+            obj = self.table.get(int(value))
+        except (TypeError, ValueError):
+            obj = None
+        if obj is None or not self.is_allowed(obj):
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
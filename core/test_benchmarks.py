@@ -0,0 +1,99 @@
+"""
+주요 화면의 성능 벤치마크 (기본 테스트 실행에서는 제외).
+
+    python manage.py test --tag benchmark                      # 거래 1천 건
+    BENCHMARK_SIZE=100k python manage.py test --tag benchmark  # 10만 건 (1m: 100만 건)
+    BENCHMARK_REPEAT=50 ...                                    # warm 요청 반복 횟수
+
+예산(BUDGETS)은 뷰마다 cold 요청의 쿼리 수와 데이터 크기별 warm p95 지연 시간(ms)입니다.
+쿼리 수는 데이터 크기와 무관해야 하므로 모든 크기에 같은 값을 씁니다.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from datetime import date
+
+from django.test import TestCase, tag
+from django.urls import reverse
+
+from apps.transactions.tests.utils import (
+    make_account,
+    make_category,
+    make_city,
+    make_country,
+    make_transactions,
+    make_trip,
+    make_user,
+)
+from core.benchmarks import REPORT_HEADER, Budget, benchmark_size, measure
+
+# 예산은 현재 측정값에 여유를 둔 값입니다. 여행 상세(거래 목록)는 아직 거래 건수에 비례해
+# 느려지므로 크기별 예산이 다르고, 개선하면 함께 낮춥니다. 대시보드는 데이터 버전 단위로
+# 캐시되어 warm 요청이 건수와 무관합니다. (cold 요청의 여행별 지출 합계는 아직 비례)
+BUDGETS = {
+    "dashboard": Budget(queries=8, p95_ms={"1k": 30, "100k": 30, "1m": 30}),
+    "main": Budget(queries=10, p95_ms={"1k": 30, "100k": 30, "1m": 30}),
+    "transaction_list": Budget(queries=12, p95_ms={"1k": 80, "100k": 80, "1m": 80}),
+    "transaction_search": Budget(queries=12, p95_ms={"1k": 50, "100k": 50, "1m": 50}),
+    "transaction_search_relevance": Budget(queries=13, p95_ms={"1k": 50, "100k": 50, "1m": 50}),
+    "trip_detail": Budget(queries=7, p95_ms={"1k": 60, "100k": 120, "1m": 600}),
+    "account_detail": Budget(queries=8, p95_ms={"1k": 40, "100k": 40, "1m": 40}),
+}
+
+
+@tag("benchmark")
+class ViewBenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.size_name, count = benchmark_size()
+        started = time.monotonic()
+        cls.user = make_user("bench")
+        cls.account = make_account(cls.user)
+        country = make_country("일본")
+        cls.trips = [
+            make_trip(cls.user, name=f"여행{i}", start_date=date(2025, i, 1), country=country,
+                      city=make_city(country, f"도시{i}"))
+            for i in range(1, 4)
+        ]
+        categories = [make_category(name) for name in ("식비", "교통", "숙박", "쇼핑", "급여")]
+        make_transactions(
+            user=cls.user, account=cls.account, categories=categories, count=count, trips=cls.trips
+        )
+        sys.stderr.write(
+            f"\n[benchmark] 거래 {count:,}건 ({cls.size_name}) 생성 {time.monotonic() - started:.1f}초\n"
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def run_benchmark(self, name, url):
+        result = measure(self.client, name, url)
+        sys.stderr.write(f"\n{REPORT_HEADER}\n{result.row()}\n")
+        problems = result.violations(BUDGETS[name], self.size_name)
+        self.assertFalse(problems, f"{name}: " + ", ".join(problems))
+
+    def test_dashboard(self):
+        self.run_benchmark("dashboard", reverse("dashboard:index"))
+
+    def test_main(self):
+        self.run_benchmark("main", reverse("index"))
+
+    def test_transaction_list(self):
+        self.run_benchmark("transaction_list", reverse("transaction_list"))
+
+    def test_transaction_search(self):
+        # 가맹점 500곳 중 하나 (전체 거래의 0.2%), 요약은 캐시되므로 목록 페이지 조회 시간
+        self.run_benchmark("transaction_search", reverse("transaction_list") + "?q=가맹점123")
+
+    def test_transaction_search_relevance(self):
+        # 관련도 순: 검색 테이블 조인으로 순위를 매기고 페이지 번호 방식(COUNT 포함)
+        self.run_benchmark(
+            "transaction_search_relevance", reverse("transaction_list") + "?q=가맹점123&sort=relevance"
+        )
+
+    def test_trip_detail(self):
+        self.run_benchmark("trip_detail", reverse("trip_detail", args=[self.trips[0].pk]))
+
+    def test_account_detail(self):
+        self.run_benchmark("account_detail", reverse("account_detail", args=[self.account.pk]))
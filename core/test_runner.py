@@ -0,0 +1,30 @@
+import logging
+import shutil
+import tempfile
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+BENCHMARK_TAG = 'benchmark'
+
+
+class TestRunner(DiscoverRunner):
+    """
+    기본 테스트 실행에서 벤치마크(@tag('benchmark'))는 제외합니다.
+    벤치마크는 --tag benchmark로 지정했을 때만 실행됩니다.
+    """
+
+    def __init__(self, *args, tags=None, exclude_tags=None, **kwargs):
+        if BENCHMARK_TAG not in (tags or []):
+            exclude_tags = [*(exclude_tags or []), BENCHMARK_TAG]
+        super().__init__(*args, tags=tags, exclude_tags=exclude_tags, **kwargs)
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        # 요청마다 남는 계측 로그가 테스트 출력을 덮지 않도록 (assertLogs로는 그대로 확인 가능)
+        logging.getLogger('core.timing').setLevel(logging.ERROR)
+        # 지표 파일은 실행마다 별도 임시 디렉터리에 기록 (core.metrics)
+        self._metrics_dir = settings.METRICS_DIR = tempfile.mkdtemp(prefix='travelbank-metrics-')
+
+    def teardown_test_environment(self, **kwargs):
+        super().teardown_test_environment(**kwargs)
+        shutil.rmtree(self._metrics_dir, ignore_errors=True)
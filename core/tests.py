@@ -0,0 +1,497 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.core.cache import cache
+import json
+import os
+import multiprocessing
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.db import transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.transactions.forms import TransactionFilterForm
+from apps.transactions.models import Category, Receipt, ReceiptBlob, Transaction
+from apps.trips.models import City, Country, Trip
+from apps.transactions.refdata import categories
+from apps.transactions.tests.utils import make_user, make_account, make_category, make_tx
+from core.aggregates import summarize
+from core.benchmarks import Budget, Result, percentile
+from core import metrics
+from core.ahocorasick import Automaton
+from core.fixtures import iter_json_array
+from core.middleware import RequestTimingMiddleware
+from core.models import DataVersion, ReferenceVersion
+from core.versioning import bump_data_version, cached_for_user, get_data_version, pinned_reference_versions
+
+
+class SummarizeTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1")
+        account = make_account(self.user)
+        self.food = make_category("식비")
+        self.salary = make_category("급여")
+        make_tx(user=self.user, account=account, category=self.food, amount=Decimal("3000"))
+        make_tx(user=self.user, account=account, category=self.food, amount=Decimal("2000"))
+        make_tx(user=self.user, account=account, category=self.salary, tx_type="income", amount=Decimal("10000"))
+
+    def test_totals_in_single_query(self):
+        with self.assertNumQueries(1):
+            summary = summarize(Transaction.objects.filter(user=self.user))
+        self.assertEqual(summary["total_income"], Decimal("10000"))
+        self.assertEqual(summary["total_expense"], Decimal("5000"))
+        self.assertEqual(summary["net_amount"], Decimal("5000"))
+        self.assertEqual(summary["transaction_count"], 3)
+
+    def test_category_breakdown_in_single_query(self):
+        with self.assertNumQueries(1):
+            summary = summarize(Transaction.objects.filter(user=self.user), by_category=True)
+        self.assertEqual(summary["transaction_count"], 3)
+        self.assertEqual(summary["net_amount"], Decimal("5000"))
+        food = summary["categories"][0]
+        self.assertEqual(food["category__name"], "식비")
+        self.assertEqual(food["total_expense"], Decimal("5000"))
+        self.assertEqual(food["total_income"], 0)
+        self.assertEqual(food["transaction_count"], 2)
+
+    def test_empty_queryset_returns_zero(self):
+        summary = summarize(Transaction.objects.none())
+        self.assertEqual(summary["total_income"], 0)
+        self.assertEqual(summary["net_amount"], 0)
+        self.assertEqual(summary["transaction_count"], 0)
+
+
+class ReferenceTableTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_category("기타")
+        make_category("식비")
+        make_category("교통")
+
+    def test_snapshot_is_ordered_and_reused(self):
+        self.assertEqual([c.name for c in categories.all()], ["교통", "식비", "기타"])
+        with pinned_reference_versions():
+            categories.all()
+            # 요청 안에서는 버전도 한 번만 읽음
+            with self.assertNumQueries(0):
+                categories.all()
+                form = TransactionFilterForm()
+                html = str(form["category"])
+        self.assertLess(html.index("식비"), html.index("기타"))
+
+    def test_save_and_delete_invalidate_snapshot(self):
+        categories.all()
+        make_category("숙박")
+        self.assertIn("숙박", [c.name for c in categories.all()])
+
+        Category.objects.get(name="교통").delete()
+        self.assertNotIn("교통", [c.name for c in categories.all()])
+
+    def test_choice_field_validates_against_snapshot(self):
+        food = Category.objects.get(name="식비")
+        form = TransactionFilterForm(data={"category": str(food.pk)})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["category"], food)
+
+        form = TransactionFilterForm(data={"category": "999999"})
+        self.assertFalse(form.is_valid())
+        self.assertIn("category", form.errors)
+
+    def test_choice_field_falls_back_to_db(self):
+        # 다른 워커가 방금 추가해 이 워커의 스냅샷에는 아직 없는 경우 (시그널 없이 저장)
+        categories.all()
+        Category.objects.bulk_create([Category(name="숙박")])
+        lodging = Category.objects.get(name="숙박")
+        form = TransactionFilterForm(data={"category": str(lodging.pk)})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["category"], lodging)
+
+    def test_version_is_kept_in_db_and_rolls_back(self):
+        categories.all()
+        with transaction.atomic():
+            make_category("숙박")
+            self.assertIn("숙박", [c.name for c in categories.all()])
+            transaction.set_rollback(True)
+        self.assertNotIn("숙박", [c.name for c in categories.all()])
+
+        make_category("숙박")
+        self.assertTrue(ReferenceVersion.objects.filter(name="transactions.category").exists())
+        self.assertIn("숙박", [c.name for c in categories.all()])
+
+
+class BenchmarkBudgetTests(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 21))
+        self.assertEqual(percentile(values, 50), 10)
+        self.assertEqual(percentile(values, 95), 19)
+        self.assertEqual(percentile([5], 95), 5)
+
+    def test_violations(self):
+        budget = Budget(queries=3, p95_ms={"1k": 50})
+        result = Result("view", 200, cold_queries=4, warm_queries=2, timings_ms=[10.0] * 19 + [80.0])
+        self.assertEqual(len(result.violations(budget, "1k")), 1)  # p95는 19번째 값 10ms
+        self.assertEqual(result.violations(budget, "100k"), ["쿼리 4개 > 예산 3개"])
+        result.timings_ms = [80.0] * 20
+        self.assertEqual(len(result.violations(budget, "1k")), 2)
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.categories = [make_category(f"카테고리{i}") for i in range(6)]
+
+    def call(self, view, user=None):
+        middleware = RequestTimingMiddleware(view)
+        request = RequestFactory().get("/some/path/")
+        request.user = user or AnonymousUser()
+        with self.assertLogs("core.timing", "INFO") as logs:
+            response = middleware(request)
+        return response, [json.loads(record.getMessage()) for record in logs.records]
+
+    def test_server_timing_and_log(self):
+        def view(request):
+            list(Category.objects.all())
+            return HttpResponse("ok")
+
+        response, records = self.call(view, user=User.objects.create_user("staff", password="pass1234!", is_staff=True))
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertEqual(records[0]["path"], "/some/path/")
+        self.assertEqual(records[0]["queries"], 1)
+        self.assertEqual(records[0]["repeated_queries"], 0)
+
+    def test_repeated_queries_flagged(self):
+        def view(request):
+            for category in self.categories:
+                Category.objects.get(pk=category.pk)
+            return HttpResponse("ok")
+
+        response, records = self.call(view)
+        self.assertEqual(records[0]["queries"], 6)
+        self.assertEqual(records[1]["event"], "repeated_query")
+        self.assertEqual(records[1]["count"], 6)
+
+    def test_header_only_for_staff_or_debug(self):
+        response, records = self.call(lambda request: HttpResponse("ok"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(len(records), 1)  # 로그는 그대로 남김
+        with override_settings(DEBUG=True):
+            response, records = self.call(lambda request: HttpResponse("ok"))
+        self.assertIn("Server-Timing", response)
+
+    def test_through_client(self):
+        user = make_user("timing")
+        self.client.force_login(user)
+        response = self.client.get(reverse("transaction_list"))
+        self.assertNotIn("Server-Timing", response)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get(reverse("transaction_list"))
+        self.assertIn("render;dur=", response["Server-Timing"])
+
+    @override_settings(REQUEST_TIMING=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: HttpResponse())
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(METRICS_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(metrics.reset)
+        metrics.reset()
+
+    def sample(self, text, line_start):
+        for line in text.splitlines():
+            if line.startswith(line_start):
+                return float(line.rsplit(" ", 1)[1])
+        return None
+
+    def test_values_survive_growth_and_reopen(self):
+        path = metrics.metrics_dir() / "metrics_test.db"
+        values = metrics.MmapValues(path)
+        for i in range(3000):  # 초기 크기(64KB)를 넘도록
+            values.inc(f"key-{i}", i)
+        values.inc("key-1", 1)
+        values.close()
+        read = metrics.read_values(path)
+        self.assertEqual(len(read), 3000)
+        self.assertEqual(read["key-1"], 2)
+        self.assertEqual(read["key-2999"], 2999)
+
+    def test_counts_from_multiple_processes_are_summed(self):
+        metrics.requests_total.inc(view="v", method="GET", status="200")
+        context = multiprocessing.get_context("fork")
+        labels = {"view": "v", "method": "GET", "status": "200"}
+        children = [
+            context.Process(target=metrics.requests_total.inc, kwargs={"amount": 2, **labels})
+            for _ in range(2)
+        ]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join()
+        text = metrics.render_prometheus()
+        self.assertEqual(self.sample(text, 'http_requests_total{method="GET",status="200",view="v"}'), 5)
+        self.assertEqual(len(list(metrics.metrics_dir().glob("metrics_*.db"))), 3)
+
+        # 종료된 프로세스의 값은 보관 파일로 합쳐도 그대로
+        for child in children:
+            metrics.archive_process(child.pid)
+        text = metrics.render_prometheus()
+        self.assertEqual(self.sample(text, 'http_requests_total{method="GET",status="200",view="v"}'), 5)
+        self.assertEqual(len(list(metrics.metrics_dir().glob("metrics_*.db"))), 2)
+
+    def test_histogram_buckets_are_cumulative(self):
+        for value in (0.003, 0.03, 0.03, 20):
+            metrics.request_duration.observe(value, view="v")
+        text = metrics.render_prometheus()
+        self.assertEqual(self.sample(text, 'http_request_duration_seconds_bucket{le="0.005",view="v"}'), 1)
+        self.assertEqual(self.sample(text, 'http_request_duration_seconds_bucket{le="0.05",view="v"}'), 3)
+        self.assertEqual(self.sample(text, 'http_request_duration_seconds_bucket{le="10",view="v"}'), 3)
+        self.assertEqual(self.sample(text, 'http_request_duration_seconds_bucket{le="+Inf",view="v"}'), 4)
+        self.assertEqual(self.sample(text, 'http_request_duration_seconds_count{view="v"}'), 4)
+
+    def test_endpoint_is_protected_and_reports_views(self):
+        user = make_user("metrics")
+        self.client.force_login(user)
+        self.client.get(reverse("transaction_list"))
+        self.client.get(reverse("transaction_list"))
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        text = self.client.get(reverse("metrics")).content.decode()
+        self.assertEqual(self.sample(text, 'http_requests_total{method="GET",status="200",view="transaction_list"}'), 2)
+        self.assertEqual(self.sample(text, 'cache_requests_total{cache="transactions:summary",result="hit"}'), 1)
+        self.assertEqual(self.sample(text, 'cache_requests_total{cache="transactions:summary",result="miss"}'), 1)
+        self.assertGreater(self.sample(text, 'db_queries_total{view="transaction_list"}'), 0)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_endpoint_accepts_bearer_token(self):
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE http_request_duration_seconds histogram", response.content.decode())
+
+
+class FixtureLoaderTests(TestCase):
+    FIXTURE = [
+        {"model": "auth.group", "pk": 1, "fields": {"name": "여행자", "permissions": []}},
+        {"model": "auth.user", "fields": {
+            "username": "fixture", "password": "x", "email": "", "is_superuser": False, "is_staff": False,
+            "is_active": True, "date_joined": "2026-01-01T00:00:00Z", "groups": [1], "user_permissions": [],
+        }},
+        {"model": "transactions.transaction", "pk": 10, "fields": {
+            "user": ["fixture"], "account": 5, "trip": None, "category": 3, "transaction_type": "expense",
+            "amount": "12000", "occurred_at": "2026-02-01T03:00:00Z", "merchant": "가맹점", "memo": "",
+            "created_at": "2026-02-01T03:00:00Z", "updated_at": "2026-02-02T03:00:00Z",
+        }},
+        {"model": "accounts.account", "pk": 5, "fields": {
+            "user": ["fixture"], "name": "계좌", "bank_name": "은행", "account_number": "1",
+            "is_active": True, "created_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-01T00:00:00Z",
+        }},
+        {"model": "transactions.category", "pk": 3, "fields": {
+            "name": "픽스처", "description": "", "created_at": "2026-01-01T00:00:00Z",
+        }},
+        {"model": "trips.city", "pk": 7, "fields": {"name": "São Paulo", "country": 2}},
+        {"model": "trips.country", "pk": 2, "fields": {"name": "브라질"}},
+    ]
+
+    def write_fixture(self, entries):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as fileobj:
+            json.dump(entries, fileobj, ensure_ascii=False)
+        self.addCleanup(os.remove, fileobj.name)
+        return fileobj.name
+
+    def load(self, *paths, **options):
+        out = StringIO()
+        call_command("bulkloaddata", *paths, stdout=out, **options)
+        return out.getvalue()
+
+    def test_iter_json_array_across_chunks(self):
+        text = json.dumps(self.FIXTURE, ensure_ascii=False)
+        self.assertEqual(list(iter_json_array(StringIO(text), read_size=7)), self.FIXTURE)
+
+    def test_loads_in_dependency_order_with_natural_keys(self):
+        path = self.write_fixture(self.FIXTURE)
+        self.assertIn("객체 7개 설치", self.load(path))
+
+        user = User.objects.get(username="fixture")
+        tx = Transaction.objects.get(pk=10)
+        self.assertEqual(tx.user, user)
+        self.assertEqual(tx.account.user, user)
+        self.assertEqual(list(user.groups.values_list("name", flat=True)), ["여행자"])
+        # auto_now/auto_now_add 필드도 픽스처 값 그대로 (loaddata와 같음)
+        self.assertEqual(tx.updated_at.isoformat(), "2026-02-02T03:00:00+00:00")
+        self.assertEqual(City.objects.get(pk=7).search_name, "sao paulo")
+        from apps.dashboard.models import MonthlyRollup
+        self.assertEqual(MonthlyRollup.objects.get(user=user).total_amount, Decimal("12000"))
+
+    def test_reload_updates_existing_rows(self):
+        path = self.write_fixture(self.FIXTURE)
+        self.load(path)
+        changed = json.loads(json.dumps(self.FIXTURE))
+        changed[2]["fields"]["amount"] = "15000"
+        self.load(self.write_fixture(changed))
+        self.assertEqual(User.objects.filter(username="fixture").count(), 1)
+        self.assertEqual(Transaction.objects.get(pk=10).amount, Decimal("15000"))
+        # 새로 만드는 객체는 픽스처 pk 다음 번호부터
+        self.assertGreater(make_category("새 카테고리").pk, 3)
+
+    def test_unknown_field_and_exclude(self):
+        entries = self.FIXTURE + [{"model": "transactions.receipt", "pk": 1, "fields": {"file": "a.png"}}]
+        path = self.write_fixture(entries)
+        with self.assertRaises(CommandError):
+            self.load(path)
+        self.assertFalse(User.objects.filter(username="fixture").exists())
+        self.assertIn("객체 7개 설치", self.load(path, exclude=["transactions.receipt"]))
+
+    def test_repository_fixtures_load(self):
+        # README의 loaddata/bulkloaddata 안내가 저장소 픽스처로 그대로 동작해야 함
+        for name in ("seed_data.json", "data.json"):
+            for command in ("loaddata", "bulkloaddata"):
+                with self.subTest(name=name, command=command), transaction.atomic():
+                    call_command(command, settings.BASE_DIR / name, stdout=StringIO())
+                    receipt = Receipt.objects.select_related("blob").get(pk=1)
+                    self.assertEqual(receipt.blob.ref_count, 1)
+                    transaction.set_rollback(True)
+
+
+class AutomatonTests(SimpleTestCase):
+    def test_longest_match_wins(self):
+        automaton = Automaton([("he", 1), ("she", 2), ("hers", 3), ("his", 4)])
+        self.assertEqual(automaton.longest_match("ushers"), 3)
+        self.assertEqual(automaton.longest_match("ushe"), 2)
+        self.assertEqual(automaton.longest_match("this"), 4)
+        self.assertIsNone(automaton.longest_match("xyz"))
+
+    def test_empty_automaton(self):
+        automaton = Automaton([("", 1)])
+        self.assertFalse(automaton)
+        self.assertIsNone(automaton.longest_match("abc"))
+
+
+
+class DataVersionTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1")
+        self.account = make_account(self.user)
+        self.category = make_category()
+
+    def assertBumped(self, before):
+        after = get_data_version(self.user.pk)
+        self.assertGreater(after, before)
+        return after
+
+    def test_writes_bump_version(self):
+        version = self.assertBumped(0)
+        tx = make_tx(user=self.user, account=self.account, category=self.category)
+        version = self.assertBumped(version)
+        trip = Trip.objects.create(
+            user=self.user, name="여행", country=Country.objects.create(name="일본"), start_date="2026-03-01"
+        )
+        version = self.assertBumped(version)
+        blob = ReceiptBlob.objects.create(sha256="0" * 64, file="receipts/blobs/x.jpg", ref_count=1)
+        Receipt.objects.create(transaction=tx, blob=blob)
+        version = self.assertBumped(version)
+        trip.delete()
+        self.assertBumped(version)
+
+    def test_bump_rolls_back_with_write(self):
+        version = get_data_version(self.user.pk)
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            make_tx(user=self.user, account=self.account, category=self.category)
+            raise RuntimeError
+        self.assertEqual(get_data_version(self.user.pk), version)
+
+    def test_view_write_rolls_back_with_version(self):
+        version = get_data_version(self.user.pk)
+        self.client.force_login(self.user)
+        data = {
+            "account": self.account.pk, "category": self.category.pk, "transaction_type": "expense",
+            "amount": "5000", "occurred_at": "2026-02-01T12:00", "merchant": "가게", "memo": "",
+        }
+        # 저장(과 시그널) 뒤, 응답 전에 실패
+        with mock.patch("apps.transactions.views.messages.success", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse("transaction_create"), data)
+        self.assertFalse(Transaction.objects.filter(merchant="가게").exists())
+        self.assertEqual(get_data_version(self.user.pk), version)
+
+    def test_deleting_user_removes_version(self):
+        make_tx(user=self.user, account=self.account, category=self.category)
+        self.user.delete()
+        self.assertFalse(DataVersion.objects.exists())
+
+    def test_cached_for_user(self):
+        cache.clear()
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        self.assertEqual(cached_for_user(self.user.pk, "test", "k", compute), 1)
+        self.assertEqual(cached_for_user(self.user.pk, "test", "k", compute), 1)
+        bump_data_version(self.user.pk)
+        self.assertEqual(cached_for_user(self.user.pk, "test", "k", compute), 2)
+
+
+class ConditionalGetMixinTests(TestCase):
+    def setUp(self):
+        self.user = make_user("u1")
+        self.account = make_account(self.user)
+        self.category = make_category()
+        make_tx(user=self.user, account=self.account, category=self.category)
+        self.client.force_login(self.user)
+
+    def test_unchanged_page_is_not_rendered_again(self):
+        url = reverse("dashboard:index")
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        # 세션, 사용자, 데이터/참조 데이터 버전만 조회
+        with self.assertNumQueries(4):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+        make_tx(user=self.user, account=self.account, category=self.category)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_query_string(self):
+        url = reverse("transaction_list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, {"transaction_type": "income"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_pending_messages_are_rendered(self):
+        url = reverse("account_list")
+        self.client.post(reverse("account_create"), {"name": "비상금", "bank_name": "은행", "account_number": "111"})
+        # 계좌 등록 메시지가 남아 있으므로 어떤 ETag와도 304가 아님
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+        self.assertContains(response, "계좌가 등록되었습니다.")
+        self.assertNotIn("ETag", response)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH="*").status_code, 304)
+
+    def test_superuser_is_not_cached(self):
+        admin = User.objects.create_superuser("admin", "admin@example.com", "pass1234!")
+        self.client.force_login(admin)
+        response = self.client.get(reverse("account_list"))
+        self.assertNotIn("ETag", response)
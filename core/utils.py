@@ -1,5 +1,10 @@
 
 # ## 질문 : 실제 계좌번호 인증 API 연결을 어떻게 하지? PG사, Toss 에 연결
+import re
+import unicodedata
+from django.utils import timezone
+
+_PLAIN_TEXT = re.compile('[\x00-\x7f\uac00-\ud7a3]*')
 
 
 def mask_account_number(account_number):
@@ -32,3 +37,25 @@ def mask_account_number(account_number):
         suffix = account_number[8:]                      # 9번째 자리부터 끝
 
         return f"{prefix}{masked}{suffix}"
+
+
+def normalize_search_text(value):
+    """
+    검색용 정규화: 악센트 제거(São -> sao), 대소문자 통일, 연속 공백 정리.
+    한글은 자모로 분해했다가 다시 합치므로 그대로 유지됩니다.
+    """
+    value = value or ''
+    if _PLAIN_TEXT.fullmatch(value):
+        # ASCII와 완성형 한글만 있으면 분해/재조합해도 그대로이므로 생략 (대량 처리 시 대부분 이 경우)
+        return ' '.join(value.casefold().split())
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(unicodedata.normalize('NFC', stripped).casefold().split())
+
+
+def month_start(value):
+    """거래일시 -> 해당 월 1일 (TruncMonth와 같은 현재 타임존 기준)"""
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return timezone.localtime(value).date().replace(day=1)
+
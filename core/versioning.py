@@ -0,0 +1,144 @@
+"""
+버전 카운터.
+
+- get_reference_version/bump_reference_version: 참조 데이터 버전 (DB의 ReferenceVersion).
+  워커마다 메모리에 둔 참조 데이터 스냅샷(core.refdata, 도시 번들)이 다른 워커의 변경을 알아채는 데 씁니다.
+  요청 안에서는 모든 참조 데이터 버전을 처음 한 번만 읽습니다 (pinned_reference_versions).
+- get_data_version/bump_data_version: 사용자 데이터 버전 (DB의 DataVersion).
+  거래/여행/계좌/영수증의 저장/삭제 시그널에서 올립니다. Django는 post_save를 save()의 커밋 뒤에
+  보내므로, 쓰기는 트랜잭션 안에서 해야 버전도 같은 트랜잭션에 들어가 롤백되면 함께 되돌아갑니다.
+  (화면: core.mixins.AtomicWriteMixin, 파일 가져오기/일괄 분류/픽스처 로드: 각자 transaction.atomic)
+  집계 화면은 cached_for_user로 이 버전을 키에 넣어 캐시해, 사용자가 실제로 데이터를 바꾸기 전까지
+  다시 계산하지 않습니다.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from . import metrics
+from .models import DataVersion, ReferenceVersion
+
+DATA_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+# 요청 안에서 읽은 참조 데이터 버전 ([] = 아직 읽지 않음, None = 요청 밖이라 매번 읽음)
+_pinned_reference_versions = ContextVar('pinned_reference_versions', default=None)
+
+
+def get_reference_versions():
+    """{이름: 버전} - 한 번도 바뀐 적 없는 참조 데이터는 빠짐"""
+    pinned = _pinned_reference_versions.get()
+    if pinned:
+        return pinned[0]
+    versions = dict(ReferenceVersion.objects.values_list('name', 'version'))
+    if pinned is not None:
+        pinned.append(versions)
+    return versions
+
+
+def get_reference_version(name):
+    """참조 데이터 버전 (바뀐 적이 없으면 0)"""
+    return get_reference_versions().get(name, 0)
+
+
+def bump_reference_version(name):
+    """
+    참조 데이터 버전을 올림 (호출한 쪽의 트랜잭션 안에서, 없으면 바로 커밋).
+    롤백된 트랜잭션에서 읽어 간 버전 번호가 다시 쓰이지 않도록 현재 시각보다 작아지지 않게 올립니다.
+    """
+    now = Value(time.time_ns(), output_field=models.PositiveBigIntegerField())
+    versions = ReferenceVersion.objects.filter(name=name)
+    with transaction.atomic():
+        if not versions.update(version=Greatest(F('version') + 1, now)):
+            try:
+                with transaction.atomic():
+                    ReferenceVersion.objects.create(name=name, version=time.time_ns())
+            except IntegrityError:
+                # 동시에 처음 올린 경우
+                versions.update(version=Greatest(F('version') + 1, now))
+    pinned = _pinned_reference_versions.get()
+    if pinned:
+        # 같은 요청에서도 바뀐 버전을 다시 읽음
+        pinned.clear()
+
+
+@contextmanager
+def pinned_reference_versions():
+    """블록 안에서는 참조 데이터 버전을 처음 한 번만 읽음 (요청마다 적용됨)"""
+    token = _pinned_reference_versions.set([])
+    try:
+        yield
+    finally:
+        _pinned_reference_versions.reset(token)
+
+
+@receiver(request_started)
+def pin_reference_versions(**kwargs):
+    _pinned_reference_versions.set([])
+
+
+@receiver(request_finished)
+def unpin_reference_versions(**kwargs):
+    _pinned_reference_versions.set(None)
+
+
+def get_data_version(user_id):
+    """사용자 데이터 버전 (데이터를 바꾼 적이 없으면 0)"""
+    return get_data_state(user_id)[0]
+
+
+def get_data_state(user_id):
+    """(사용자 데이터 버전, 마지막으로 바뀐 시각) - 바꾼 적이 없으면 (0, None)"""
+    state = DataVersion.objects.filter(user_id=user_id).values_list('version', 'updated_at').first()
+    return state or (0, None)
+
+
+def bump_data_version(user_id):
+    """사용자 데이터 버전을 1 올림 (호출한 쪽의 트랜잭션 안에서, 없으면 바로 커밋)"""
+    versions = DataVersion.objects.filter(user_id=user_id)
+    now = timezone.now()
+    with transaction.atomic():
+        if versions.update(version=F('version') + 1, updated_at=now):
+            return
+        try:
+            with transaction.atomic():
+                # DB를 다시 만들어도(테스트 롤백 포함) 캐시에 남은 이전 버전과 겹치지 않도록 현재 시각으로 시작
+                started = time.time_ns()
+                DataVersion.objects.create(
+                    user_id=user_id, version=started, merchant_version=started, updated_at=now
+                )
+        except IntegrityError:
+            # 동시에 처음 올린 경우
+            versions.update(version=F('version') + 1, updated_at=now)
+
+
+def cached_for_user(user_id, name, key, compute, timeout=DATA_CACHE_TIMEOUT, version=None, references=()):
+    """
+    compute() 결과를 (name, 사용자, 데이터 버전, key) 단위로 캐시.
+    사용자의 데이터가 바뀌면 버전이 달라져 다음 조회 때 다시 계산합니다.
+    version: 이 요청에서 이미 읽은 데이터 버전 (ConditionalGetMixin.data_version, 없으면 조회)
+    references: 결과에 이름 등이 들어가는 참조 데이터 (예: 'transactions.category'), 그 버전도 키에 넣음
+    """
+    if version is None:
+        version = get_data_version(user_id)
+    reference_versions = ','.join(str(get_reference_version(reference)) for reference in references)
+    cache_key = f'{name}:{user_id}:{version}:{reference_versions}:{key}'
+    value = cache.get(cache_key)
+    metrics.record_cache(name, value is not None)
+    if value is None:
+        value = compute()
+        cache.set(cache_key, value, timeout)
+    return value
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def delete_data_version(sender, instance, **kwargs):
+    DataVersion.objects.filter(user_id=instance.pk).delete()
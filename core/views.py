@@ -0,0 +1,22 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.cache import never_cache
+from . import metrics
+
+
+def _authorized(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        scheme, _, value = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(value.encode(), token.encode()):
+            return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+@never_cache
+def metrics_view(request):
+    """Prometheus 수집용 지표 (METRICS_TOKEN 베어러 토큰 또는 staff 로그인 필요)"""
+    if not _authorized(request):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
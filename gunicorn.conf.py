@@ -0,0 +1,33 @@
+"""
+gunicorn 설정 (작업 디렉터리의 gunicorn.conf.py는 gunicorn이 자동으로 읽습니다).
+
+preload_app: 마스터에서 앱을 한 번 로드하고 참조 데이터(core.refdata)를 미리 읽어 둔 뒤 fork하므로
+워커들이 같은 메모리를 공유하고, 첫 요청에서 다시 읽지 않습니다.
+
+지표(core.metrics)는 워커별 파일에 기록되며, 종료된 워커의 파일은 child_exit에서 보관 파일로 합칩니다.
+"""
+preload_app = True
+
+
+def when_ready(server):
+    from django.db import connections
+    from core import metrics
+    from core.refdata import warm_all
+
+    # 이전 실행의 워커별 지표 파일 정리 (core.metrics)
+    metrics.reset()
+
+    try:
+        warm_all()
+    except Exception as exc:  # DB가 아직 준비되지 않았으면 워커가 첫 요청 때 읽음
+        server.log.warning('참조 데이터 미리 읽기 실패: %s', exc)
+    finally:
+        # fork 전에 마스터의 DB 연결을 닫아 워커끼리 연결을 공유하지 않도록 함
+        connections.close_all()
+
+
+def child_exit(server, worker):
+    from core import metrics
+
+    # 종료된 워커의 지표를 보관 파일로 합쳐 파일 수가 늘지 않게 함
+    metrics.archive_process(worker.pid)